@@ -5,9 +5,6 @@ iNaturalist 插件基础使用示例
 演示如何使用插件进行物种搜索、获取详情和图片下载
 """
 
-import sys
-sys.path.insert(0, '..')
-
 from inaturalist_plugin import INaturalistPlugin
 
 
@@ -86,7 +83,7 @@ def demo_search_observations():
         print(f"  [{i}] 观察 ID: {obs.id}")
         print(f"      日期: {obs.observed_on}")
         print(f"      地点: {obs.place_guess}")
-        print(f"      坐标: ({obs.latitude}, {obs.longitude})")
+        print(f"      坐标: {obs.coords}")
         print(f"      观察者: {obs.user_login}")
         print(f"      照片数: {obs.photo_count}")
         
@@ -5,30 +5,91 @@ iNaturalist 自然物种查询门户 - Flask 后端
 提供 API 接口和静态文件服务
 """
 
-import sys
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# 添加项目根目录到路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from flask import Flask, render_template, jsonify, request, send_from_directory
+from flask import Flask, Response, abort, render_template, jsonify, request, send_from_directory, stream_with_context
 from flask_cors import CORS
+from flask_caching import Cache
+from flask.json.provider import JSONProvider
+
+try:
+    from flask_compress import Compress
+except ImportError:  # flask-compress 为可选依赖，未安装时不压缩响应
+    Compress = None
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json 解析
+    orjson = None
 from inaturalist_plugin import INaturalistPlugin
-from inaturalist_plugin.adapters.web_adapter import INaturalistWebAdapter
+from inaturalist_plugin.adapters.web_adapter import INaturalistWebAdapter, dumps as dumps_json, parse_observation_query
+from inaturalist_plugin.services.taxon_service import TaxonService
+
+class FastJSONProvider(JSONProvider):
+    """
+    使用 web_adapter.dumps 序列化 JSON 响应（msgspec / orjson，直接输出 bytes）
+    """
+    
+    def dumps(self, obj, **kwargs):
+        return dumps_json(obj).decode("utf-8")
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s) if orjson is not None else json.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_json(obj), mimetype="application/json")
+
 
 # 创建 Flask 应用
 app = Flask(__name__, 
     template_folder='templates',
     static_folder='static'
 )
+app.json = FastJSONProvider(app)
 CORS(app)
 
+# 响应压缩：优先 Brotli，其次 gzip，小于 500 字节的响应不压缩
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 500
+app.config["COMPRESS_LEVEL"] = 4
+if Compress is not None:
+    Compress(app)
+
+# 响应缓存：配置了 REDIS_IP 时使用 Redis，否则退化为进程内缓存
+# iNaturalist API 有速率限制 (~60 次/分钟)，重复查询直接从缓存返回
+cache = Cache(app, config={
+    "CACHE_TYPE": "RedisCache" if os.getenv("REDIS_IP") else "SimpleCache",
+    "CACHE_REDIS_HOST": os.getenv("REDIS_IP"),
+    "CACHE_REDIS_PORT": int(os.getenv("REDIS_PORT", 6379)),
+    "CACHE_DEFAULT_TIMEOUT": 300,
+    "CACHE_KEY_PREFIX": "inat_",
+})
+
+# 缓存时间（秒）：搜索类接口保持 60 秒新鲜度，分类群数据基本不变
+SEARCH_CACHE_TIMEOUT = 60
+TAXON_CACHE_TIMEOUT = 3600
+
+
+def _is_success(response):
+    """只缓存成功的响应，避免上游错误被缓存"""
+    data = response.get_json(silent=True)
+    return bool(data and data.get("success"))
+
 # 初始化插件
 plugin = INaturalistPlugin()
 adapter = INaturalistWebAdapter()
 
+# 分类树接口复用适配器的客户端（共享连接池和速率限制）
+# 设置 INAT_TAXONOMY_DB 时优先从本地分类树镜像查询祖先
+_tax_service = TaxonService(adapter.client, taxonomy_db=os.getenv("INAT_TAXONOMY_DB"))
+
+# 用于并发调用上游 API 的线程池（网络 I/O 期间会释放 GIL）
+_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
 # ============= 页面路由 =============
 
 @app.route("/")
@@ -66,6 +127,7 @@ def map_page():
 # ============= API 路由 =============
 
 @app.route("/api/search")
+@cache.cached(timeout=SEARCH_CACHE_TIMEOUT, query_string=True, response_filter=_is_success)
 def api_search():
     """搜索物种"""
     query = request.args.get("q", "")
@@ -79,12 +141,14 @@ def api_search():
     return jsonify(result)
 
 @app.route("/api/species/<int:taxon_id>")
+@cache.memoize(timeout=TAXON_CACHE_TIMEOUT, response_filter=_is_success)
 def api_species_detail(taxon_id):
     """获取物种详情"""
     result = adapter.get_species_detail(taxon_id)
     return jsonify(result)
 
 @app.route("/api/species/<int:taxon_id>/images")
+@cache.cached(timeout=SEARCH_CACHE_TIMEOUT, query_string=True, response_filter=_is_success)
 def api_species_images(taxon_id):
     """获取物种图片"""
     size = request.args.get("size", "medium")
@@ -93,7 +157,33 @@ def api_species_images(taxon_id):
     result = adapter.get_species_images(taxon_id, size=size, max_images=max_images)
     return jsonify(result)
 
+@app.route("/api/species/<int:taxon_id>/full")
+@cache.memoize(timeout=TAXON_CACHE_TIMEOUT, response_filter=_is_success)
+def api_species_full(taxon_id):
+    """一次获取物种详情页所需的全部数据（详情、图片、祖先分类群）"""
+    # 祖先分类群直接取自详情结果，不再单独请求
+    images_future = _EXECUTOR.submit(adapter.get_species_images, taxon_id, size="medium", max_images=20)
+    try:
+        detail = adapter.get_species_detail(taxon_id)
+        images = images_future.result()
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+    
+    return jsonify({
+        "success": detail.get("success", False),
+        "detail": detail,
+        "images": images,
+        "ancestors": [_taxon_summary(t) for t in detail.get("ancestors", [])]
+    })
+
+_TAXON_SUMMARY_FIELDS = ("id", "name", "rank", "display_name")
+
+def _taxon_summary(taxon):
+    """分类群摘要（id、学名、等级、显示名），taxon 为适配器序列化后的字典"""
+    return {key: taxon.get(key) for key in _TAXON_SUMMARY_FIELDS}
+
 @app.route("/api/autocomplete")
+@cache.cached(timeout=SEARCH_CACHE_TIMEOUT, query_string=True, response_filter=_is_success)
 def api_autocomplete():
     """自动补全建议"""
     query = request.args.get("q", "")
@@ -106,27 +196,44 @@ def api_autocomplete():
     return jsonify(result)
 
 @app.route("/api/observations")
+@cache.cached(timeout=SEARCH_CACHE_TIMEOUT, query_string=True, response_filter=_is_success)
 def api_observations():
     """搜索观察记录"""
-    taxon_id = request.args.get("taxon_id", type=int)
-    place_id = request.args.get("place_id", type=int)
-    lat = request.args.get("lat", type=float)
-    lng = request.args.get("lng", type=float)
-    radius = request.args.get("radius", type=float, default=10)
-    quality_grade = request.args.get("quality_grade", "research")
-    per_page = min(int(request.args.get("per_page", 30)), 200)
-    
-    result = adapter.search_observations(
-        taxon_id=taxon_id,
-        place_id=place_id,
-        lat=lat,
-        lng=lng,
-        radius=radius,
-        quality_grade=quality_grade,
-        per_page=per_page
-    )
+    query = _observation_query()
+    result = adapter.search_observations(**query)
     return jsonify(result)
 
+@app.route("/api/observations/stream")
+def api_observations_stream():
+    """以 NDJSON 流式返回观察记录（每行一条 JSON），前端可边接收边渲染"""
+    query = _observation_query()
+    observations = adapter.iter_observations(**query)
+    
+    def generate():
+        try:
+            for item in observations:
+                yield _ndjson_line(item)
+        except Exception as e:
+            # 响应头已发出，错误作为最后一行返回
+            yield _ndjson_line({"success": False, "error": str(e)})
+    
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+def _observation_query():
+    """解析观察记录搜索参数（半径默认 10 公里，每页最多 200 条），参数错误时返回 400"""
+    try:
+        query = parse_observation_query(request.args)
+    except ValueError as e:
+        abort(400, description=str(e))
+    if query["radius"] is None:
+        query["radius"] = 10
+    query["per_page"] = min(query["per_page"], 200)
+    return query
+
+def _ndjson_line(obj):
+    """序列化为一行 NDJSON (bytes)"""
+    return dumps_json(obj) + b"\n"
+
 @app.route("/api/observations/<int:observation_id>")
 def api_observation_detail(observation_id):
     """获取观察记录详情"""
@@ -148,16 +255,11 @@ def api_location_species():
     return jsonify(result)
 
 @app.route("/api/taxonomy/<int:taxon_id>/children")
+@cache.cached(timeout=TAXON_CACHE_TIMEOUT, query_string=True, response_filter=_is_success)
 def api_taxonomy_children(taxon_id):
     """获取子分类群"""
     rank = request.args.get("rank")
-    
-    from inaturalist_plugin.core.client import create_client
-    from inaturalist_plugin.services.taxon_service import TaxonService
-    
-    client = create_client()
-    service = TaxonService(client)
-    children = service.get_children(taxon_id, rank=rank)
+    children = _tax_service.get_children(taxon_id, rank=rank)
     
     return jsonify({
         "success": True,
@@ -177,14 +279,13 @@ def api_taxonomy_children(taxon_id):
     })
 
 @app.route("/api/taxonomy/<int:taxon_id>/ancestors")
+@cache.memoize(timeout=TAXON_CACHE_TIMEOUT, response_filter=_is_success)
 def api_taxonomy_ancestors(taxon_id):
     """获取祖先分类群"""
-    from inaturalist_plugin.core.client import create_client
-    from inaturalist_plugin.services.taxon_service import TaxonService
-    
-    client = create_client()
-    service = TaxonService(client)
-    ancestors = service.get_ancestors(taxon_id)
+    ancestors = _tax_service.get_ancestors_local(taxon_id)
+    if ancestors is None:
+        taxon = _tax_service.get_by_id(taxon_id)
+        ancestors = _tax_service.get_bulk(taxon.ancestor_ids) if taxon else []
     
     return jsonify({
         "success": True,
@@ -201,8 +302,38 @@ def api_taxonomy_ancestors(taxon_id):
         ]
     })
 
+# ============= 缓存管理 =============
+
+def clear_api_cache(taxon_id=None):
+    """
+    清除 API 响应缓存
+
+    Args:
+        taxon_id: 可选，只清除该物种的详情、完整数据和祖先缓存；为空时清除全部缓存
+    """
+    if taxon_id is None:
+        cache.clear()
+    else:
+        cache.delete_memoized(api_species_detail, taxon_id)
+        cache.delete_memoized(api_species_full, taxon_id)
+        cache.delete_memoized(api_taxonomy_ancestors, taxon_id)
+
+@app.route("/api/admin/cache/clear", methods=["POST"])
+def api_clear_cache():
+    """清除缓存（管理用）"""
+    token = os.getenv("ADMIN_TOKEN")
+    if not token or request.headers.get("X-Admin-Token") != token:
+        return jsonify({"success": False, "error": "Forbidden"}), 403
+    
+    clear_api_cache(request.args.get("taxon_id", type=int))
+    return jsonify({"success": True})
+
 # ============= 错误处理 =============
 
+@app.errorhandler(400)
+def bad_request(error):
+    return jsonify({"success": False, "error": error.description}), 400
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({"success": False, "error": "Not found"}), 404
@@ -220,9 +351,5 @@ if __name__ == "__main__":
     print("访问地址: http://localhost:8080")
     print("="*60)
     
-    # 确保模板文件夹存在
-    os.makedirs("templates", exist_ok=True)
-    os.makedirs("static/css", exist_ok=True)
-    os.makedirs("static/js", exist_ok=True)
-    
-    app.run(debug=True, host="0.0.0.0", port=5000)
+    # 开发服务器，仅设置 FLASK_DEV 时开启调试模式；生产环境请使用 wsgi.py + gunicorn
+    app.run(debug=bool(os.getenv("FLASK_DEV")), host="0.0.0.0", port=5000)
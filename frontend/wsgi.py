@@ -0,0 +1,15 @@
+"""
+iNaturalist 自然物种查询门户 - WSGI 入口
+
+生产环境使用 gunicorn + gevent 运行:
+    gunicorn -k gevent -w 4 --worker-connections 100 --bind 0.0.0.0:5000 wsgi:app
+"""
+
+# 必须在导入 requests 之前打补丁，使同步的网络请求变为协程友好的非阻塞调用
+from gevent import monkey
+
+monkey.patch_all()
+
+from app import app  # noqa: E402
+
+__all__ = ["app"]
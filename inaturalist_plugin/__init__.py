@@ -17,61 +17,91 @@ iNaturalist 数据插件
     >>> details = plugin.get_species_detail(8318)  # 喜鹊属 Pica
 """
 
+from __future__ import annotations
+
 __version__ = "1.0.0"
 __author__ = "Nature Portal"
 
+import asyncio
+import importlib
+from itertools import chain, islice
+from operator import attrgetter
+
 # 导入 typing 类型
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
+
+# 公开名称到所在模块的映射，首次访问时才导入（PEP 562），
+# import inaturalist_plugin 时不加载 requests、httpx 等依赖；
+# numpy / numba 只在 search_observations(strict_radius=True) 时由 utils.geo_filter 导入
+_LAZY_IMPORTS = {
+    # 核心客户端
+    "INaturalistClient": "inaturalist_plugin.core.client",
+    "APIConfig": "inaturalist_plugin.core.client",
+    "create_client": "inaturalist_plugin.core.client",
+    "get_default_client": "inaturalist_plugin.core.client",
+    "INaturalistAPIError": "inaturalist_plugin.core.client",
+    # 物种模型
+    "Taxon": "inaturalist_plugin.models.taxon",
+    "TaxonPhoto": "inaturalist_plugin.models.taxon",
+    "TaxonName": "inaturalist_plugin.models.taxon",
+    "ConservationStatusInfo": "inaturalist_plugin.models.taxon",
+    "EstablishmentMeansInfo": "inaturalist_plugin.models.taxon",
+    "TaxonSummary": "inaturalist_plugin.models.taxon",
+    # 观察记录模型
+    "Observation": "inaturalist_plugin.models.observation",
+    "ObservationPhoto": "inaturalist_plugin.models.observation",
+    "Identification": "inaturalist_plugin.models.observation",
+    "User": "inaturalist_plugin.models.observation",
+    "QualityGrade": "inaturalist_plugin.models.observation",
+    "Geoprivacy": "inaturalist_plugin.models.observation",
+    # 服务
+    "TaxonService": "inaturalist_plugin.services.taxon_service",
+    "search_species": "inaturalist_plugin.services.taxon_service",
+    "get_species": "inaturalist_plugin.services.taxon_service",
+    "ObservationService": "inaturalist_plugin.services.observation_service",
+    "SearchFilters": "inaturalist_plugin.services.observation_service",
+    "search_observations": "inaturalist_plugin.services.observation_service",
+    "get_observation": "inaturalist_plugin.services.observation_service",
+    # 图片工具
+    "ImageDownloader": "inaturalist_plugin.utils.image_utils",
+    "ImageSizeHelper": "inaturalist_plugin.utils.image_utils",
+    "download_species_photos": "inaturalist_plugin.utils.image_utils",
+    "download_observation_photos": "inaturalist_plugin.utils.image_utils",
+    # Web 适配器
+    "INaturalistWebAdapter": "inaturalist_plugin.adapters.web_adapter",
+    "create_flask_routes": "inaturalist_plugin.adapters.web_adapter",
+    "create_fastapi_routes": "inaturalist_plugin.adapters.web_adapter",
+}
+
+__all__ = ["INaturalistPlugin", *_LAZY_IMPORTS]
 
-from inaturalist_plugin.core.client import (
-    INaturalistClient,
-    APIConfig,
-    create_client,
-    INaturalistAPIError
-)
 
-from inaturalist_plugin.models.taxon import (
-    Taxon,
-    TaxonPhoto,
-    TaxonName,
-    ConservationStatusInfo,
-    EstablishmentMeansInfo,
-    TaxonSummary
-)
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # 缓存，之后的访问不再经过 __getattr__
+    return value
 
-from inaturalist_plugin.models.observation import (
-    Observation,
-    ObservationPhoto,
-    Identification,
-    User,
-    QualityGrade,
-    Geoprivacy
-)
 
-from inaturalist_plugin.services.taxon_service import (
-    TaxonService,
-    search_species,
-    get_species
-)
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
 
-from inaturalist_plugin.services.observation_service import (
-    ObservationService,
-    search_observations,
-    get_observation
-)
 
-from inaturalist_plugin.utils.image_utils import (
-    ImageDownloader,
-    ImageSizeHelper,
-    download_species_photos,
-    download_observation_photos
-)
+# 图片尺寸到照片属性名的映射
+_SIZE_ATTR = {
+    "square": "square_url",
+    "thumb": "thumb_url",
+    "small": "small_url",
+    "medium": "medium_url",
+    "large": "large_url",
+}
 
-from inaturalist_plugin.adapters.web_adapter import (
-    INaturalistWebAdapter,
-    create_flask_routes,
-    create_fastapi_routes
-)
+
+if TYPE_CHECKING:
+    from inaturalist_plugin.models.taxon import Taxon
+    from inaturalist_plugin.models.observation import Observation
 
 
 class INaturalistPlugin:
@@ -81,6 +111,9 @@ class INaturalistPlugin:
     提供简洁的 API 接口，方便集成到各种应用中
     """
     
+    # 图片并发下载数量上限，避免触发 iNaturalist 的 HTTP 429
+    download_concurrency = 5
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         初始化插件
@@ -89,6 +122,9 @@ class INaturalistPlugin:
             api_key: 可选的 API 密钥（用于需要认证的接口）
         """
         from inaturalist_plugin.core.client import create_client
+        from inaturalist_plugin.services.taxon_service import TaxonService
+        from inaturalist_plugin.services.observation_service import ObservationService
+        from inaturalist_plugin.utils.image_utils import ImageDownloader
         
         self.client = create_client(api_key=api_key)
         self.taxon_service = TaxonService(self.client)
@@ -128,6 +164,18 @@ class INaturalistPlugin:
         """
         return self.taxon_service.get_by_id(taxon_id)
     
+    def get_species_bulk(self, taxon_ids: List[int]) -> List[Taxon]:
+        """
+        批量获取物种详细信息（一次请求代替逐个查询）
+        
+        Args:
+            taxon_ids: 物种 ID 列表
+            
+        Returns:
+            Taxon 对象列表，顺序与 taxon_ids 一致
+        """
+        return self.taxon_service.get_bulk(taxon_ids)
+    
     def autocomplete_species(self, query: str, per_page: int = 10) -> List[Taxon]:
         """
         物种自动补全
@@ -151,7 +199,8 @@ class INaturalistPlugin:
         radius: Optional[float] = None,
         quality_grade: str = "research",
         has_photos: bool = True,
-        per_page: int = 30
+        per_page: int = 30,
+        strict_radius: bool = False
     ) -> List[Observation]:
         """
         搜索观察记录
@@ -163,11 +212,13 @@ class INaturalistPlugin:
             quality_grade: 质量等级
             has_photos: 是否只返回有照片的
             per_page: 返回数量
+            strict_radius: 是否按公开坐标再次过滤，只保留半径内的观察
+                （坐标被模糊处理的观察可能位于半径之外）
             
         Returns:
             Observation 对象列表
         """
-        return self.observation_service.search(
+        observations = self.observation_service.search(
             taxon_id=taxon_id,
             lat=lat,
             lng=lng,
@@ -176,6 +227,20 @@ class INaturalistPlugin:
             has_photos=has_photos,
             per_page=per_page
         )
+        
+        if strict_radius and lat is not None and lng is not None and radius:
+            from inaturalist_plugin.utils.geo_filter import np, filter_within
+            
+            located = [o for o in observations if o.latitude is not None and o.longitude is not None]
+            lats = [o.latitude for o in located]
+            lngs = [o.longitude for o in located]
+            if np is not None:
+                lats = np.asarray(lats, dtype=np.float64)
+                lngs = np.asarray(lngs, dtype=np.float64)
+            mask = filter_within(lats, lngs, lat, lng, radius)
+            observations = [o for o, inside in zip(located, mask) if inside]
+        
+        return observations
     
     def get_observation(self, observation_id: int) -> Optional[Observation]:
         """
@@ -208,26 +273,44 @@ class INaturalistPlugin:
         Returns:
             下载成功的本地文件路径列表
         """
-        # 先获取观察记录
+        # 先获取观察记录，一次性收集所有图片 URL
         observations = self.observation_service.search(
             taxon_id=taxon_id,
             quality_grade="research",
             has_photos=True,
             per_page=max_images
         )
+        urls = list(dict.fromkeys(chain.from_iterable(obs.get_photo_urls(size) for obs in observations)))
         
+        # 按顺序分批并发下载，下载失败的由后面的 URL 补足，直到凑满 max_images 张
         downloaded = []
-        for obs in observations:
-            urls = obs.get_photo_urls(size)
-            for url in urls:
-                if len(downloaded) >= max_images:
-                    break
-                local_path = self.image_downloader.download(url)
-                if local_path:
-                    downloaded.append(local_path)
+        start = 0
+        while len(downloaded) < max_images and start < len(urls):
+            batch = urls[start:start + max_images - len(downloaded)]
+            start += len(batch)
+            results = self.image_downloader.download_multiple(
+                batch,
+                delay=0,
+                max_workers=self.download_concurrency,
+                per_host=self.download_concurrency
+            )
+            downloaded.extend(results[url] for url in batch if results[url])
         
         return downloaded
     
+    async def adownload_species_images(
+        self,
+        taxon_id: int,
+        size: str = "medium",
+        max_images: int = 10
+    ) -> List[str]:
+        """
+        下载物种图片（异步版本，在线程中运行 download_species_images，不阻塞事件循环）
+        
+        参数和返回值同 download_species_images
+        """
+        return await asyncio.to_thread(self.download_species_images, taxon_id, size, max_images)
+    
     def get_species_image_urls(
         self,
         taxon_id: int,
@@ -243,7 +326,7 @@ class INaturalistPlugin:
             max_images: 最大数量
             
         Returns:
-            图片信息字典列表
+            图片信息字典列表，每项包含 url（请求的尺寸）和 sizes（各尺寸 URL）
         """
         observations = self.observation_service.search(
             taxon_id=taxon_id,
@@ -252,26 +335,21 @@ class INaturalistPlugin:
             per_page=max_images
         )
         
-        images = []
-        for obs in observations:
-            for photo in obs.photos:
-                if len(images) >= max_images:
-                    break
-                
-                url = getattr(photo, f"{size}_url", None) or photo.url
-                images.append({
-                    "url": url,
-                    "observation_id": obs.id,
-                    "attribution": photo.attribution,
-                    "license": photo.license_code,
-                    "sizes": {
-                        "square": photo.square_url,
-                        "thumb": photo.thumb_url,
-                        "small": photo.small_url,
-                        "medium": photo.medium_url,
-                        "large": photo.large_url
-                    }
-                })
+        # 每次调用只解析一次属性名，循环内使用 C 实现的 attrgetter
+        get_size = attrgetter(_SIZE_ATTR.get(size, "url"))
+        
+        # 达到 max_images 后立即停止，不再遍历剩余观察记录的照片
+        photos = chain.from_iterable(((obs, p) for p in obs.photos) for obs in observations)
+        images = [
+            {
+                "url": get_size(photo) or photo.url,
+                "observation_id": obs.id,
+                "attribution": photo.attribution,
+                "license": photo.license_code,
+                "sizes": {name: getattr(photo, attr) for name, attr in _SIZE_ATTR.items()}
+            }
+            for obs, photo in islice(photos, max_images)
+        ]
         
         return images
     
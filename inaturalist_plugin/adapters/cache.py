@@ -0,0 +1,163 @@
+"""
+Web 适配器响应缓存
+
+把 INaturalistWebAdapter 方法的返回结果缓存到 Redis，重复查询不再访问上游 API。
+需要安装 redis: pip install redis
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import redis
+except ImportError:  # redis 为可选依赖，未安装时不缓存
+    redis = None
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+
+CACHE_KEY_PREFIX = "inat:v1"
+
+# 确定不存在的结果（如无效 ID）的缓存时间（秒），避免同一个无效请求反复打到上游
+NEGATIVE_CACHE_TTL = 60
+
+
+class ResponseCache:
+    """
+    基于 Redis 的响应缓存
+
+    值为 JSON bytes，命中时返回解析后的字典
+    """
+
+    def __init__(self, client, encode: Callable[[Any], bytes], prefix: str = CACHE_KEY_PREFIX):
+        """
+        Args:
+            client: redis.Redis 实例 (decode_responses=False)
+            encode: 序列化函数，返回 JSON bytes
+            prefix: 缓存键前缀，返回格式不同的适配器应使用不同前缀
+        """
+        self.client = client
+        self.encode = encode
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(
+        cls,
+        url: Optional[str],
+        encode: Callable[[Any], bytes],
+        prefix: str = CACHE_KEY_PREFIX
+    ) -> Optional["ResponseCache"]:
+        """
+        根据 Redis URL 创建缓存，未提供 URL 或未安装 redis 时返回 None
+
+        Example:
+            >>> ResponseCache.from_url("redis://localhost:6379/0", dumps)
+        """
+        if not url or redis is None:
+            return None
+        return cls(redis.Redis.from_url(url, decode_responses=False), encode, prefix)
+
+    def make_key(self, name: str, arguments: dict) -> str:
+        """生成缓存键: <前缀>:<方法名>:<参数哈希>，默认前缀为 inat:v1"""
+        digest = hashlib.blake2b(repr(sorted(arguments.items())).encode("utf-8"), digest_size=16)
+        return f"{self.prefix}:{name}:{digest.hexdigest()}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """读取缓存，未命中或 Redis 不可用时返回 None"""
+        try:
+            data = self.client.get(key)
+        except redis.RedisError:
+            return None
+        if data is None:
+            return None
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+
+    def set(self, key: str, value: Any, ttl: int):
+        """写入缓存，Redis 不可用时忽略"""
+        try:
+            self.client.setex(key, ttl, self.encode(value))
+        except redis.RedisError:
+            pass
+
+
+def _result_ttl(result: dict, ttl: int, negative_ttl: int) -> Optional[int]:
+    """结果的缓存时间：成功为 ttl，确定不存在 (not_found) 为 negative_ttl，其他失败不缓存"""
+    if result.get("success"):
+        return ttl
+    if result.get("not_found"):
+        return negative_ttl
+    return None
+
+
+def cached(ttl: int, negative_ttl: int = NEGATIVE_CACHE_TTL):
+    """
+    缓存适配器方法的返回结果
+
+    实例需要有 response_cache 属性（ResponseCache 或 None）；
+    资源不存在的结果（not_found 为 True）只缓存 negative_ttl 秒，
+    限速、服务端错误、网络错误等临时失败不缓存。支持协程方法，
+    协程方法在线程中访问 Redis，不阻塞事件循环
+
+    Args:
+        ttl: 成功结果的缓存时间（秒）
+        negative_ttl: 资源不存在结果的缓存时间（秒）
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        name = func.__name__
+
+        def make_key(cache, args, kwargs):
+            # 绑定到函数签名，位置参数和关键字参数传入同一个值时得到相同的键
+            bound = signature.bind(None, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments["self"]
+            return cache.make_key(name, arguments)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(self, *args, **kwargs):
+                cache = self.response_cache
+                if cache is None:
+                    return await func(self, *args, **kwargs)
+
+                # 同步 Redis 客户端放到线程中执行，避免阻塞事件循环
+                key = make_key(cache, args, kwargs)
+                result = await asyncio.to_thread(cache.get, key)
+                if result is not None:
+                    return result
+
+                result = await func(self, *args, **kwargs)
+                result_ttl = _result_ttl(result, ttl, negative_ttl)
+                if result_ttl is not None:
+                    await asyncio.to_thread(cache.set, key, result, result_ttl)
+                return result
+
+            return wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = self.response_cache
+            if cache is None:
+                return func(self, *args, **kwargs)
+
+            key = make_key(cache, args, kwargs)
+            result = cache.get(key)
+            if result is not None:
+                return result
+
+            result = func(self, *args, **kwargs)
+            result_ttl = _result_ttl(result, ttl, negative_ttl)
+            if result_ttl is not None:
+                cache.set(key, result, result_ttl)
+            return result
+
+        return wrapper
+    return decorator
@@ -0,0 +1,22 @@
+"""
+Web 请求数据结构
+
+使用 msgspec.Struct 描述接口的查询参数，由 msgspec 一次完成类型转换和校验。
+
+需要安装 msgspec: pip install msgspec
+"""
+
+from typing import Optional
+
+import msgspec
+
+
+class SearchObservationsQuery(msgspec.Struct):
+    """观察记录搜索的查询参数（由 msgspec.convert 从 URL 参数一次转换）"""
+    taxon_id: Optional[int] = None
+    place_id: Optional[int] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    radius: Optional[float] = None
+    quality_grade: Optional[str] = "research"
+    per_page: int = 30
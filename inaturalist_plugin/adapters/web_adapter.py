@@ -5,24 +5,192 @@ Web 适配器模块
 支持 Flask, FastAPI, Django 等主流 Web 框架
 """
 
-from typing import List, Dict, Any, Optional, Callable
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from itertools import islice
+from typing import Iterator, List, Dict, Any, Optional, Callable
 from dataclasses import asdict
+from operator import attrgetter
 import json
 
-from inaturalist_plugin.core.client import INaturalistClient, create_client
+from inaturalist_plugin.core.client import INaturalistAPIError, INaturalistClient, AsyncINaturalistClient, create_client
 from inaturalist_plugin.services.taxon_service import TaxonService
 from inaturalist_plugin.services.observation_service import ObservationService
 from inaturalist_plugin.utils.image_utils import ImageDownloader, ImageSizeHelper
+from inaturalist_plugin.adapters.cache import CACHE_KEY_PREFIX, ResponseCache, cached
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+try:
+    import msgspec
+    from inaturalist_plugin.adapters.dto import SearchObservationsQuery
+except ImportError:  # msgspec 为可选依赖，未安装时使用 orjson / 标准库 json
+    msgspec = None
+    SearchObservationsQuery = None
+
+
+# orjson 原生支持 dataclass / datetime / UUID，无需 asdict 深拷贝
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC) if orjson else 0
 
 
 class JSONEncoder(json.JSONEncoder):
-    """自定义 JSON 编码器，支持 dataclass"""
+    """自定义 JSON 编码器，支持 dataclass（未安装 orjson 时使用）"""
     def default(self, obj):
         if hasattr(obj, "__dataclass_fields__"):
             return asdict(obj)
         return super().default(obj)
 
 
+# _serialize_taxon 缓存的最大条目数
+TAXON_MEMO_SIZE = 4096
+
+# _serialize_taxon 一次取出所需的全部属性
+_TAXON_ATTRS = attrgetter(
+    "id", "name", "rank", "display_name",
+    "english_common_name", "chinese_common_name", "preferred_common_name",
+    "iconic_taxon_name", "observations_count", "conservation_status_name",
+    "wikipedia_summary", "wikipedia_url"
+)
+_PHOTO_KEYS = ("square", "medium", "large", "attribution", "license")
+_PHOTO_ATTRS = attrgetter("square_url", "medium_url", "large_url", "attribution", "license_code")
+_DEFAULT_PHOTO_KEYS = ("square", "medium", "large")
+_DEFAULT_PHOTO_ATTRS = attrgetter("square_url", "medium_url", "large_url")
+
+# get_species_images 的 size 参数对应的 Photo 属性
+_PHOTO_SIZE_ATTRS = {
+    "square": "square_url",
+    "thumb": "thumb_url",
+    "small": "small_url",
+    "medium": "medium_url",
+    "large": "large_url"
+}
+
+# 紧凑照片格式要求的公共前缀最小占比（相对最长的 URL）
+PHOTO_URL_PREFIX_RATIO = 0.8
+
+
+def compact_photo_urls(square: Optional[str], medium: Optional[str], large: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    把只有尺寸部分不同的三个照片 URL 合并为公共前缀 + 各尺寸后缀
+    
+    客户端按 url_base + variants[size] 还原完整 URL；
+    缺少某个尺寸或公共前缀不足 PHOTO_URL_PREFIX_RATIO 时返回 None
+    
+    Example:
+        >>> compact_photo_urls(".../photos/1/square.jpg", ".../photos/1/medium.jpg", ".../photos/1/large.jpg")
+        {"url_base": ".../photos/1/", "variants": {"square": "square.jpg", "medium": "medium.jpg", "large": "large.jpg"}}
+    """
+    if not (square and medium and large):
+        return None
+    
+    prefix = os.path.commonprefix((square, medium, large))
+    if len(prefix) < PHOTO_URL_PREFIX_RATIO * max(len(square), len(medium), len(large)):
+        return None
+    
+    n = len(prefix)
+    return {
+        "url_base": prefix,
+        "variants": {
+            "square": square[n:],
+            "medium": medium[n:],
+            "large": large[n:]
+        }
+    }
+
+
+def _enc_hook(obj: Any) -> Any:
+    """msgspec 不支持的类型（如 numpy 数组）"""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise NotImplementedError(f"Objects of type {type(obj)} are not supported")
+
+
+# 全模块共享一个编码器: msgspec 按类型缓存编码方案，
+# 所有响应（Flask、FastAPI、NDJSON 流、Redis 缓存）都经由 dumps 复用同一份缓存。
+# 外层响应仍为字典，@cached 和调用方依赖 result.get("success")，不改为 Struct
+_MSGSPEC_ENCODER = msgspec.json.Encoder(enc_hook=_enc_hook) if msgspec else None
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    序列化为 JSON bytes
+    
+    优先使用 msgspec，其次 orjson，最后标准库 json
+    """
+    if _MSGSPEC_ENCODER is not None:
+        return _MSGSPEC_ENCODER.encode(obj)
+    if orjson is not None:
+        return orjson.dumps(obj, option=ORJSON_OPTIONS)
+    return json.dumps(obj, cls=JSONEncoder, ensure_ascii=False).encode("utf-8")
+
+
+# 观察记录搜索的查询参数: (参数名, 类型, 默认值)，与 SearchObservationsQuery 一致
+_OBSERVATION_QUERY_FIELDS = (
+    ("taxon_id", int, None),
+    ("place_id", int, None),
+    ("lat", float, None),
+    ("lng", float, None),
+    ("radius", float, None),
+    ("quality_grade", str, "research"),
+    ("per_page", int, 30),
+)
+
+
+def parse_observation_query(args) -> Dict[str, Any]:
+    """
+    解析观察记录搜索的 URL 参数，返回可直接传给 search_observations 的关键字参数
+    
+    安装了 msgspec 时由 SearchObservationsQuery 一次完成类型转换。
+    空字符串视为未提供，但 quality_grade 为空字符串表示不限质量等级
+    
+    Args:
+        args: URL 参数（如 Flask 的 request.args）
+        
+    Raises:
+        ValueError: 参数类型错误
+        
+    Example:
+        >>> adapter.search_observations(**parse_observation_query(request.args))
+    """
+    values = {k: v for k, v in args.items() if v != "" or k == "quality_grade"}
+    
+    if SearchObservationsQuery is not None:
+        try:
+            query = msgspec.convert(values, SearchObservationsQuery, strict=False)
+        except msgspec.ValidationError as e:
+            raise ValueError(str(e)) from None
+        return msgspec.structs.asdict(query)
+    
+    return {
+        name: convert(values[name]) if name in values else default
+        for name, convert, default in _OBSERVATION_QUERY_FIELDS
+    }
+
+
+def _error_result(error: Exception) -> Dict[str, Any]:
+    """接口失败时的返回格式（上游返回 404 时同 _not_found_result）"""
+    if isinstance(error, INaturalistAPIError) and error.status_code == 404:
+        return _not_found_result(str(error))
+    return {
+        "success": False,
+        "error": str(error)
+    }
+
+
+def _not_found_result(message: str) -> Dict[str, Any]:
+    """资源不存在时的返回格式，not_found 标记确定的未命中（@cached 只对这类失败做短时缓存）"""
+    return {
+        "success": False,
+        "error": message,
+        "not_found": True
+    }
+
+
 class INaturalistWebAdapter:
     """
     iNaturalist Web 适配器
@@ -30,11 +198,34 @@ class INaturalistWebAdapter:
     为门户网站提供统一的 API 接口
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        redis_url: Optional[str] = None,
+        compact_photos: bool = False
+    ):
+        """
+        Args:
+            api_key: 可选的 JWT token
+            redis_url: 可选，Redis 地址（默认读取环境变量 INAT_REDIS_URL），
+                设置后缓存物种详情、自动补全等接口的结果
+            compact_photos: 观察记录照片是否使用紧凑格式
+                {"url_base": ..., "variants": {"square": ..., "medium": ..., "large": ...}}，
+                代替三个完整 URL（见 compact_photo_urls）
+        """
         self.client = create_client(api_key=api_key)
+        self.compact_photos = compact_photos
+        self.response_cache = ResponseCache.from_url(
+            redis_url or os.getenv("INAT_REDIS_URL"),
+            dumps,
+            prefix=f"{CACHE_KEY_PREFIX}:compact" if compact_photos else CACHE_KEY_PREFIX
+        )
         self.taxon_service = TaxonService(self.client)
         self.observation_service = ObservationService(self.client)
         self.image_downloader = ImageDownloader()
+        self._async_services = None
+        self._taxon_memo: "OrderedDict[int, tuple]" = OrderedDict()
+        self._taxon_memo_lock = threading.Lock()
     
     # ==================== 物种查询接口 ====================
     
@@ -62,19 +253,39 @@ class INaturalistWebAdapter:
                 iconic_taxa=iconic_taxa,
                 per_page=per_page
             )
-            
-            return {
-                "success": True,
-                "query": query,
-                "total": len(results),
-                "results": [self._serialize_taxon(t) for t in results]
-            }
+            return self._search_species_result(query, results)
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+            return _error_result(e)
+    
+    async def search_species_async(
+        self,
+        query: str,
+        rank: Optional[str] = None,
+        iconic_taxa: Optional[List[str]] = None,
+        per_page: int = 30
+    ) -> Dict[str, Any]:
+        """搜索物种（异步版本，参数和返回格式同 search_species）"""
+        taxon_service, _ = self._get_async_services()
+        try:
+            results = await taxon_service.search(
+                q=query,
+                rank=rank,
+                iconic_taxa=iconic_taxa,
+                per_page=per_page
+            )
+            return self._search_species_result(query, results)
+        except Exception as e:
+            return _error_result(e)
     
+    def _search_species_result(self, query: str, results) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "query": query,
+            "total": len(results),
+            "results": self._serialize_taxa(results)
+        }
+    
+    @cached(ttl=86400)  # 分类学数据基本不变
     def get_species_detail(self, taxon_id: int) -> Dict[str, Any]:
         """
         获取物种详细信息
@@ -92,10 +303,7 @@ class INaturalistWebAdapter:
             taxon = self.taxon_service.get_by_id(taxon_id)
             
             if not taxon:
-                return {
-                    "success": False,
-                    "error": f"Species not found: {taxon_id}"
-                }
+                return _not_found_result(f"Species not found: {taxon_id}")
             
             # 获取额外信息
             observation_count = self.taxon_service.get_observation_count(taxon_id)
@@ -110,20 +318,77 @@ class INaturalistWebAdapter:
                 per_page=6
             )
             
-            return {
-                "success": True,
-                "taxon": self._serialize_taxon(taxon),
-                "observation_count": observation_count,
-                "ancestors": [self._serialize_taxon(t) for t in ancestors],
-                "children": [self._serialize_taxon(t) for t in children],
-                "recent_observations": [self._serialize_observation(o) for o in recent_observations]
-            }
+            return self._species_detail_result(
+                taxon, observation_count, ancestors, children, recent_observations
+            )
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+            return _error_result(e)
     
+    @cached(ttl=86400)
+    async def get_species_detail_async(self, taxon_id: int) -> Dict[str, Any]:
+        """
+        获取物种详细信息（异步版本，返回格式同 get_species_detail）
+        
+        物种详情、观察数量、子分类群和最近观察记录并发请求，
+        随后一次批量请求获取所有祖先分类群。需要安装 httpx
+        """
+        taxon_service, observation_service = self._get_async_services()
+        try:
+            taxon, observation_count, children, recent_observations = await asyncio.gather(
+                taxon_service.get_by_id(taxon_id),
+                observation_service.count(taxon_id=taxon_id),
+                taxon_service.get_children(taxon_id),
+                observation_service.search(
+                    taxon_id=taxon_id,
+                    quality_grade="research",
+                    has_photos=True,
+                    per_page=6
+                )
+            )
+            
+            if not taxon:
+                return _not_found_result(f"Species not found: {taxon_id}")
+            
+            ancestors = await taxon_service.get_ancestors(taxon_id, taxon=taxon)
+            
+            return self._species_detail_result(
+                taxon, observation_count, ancestors, children, recent_observations
+            )
+        except Exception as e:
+            return _error_result(e)
+    
+    def _species_detail_result(
+        self, taxon, observation_count, ancestors, children, recent_observations
+    ) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "taxon": self._serialize_taxon(taxon),
+            "observation_count": observation_count,
+            "ancestors": [self._serialize_taxon(t) for t in ancestors],
+            "children": self._serialize_taxa(children),
+            "recent_observations": [self._serialize_observation(o) for o in recent_observations]
+        }
+    
+    def _get_async_services(self):
+        """
+        获取异步服务（首次调用时创建）
+        
+        异步客户端的连接池绑定到首次使用它的事件循环，
+        应在同一个事件循环中使用（如 FastAPI 应用）
+        """
+        if self._async_services is None:
+            from inaturalist_plugin.services.async_service import AsyncTaxonService, AsyncObservationService
+            client = AsyncINaturalistClient(self.client.config)
+            self._async_services = (AsyncTaxonService(client), AsyncObservationService(client))
+        return self._async_services
+    
+    async def aclose(self):
+        """关闭异步客户端的连接池"""
+        if self._async_services is not None:
+            await self._async_services[0].client.aclose()
+            self._async_services = None
+    
+    @cached(ttl=3600)
     def autocomplete_species(self, query: str, per_page: int = 10) -> Dict[str, Any]:
         """
         物种自动补全
@@ -136,17 +401,26 @@ class INaturalistWebAdapter:
         """
         try:
             results = self.taxon_service.autocomplete(q=query, per_page=per_page)
-            
-            return {
-                "success": True,
-                "query": query,
-                "suggestions": [self._serialize_taxon(t) for t in results]
-            }
+            return self._autocomplete_result(query, results)
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+            return _error_result(e)
+    
+    @cached(ttl=3600)
+    async def autocomplete_species_async(self, query: str, per_page: int = 10) -> Dict[str, Any]:
+        """物种自动补全（异步版本，参数和返回格式同 autocomplete_species）"""
+        taxon_service, _ = self._get_async_services()
+        try:
+            results = await taxon_service.autocomplete(q=query, per_page=per_page)
+            return self._autocomplete_result(query, results)
+        except Exception as e:
+            return _error_result(e)
+    
+    def _autocomplete_result(self, query: str, results) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "query": query,
+            "suggestions": self._serialize_taxa(results)
+        }
     
     # ==================== 观察记录接口 ====================
     
@@ -184,18 +458,79 @@ class INaturalistWebAdapter:
                 per_page=per_page,
                 **kwargs
             )
-            
-            return {
-                "success": True,
-                "total": len(results),
-                "results": [self._serialize_observation(o) for o in results]
-            }
+            return self._observations_result(results)
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+            return _error_result(e)
+    
+    async def search_observations_async(
+        self,
+        taxon_id: Optional[int] = None,
+        place_id: Optional[int] = None,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius: Optional[float] = None,
+        quality_grade: Optional[str] = "research",
+        has_photos: bool = True,
+        per_page: int = 30,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """搜索观察记录（异步版本，参数和返回格式同 search_observations）"""
+        _, observation_service = self._get_async_services()
+        try:
+            results = await observation_service.search(
+                taxon_id=taxon_id,
+                place_id=place_id,
+                lat=lat,
+                lng=lng,
+                radius=radius,
+                quality_grade=quality_grade,
+                has_photos=has_photos,
+                per_page=per_page,
+                **kwargs
+            )
+            return self._observations_result(results)
+        except Exception as e:
+            return _error_result(e)
     
+    def _observations_result(self, results) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "total": len(results),
+            "results": [self._serialize_observation(o) for o in results]
+        }
+    
+    def iter_observations(
+        self,
+        taxon_id: Optional[int] = None,
+        place_id: Optional[int] = None,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius: Optional[float] = None,
+        quality_grade: Optional[str] = "research",
+        has_photos: bool = True,
+        per_page: int = 30,
+        **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        逐条返回序列化后的观察记录（参数同 search_observations）
+        
+        用于流式输出 (NDJSON)，每条记录解析后立即返回，不等待整页序列化完成
+        """
+        observations = self.observation_service.search_iter(
+            taxon_id=taxon_id,
+            place_id=place_id,
+            lat=lat,
+            lng=lng,
+            radius=radius,
+            quality_grade=quality_grade,
+            has_photos=has_photos,
+            per_page=per_page,
+            **kwargs
+        )
+        for observation in observations:
+            yield self._serialize_observation(observation)
+    
+    @cached(ttl=300)
     def get_observation_detail(self, observation_id: int) -> Dict[str, Any]:
         """
         获取观察记录详情
@@ -208,23 +543,30 @@ class INaturalistWebAdapter:
         """
         try:
             observation = self.observation_service.get_by_id(observation_id)
-            
-            if not observation:
-                return {
-                    "success": False,
-                    "error": f"Observation not found: {observation_id}"
-                }
-            
-            return {
-                "success": True,
-                "observation": self._serialize_observation(observation)
-            }
+            return self._observation_detail_result(observation_id, observation)
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+            return _error_result(e)
     
+    @cached(ttl=300)
+    async def get_observation_detail_async(self, observation_id: int) -> Dict[str, Any]:
+        """获取观察记录详情（异步版本，返回格式同 get_observation_detail）"""
+        _, observation_service = self._get_async_services()
+        try:
+            observation = await observation_service.get_by_id(observation_id)
+            return self._observation_detail_result(observation_id, observation)
+        except Exception as e:
+            return _error_result(e)
+    
+    def _observation_detail_result(self, observation_id: int, observation) -> Dict[str, Any]:
+        if not observation:
+            return _not_found_result(f"Observation not found: {observation_id}")
+        
+        return {
+            "success": True,
+            "observation": self._serialize_observation(observation)
+        }
+    
+    @cached(ttl=600)
     def get_species_by_location(
         self,
         lat: float,
@@ -248,30 +590,46 @@ class INaturalistWebAdapter:
                 lng=lng,
                 radius=radius
             )
-            
-            # 限制数量
-            species_counts = species_counts[:per_page]
-            
-            return {
-                "success": True,
-                "location": {
-                    "lat": lat,
-                    "lng": lng,
-                    "radius": radius
-                },
-                "species": [
-                    {
-                        "count": sc["count"],
-                        "taxon": self._serialize_taxon_simple(sc["taxon"])
-                    }
-                    for sc in species_counts
-                ]
-            }
+            return self._species_by_location_result(lat, lng, radius, per_page, species_counts)
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+            return _error_result(e)
+    
+    @cached(ttl=600)
+    async def get_species_by_location_async(
+        self,
+        lat: float,
+        lng: float,
+        radius: float = 10,
+        per_page: int = 30
+    ) -> Dict[str, Any]:
+        """获取特定位置周围的物种列表（异步版本，参数和返回格式同 get_species_by_location）"""
+        _, observation_service = self._get_async_services()
+        try:
+            species_counts = await observation_service.get_species_counts(
+                lat=lat,
+                lng=lng,
+                radius=radius
+            )
+            return self._species_by_location_result(lat, lng, radius, per_page, species_counts)
+        except Exception as e:
+            return _error_result(e)
+    
+    def _species_by_location_result(self, lat, lng, radius, per_page, species_counts) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "location": {
+                "lat": lat,
+                "lng": lng,
+                "radius": radius
+            },
+            "species": [
+                {
+                    "count": sc["count"],
+                    "taxon": self._serialize_taxon_simple(sc["taxon"])
+                }
+                for sc in species_counts[:per_page]  # 限制数量
+            ]
+        }
     
     # ==================== 图片接口 ====================
     
@@ -306,75 +664,124 @@ class INaturalistWebAdapter:
                 has_photos=True,
                 per_page=max_images
             )
-            
-            images = []
-            for obs in observations:
-                for photo in obs.photos[:3]:  # 每个观察最多取3张
-                    if len(images) >= max_images:
-                        break
-                    
-                    url = getattr(photo, f"{size}_url", None) or photo.url
-                    images.append({
-                        "url": url,
-                        "observation_id": obs.id,
-                        "attribution": photo.attribution,
-                        "license": photo.license_code,
-                        "square": photo.square_url,
-                        "medium": photo.medium_url,
-                        "large": photo.large_url
-                    })
-                
-                if len(images) >= max_images:
-                    break
-            
-            return {
-                "success": True,
-                "taxon_id": taxon_id,
-                "size": size,
-                "total": len(images),
-                "images": images
-            }
+            return self._species_images_result(taxon_id, size, max_images, observations)
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+            return _error_result(e)
+    
+    async def get_species_images_async(
+        self,
+        taxon_id: int,
+        size: str = "medium",
+        max_images: int = 10
+    ) -> Dict[str, Any]:
+        """获取物种图片（异步版本，参数和返回格式同 get_species_images）"""
+        _, observation_service = self._get_async_services()
+        try:
+            observations = await observation_service.search(
+                taxon_id=taxon_id,
+                quality_grade="research",
+                has_photos=True,
+                per_page=max_images
+            )
+            return self._species_images_result(taxon_id, size, max_images, observations)
+        except Exception as e:
+            return _error_result(e)
+    
+    def _species_images_result(self, taxon_id, size, max_images, observations) -> Dict[str, Any]:
+        # 每个观察最多取3张，取满 max_images 张即停止
+        photos = islice(
+            ((obs.id, photo) for obs in observations for photo in obs.photos[:3]),
+            max(max_images, 0)
+        )
+        size_attr = _PHOTO_SIZE_ATTRS.get(size)
+        images = [self._image_dict(observation_id, photo, size_attr) for observation_id, photo in photos]
+        
+        return {
+            "success": True,
+            "taxon_id": taxon_id,
+            "size": size,
+            "total": len(images),
+            "images": images
+        }
+    
+    @staticmethod
+    def _image_dict(observation_id: int, photo, size_attr: Optional[str]) -> Dict[str, Any]:
+        """get_species_images 中单张图片的结果，size_attr 为所需尺寸的 URL 属性名"""
+        return {
+            "url": (getattr(photo, size_attr) if size_attr else None) or photo.url,
+            "observation_id": observation_id,
+            "attribution": photo.attribution,
+            "license": photo.license_code,
+            "square": photo.square_url,
+            "medium": photo.medium_url,
+            "large": photo.large_url
+        }
     
     # ==================== 工具方法 ====================
     
     def _serialize_taxon(self, taxon) -> Dict[str, Any]:
-        """序列化 Taxon 对象为字典"""
+        """
+        序列化 Taxon 对象（带 LRU 缓存）
+        
+        TaxonService 会缓存 Taxon 对象，祖先链等同一对象常被多次序列化。
+        缓存以对象本身为键（同一 ID 在不同端点返回的字段不同，不能只按 ID 缓存），
+        缓存条目持有对象引用，因此 id() 在条目存在期间不会被复用。
+        返回值在多次调用间共享，请勿修改
+        """
+        key = id(taxon)
+        with self._taxon_memo_lock:
+            entry = self._taxon_memo.get(key)
+            if entry is not None and entry[0] is taxon:
+                self._taxon_memo.move_to_end(key)
+                return entry[1]
+        
+        result = self._build_taxon(taxon)
+        with self._taxon_memo_lock:
+            self._taxon_memo[key] = (taxon, result)
+            if len(self._taxon_memo) > TAXON_MEMO_SIZE:
+                self._taxon_memo.popitem(last=False)
+        return result
+    
+    def _serialize_taxa(self, taxa) -> List[Dict[str, Any]]:
+        """
+        批量序列化新请求到的 Taxon 列表（搜索、自动补全、子分类群）
+        
+        这些对象每次请求都重新创建，不会被再次序列化，直接构建结果而不经过 LRU 缓存，
+        省去逐个加锁查找，也避免挤掉缓存中常用的祖先分类群
+        """
+        return list(map(self._build_taxon, taxa))
+    
+    def _build_taxon(self, taxon) -> Dict[str, Any]:
+        """
+        构建 Taxon 的序列化结果
+        
+        公开方法始终返回字典：Redis 缓存命中时得到的也是字典，两种情况类型一致
+        """
+        (taxon_id, name, rank, display_name, english, chinese, preferred, iconic_taxon,
+         observations_count, conservation_status, wikipedia_summary, wikipedia_url) = _TAXON_ATTRS(taxon)
+        default_photo = taxon.default_photo
         return {
-            "id": taxon.id,
-            "name": taxon.name,
-            "rank": taxon.rank,
-            "display_name": taxon.display_name,
+            "id": taxon_id,
+            "name": name,
+            "rank": rank,
+            "display_name": display_name,
             "common_names": {
-                "english": taxon.english_common_name,
-                "chinese": taxon.chinese_common_name,
-                "preferred": taxon.preferred_common_name
+                "english": english,
+                "chinese": chinese,
+                "preferred": preferred
             },
-            "iconic_taxon": taxon.iconic_taxon_name,
-            "observations_count": taxon.observations_count,
-            "conservation_status": taxon.conservation_status_name,
+            "iconic_taxon": iconic_taxon,
+            "observations_count": observations_count,
+            "conservation_status": conservation_status,
             "photos": [
-                {
-                    "square": p.square_url,
-                    "medium": p.medium_url,
-                    "large": p.large_url,
-                    "attribution": p.attribution,
-                    "license": p.license_code
-                }
-                for p in taxon.taxon_photos[:5]  # 最多5张
-            ] if taxon.taxon_photos else [],
-            "default_photo": {
-                "square": taxon.default_photo.square_url if taxon.default_photo else None,
-                "medium": taxon.default_photo.medium_url if taxon.default_photo else None,
-                "large": taxon.default_photo.large_url if taxon.default_photo else None
-            },
+                dict(zip(_PHOTO_KEYS, values))
+                for values in map(_PHOTO_ATTRS, taxon.taxon_photos[:5])  # 最多5张
+            ],
+            "default_photo": dict(zip(_DEFAULT_PHOTO_KEYS, _DEFAULT_PHOTO_ATTRS(default_photo)))
+                if default_photo else dict.fromkeys(_DEFAULT_PHOTO_KEYS),
             "wikipedia": {
-                "summary": taxon.wikipedia_summary,
-                "url": taxon.wikipedia_url
+                "summary": wikipedia_summary,
+                "url": wikipedia_url
             }
         }
     
@@ -390,7 +797,7 @@ class INaturalistWebAdapter:
         }
     
     def _serialize_observation(self, observation) -> Dict[str, Any]:
-        """序列化 Observation 对象为字典"""
+        """序列化 Observation 对象（与分类群一样始终返回字典，与 Redis 缓存命中时的类型一致）"""
         return {
             "id": observation.id,
             "uuid": observation.uuid,
@@ -408,16 +815,7 @@ class INaturalistWebAdapter:
                 "place_guess": observation.place_guess,
                 "accuracy": observation.positional_accuracy
             },
-            "photos": [
-                {
-                    "id": p.id,
-                    "square": p.square_url,
-                    "medium": p.medium_url,
-                    "large": p.large_url,
-                    "attribution": p.attribution
-                }
-                for p in observation.photos
-            ],
+            "photos": [self._serialize_photo(p) for p in observation.photos],
             "user": {
                 "id": observation.user_id,
                 "login": observation.user_login,
@@ -426,6 +824,25 @@ class INaturalistWebAdapter:
             "url": observation.url,
             "description": observation.description
         }
+    
+    def _serialize_photo(self, photo) -> Dict[str, Any]:
+        """序列化观察记录的照片，compact_photos 开启时尽量使用紧凑格式"""
+        if self.compact_photos:
+            urls = compact_photo_urls(photo.square_url, photo.medium_url, photo.large_url)
+            if urls is not None:
+                return {
+                    "id": photo.id,
+                    **urls,
+                    "attribution": photo.attribution
+                }
+        
+        return {
+            "id": photo.id,
+            "square": photo.square_url,
+            "medium": photo.medium_url,
+            "large": photo.large_url,
+            "attribution": photo.attribution
+        }
 
 
 # ==================== Flask 集成示例 ====================
@@ -440,7 +857,10 @@ def create_flask_routes(app, adapter: INaturalistWebAdapter):
         adapter = INaturalistWebAdapter()
         create_flask_routes(app, adapter)
     """
-    from flask import request, jsonify
+    from flask import request, Response
+    
+    def jsonify(result):
+        return Response(dumps(result), mimetype="application/json")
     
     @app.route("/api/inat/species/search")
     def api_search_species():
@@ -452,7 +872,7 @@ def create_flask_routes(app, adapter: INaturalistWebAdapter):
         result = adapter.search_species(
             query=query,
             rank=rank,
-            iconica_taxa=iconic_taxa or None,
+            iconic_taxa=iconic_taxa or None,
             per_page=per_page
         )
         return jsonify(result)
@@ -478,23 +898,12 @@ def create_flask_routes(app, adapter: INaturalistWebAdapter):
     
     @app.route("/api/inat/observations")
     def api_search_observations():
-        taxon_id = request.args.get("taxon_id", type=int)
-        place_id = request.args.get("place_id", type=int)
-        lat = request.args.get("lat", type=float)
-        lng = request.args.get("lng", type=float)
-        radius = request.args.get("radius", type=float)
-        quality_grade = request.args.get("quality_grade", "research")
-        per_page = int(request.args.get("per_page", 30))
+        try:
+            query = parse_observation_query(request.args)
+        except ValueError as e:
+            return jsonify(_error_result(e)), 400
         
-        result = adapter.search_observations(
-            taxon_id=taxon_id,
-            place_id=place_id,
-            lat=lat,
-            lng=lng,
-            radius=radius,
-            quality_grade=quality_grade,
-            per_page=per_page
-        )
+        result = adapter.search_observations(**query)
         return jsonify(result)
     
     @app.route("/api/inat/observations/<int:observation_id>")
@@ -519,6 +928,9 @@ def create_fastapi_routes(adapter: INaturalistWebAdapter):
     """
     为 FastAPI 应用创建路由
     
+    处理函数调用适配器的异步方法 (httpx.AsyncClient)，上游请求不会阻塞事件循环；
+    应用关闭时调用 adapter.aclose() 释放连接池
+    
     Example:
         from fastapi import FastAPI
         app = FastAPI()
@@ -527,9 +939,19 @@ def create_fastapi_routes(adapter: INaturalistWebAdapter):
     """
     try:
         from fastapi import APIRouter, Query
+        from fastapi.responses import JSONResponse
         from typing import List
         
-        router = APIRouter(prefix="/api/inat", tags=["iNaturalist"])
+        class ORJSONResponse(JSONResponse):
+            """使用 orjson 序列化的响应"""
+            def render(self, content: Any) -> bytes:
+                return dumps(content)
+        
+        router = APIRouter(
+            prefix="/api/inat",
+            tags=["iNaturalist"],
+            default_response_class=ORJSONResponse
+        )
         
         @router.get("/species/search")
         async def search_species(
@@ -538,18 +960,19 @@ def create_fastapi_routes(adapter: INaturalistWebAdapter):
             iconic_taxa: Optional[List[str]] = Query(None),
             per_page: int = 30
         ):
-            return adapter.search_species(q, rank, iconic_taxa, per_page)
-        
-        @router.get("/species/{taxon_id}")
-        async def get_species(taxon_id: int):
-            return adapter.get_species_detail(taxon_id)
+            return await adapter.search_species_async(q, rank, iconic_taxa, per_page)
         
+        # 固定路径需在 /species/{taxon_id} 之前注册，否则会被其匹配
         @router.get("/species/autocomplete")
         async def autocomplete_species(
             q: str = Query(..., min_length=2),
             per_page: int = 10
         ):
-            return adapter.autocomplete_species(q, per_page)
+            return await adapter.autocomplete_species_async(q, per_page)
+        
+        @router.get("/species/{taxon_id}")
+        async def get_species(taxon_id: int):
+            return await adapter.get_species_detail_async(taxon_id)
         
         @router.get("/species/{taxon_id}/images")
         async def get_species_images(
@@ -557,7 +980,7 @@ def create_fastapi_routes(adapter: INaturalistWebAdapter):
             size: str = "medium",
             max_images: int = 10
         ):
-            return adapter.get_species_images(taxon_id, size, max_images)
+            return await adapter.get_species_images_async(taxon_id, size, max_images)
         
         @router.get("/observations")
         async def search_observations(
@@ -569,13 +992,13 @@ def create_fastapi_routes(adapter: INaturalistWebAdapter):
             quality_grade: str = "research",
             per_page: int = 30
         ):
-            return adapter.search_observations(
+            return await adapter.search_observations_async(
                 taxon_id, place_id, lat, lng, radius, quality_grade, True, per_page
             )
         
         @router.get("/observations/{observation_id}")
         async def get_observation(observation_id: int):
-            return adapter.get_observation_detail(observation_id)
+            return await adapter.get_observation_detail_async(observation_id)
         
         @router.get("/location/species")
         async def get_species_by_location(
@@ -584,7 +1007,7 @@ def create_fastapi_routes(adapter: INaturalistWebAdapter):
             radius: float = 10,
             per_page: int = 30
         ):
-            return adapter.get_species_by_location(lat, lng, radius, per_page)
+            return await adapter.get_species_by_location_async(lat, lng, radius, per_page)
         
         return router
     except ImportError:
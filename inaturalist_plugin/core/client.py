@@ -5,22 +5,128 @@ iNaturalist API 核心客户端模块
 API 文档: https://api.inaturalist.org/v1/docs/
 """
 
+import asyncio
+import json
+import os
+import random
 import requests
+import threading
 import time
-from typing import Dict, List, Optional, Any, Union
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
 from urllib.parse import urljoin
 
+from inaturalist_plugin.core.rate_limit import TokenBucket
 
-@dataclass
+try:
+    from requests_cache import CachedSession
+except ImportError:  # requests-cache 为可选依赖，未安装时不缓存响应
+    CachedSession = None
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用 response.json()
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson 为可选依赖，未安装时 get_stream 整体解析响应
+    ijson = None
+
+try:
+    import httpx
+except ImportError:  # httpx 为可选依赖，未安装时使用 requests，且不提供异步客户端
+    httpx = None
+
+try:
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+    HTTP2_AVAILABLE = httpx is not None
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# 进程内所有客户端共享的请求配额：iNaturalist 建议每分钟不超过 60 次请求，
+# 超过 100 次会被临时封禁。容量 10 保证任意一分钟内最多 70 次请求
+GLOBAL_RATE_LIMIT_PER_MINUTE = 60
+_GLOBAL_LIMITER = TokenBucket(rate=GLOBAL_RATE_LIMIT_PER_MINUTE / 60.0, capacity=10)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "iNaturalistPlugin/1.0 (Scientific Research)",
+    "Accept": "application/json"
+}
+
+# 需要重试的传输层异常（requests 与 httpx）
+_TRANSPORT_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+
+# 需要重试的响应状态码（429 时遵循 Retry-After 响应头）
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# 退避时间的随机抖动上限（相对 retry_delay 的比例），避免多个客户端同时重试
+RETRY_JITTER = 0.1
+
+
+def retry_backoff(attempt: int, base: float, retry_after: Optional[float] = None) -> float:
+    """
+    计算第 attempt 次重试（从 0 开始）前的等待时间
+    
+    指数退避 base * 2^attempt 加随机抖动；服务器给出 Retry-After 时至少等待该时间
+    
+    Example:
+        >>> retry_backoff(2, 1.0)  # 约 4 秒
+        >>> retry_backoff(0, 1.0, retry_after=30)  # 30 秒
+    """
+    delay = base * 2 ** attempt + random.uniform(0, RETRY_JITTER * base)
+    return max(delay, retry_after or 0)
+
+
+def _parse_retry_after(response) -> Optional[float]:
+    """解析 Retry-After 响应头（秒数或 HTTP 日期），无法解析时返回 None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+# get_cached / get_total_count（含异步客户端的 get_cached）的进程内缓存时间（秒）和最大条目数；
+# 总数和统计类结果变化缓慢，同一筛选条件的界面（总数、直方图、物种统计）会反复查询
+RESPONSE_CACHE_TTL = 300
+RESPONSE_CACHE_SIZE = 1024
+
+# 响应缓存时间（秒），按 URL 匹配，先匹配的规则优先
+URLS_EXPIRE_AFTER = {
+    "*/taxa/autocomplete*": 60,
+    "*/taxa/*": 86400,
+    "*/observations*": 300,
+}
+
+
+@dataclass(slots=True)
 class APIConfig:
     """API 配置类"""
     base_url: str = "https://api.inaturalist.org/v1"
     timeout: int = 30
-    max_retries: int = 3
-    retry_delay: float = 1.0
+    max_retries: int = 3  # 连接错误和 429/5xx 响应的最大重试次数
+    retry_delay: float = 1.0  # 重试的指数退避系数（秒）
     rate_limit_per_second: float = 1.0  # iNaturalist 建议每秒最多1个请求
     api_key: Optional[str] = None  # 可选的 JWT token
+    pool_connections: int = 20  # 连接池缓存的主机数
+    pool_maxsize: int = 50  # 每个主机保持的最大连接数（多线程共享）
+    use_cache: bool = True  # 是否缓存 GET 响应（需要安装 requests-cache）
+    cache_name: str = os.path.join("~", ".cache", "inat")  # SQLite 缓存文件路径
+    cache_expire_after: int = 86400  # 未匹配 URLS_EXPIRE_AFTER 的响应缓存时间（秒）
+    http2: bool = False  # 使用 httpx 的 HTTP/2 多路复用连接（需要安装 httpx[http2]，不使用响应缓存）
 
 
 class INaturalistAPIError(Exception):
@@ -41,6 +147,57 @@ class AuthenticationError(INaturalistAPIError):
     pass
 
 
+class PaginationLimitError(INaturalistAPIError):
+    """请求的页超出 API 允许访问的结果范围（page * per_page 不能超过 10000）"""
+    pass
+
+
+def _decode_json(response) -> Dict[str, Any]:
+    """
+    解析 JSON 响应体
+    
+    iNaturalist API 始终返回 UTF-8，直接解析字节，跳过编码探测；
+    安装了 orjson 时使用 orjson.loads
+    """
+    content = response.content
+    if not content:
+        return {}
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class _ChunkReader:
+    """把响应的字节块迭代器包装为 ijson 需要的 read() 接口"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+
+    def read(self, size: int = -1) -> bytes:
+        return next(self._chunks, b"")
+
+
+# 流式解析时每次读取的字节数
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """
+    发送前执行速率限制的连接适配器
+
+    速率限制放在适配器而不是客户端中，缓存命中的请求不会到达适配器，
+    因此不会被无谓地限速
+    """
+
+    def __init__(self, rate_limiter: Callable[[], None], **kwargs):
+        self._rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self._rate_limiter()
+        return super().send(request, **kwargs)
+
+
 class INaturalistClient:
     """
     iNaturalist API 客户端
@@ -48,31 +205,105 @@ class INaturalistClient:
     支持的功能:
     - 自动重试机制
     - 速率限制控制
+    - 响应缓存 (requests-cache)
+    - HTTP/2 多路复用连接 (httpx，可选)
     - 认证管理
     - 请求/响应日志
     """
     
     def __init__(self, config: Optional[APIConfig] = None):
         self.config = config or APIConfig()
-        self.session = requests.Session()
-        self._last_request_time = 0
+        # 确保 base_url 以 / 结尾（请求时去掉 endpoint 开头的 /）
+        self._base_url = self.config.base_url.rstrip("/") + "/"
+        
+        # 滑动窗口限速：任意 _rate_period 秒内最多 maxlen 个请求（允许短时突发）
+        self._rate_window = deque(maxlen=max(1, int(self.config.rate_limit_per_second)))
+        self._rate_period = self._rate_window.maxlen / self.config.rate_limit_per_second
+        self._rate_lock = threading.Lock()
+        self._response_cache: Dict[tuple, Tuple[float, Dict[str, Any], Optional[str]]] = {}
+        
+        if self.config.http2 and HTTP2_AVAILABLE:
+            self.session = self._create_http2_session()
+        else:
+            self.session = self._create_session()
+            
+            # 复用 keep-alive 连接，避免每次请求重新进行 TCP/TLS 握手；
+            # 重试和退避由 urllib3 在连接池内完成
+            adapter = _RateLimitedAdapter(
+                self._apply_rate_limit,
+                pool_connections=self.config.pool_connections,
+                pool_maxsize=self.config.pool_maxsize,
+                max_retries=self._create_retry()
+            )
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
         
         # 设置默认请求头
-        self.session.headers.update({
-            "User-Agent": "iNaturalistPlugin/1.0 (Scientific Research)",
-            "Accept": "application/json"
-        })
+        self.session.headers.update(DEFAULT_HEADERS)
         
         if self.config.api_key:
             self.session.headers["Authorization"] = f"Bearer {self.config.api_key}"
     
+    def _create_session(self) -> requests.Session:
+        """
+        创建 HTTP 会话
+        
+        安装了 requests-cache 时使用 SQLite 持久化缓存，跨进程共享；
+        带认证的客户端不缓存，避免不同用户的响应混用
+        """
+        if self.config.use_cache and not self.config.api_key and CachedSession is not None:
+            return CachedSession(
+                cache_name=os.path.expanduser(self.config.cache_name),
+                backend="sqlite",
+                expire_after=timedelta(seconds=self.config.cache_expire_after),
+                urls_expire_after=URLS_EXPIRE_AFTER,
+                allowable_methods=("GET",)
+            )
+        return requests.Session()
+    
+    def _create_retry(self) -> Retry:
+        """创建重试策略：连接错误和 RETRY_STATUS_CODES 状态码按指数退避重试"""
+        return Retry(
+            total=self.config.max_retries,
+            backoff_factor=self.config.retry_delay,
+            backoff_jitter=RETRY_JITTER * self.config.retry_delay,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=("GET", "POST"),
+            respect_retry_after_header=True,
+            raise_on_status=False  # 重试耗尽后返回最后一个响应，由 _make_request 转换为异常
+        )
+    
+    def _create_http2_session(self) -> "httpx.Client":
+        """
+        创建 HTTP/2 会话
+        
+        并发请求复用同一个 TLS 连接上的多个流，减少连接数和握手次数。
+        httpx 只重试连接错误，429/5xx 响应由 _make_request 重试
+        """
+        return httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=self.config.max_retries,
+                limits=httpx.Limits(
+                    max_connections=self.config.pool_maxsize,
+                    max_keepalive_connections=self.config.pool_connections
+                )
+            ),
+            timeout=self.config.timeout,
+            event_hooks={"request": [lambda request: self._apply_rate_limit()]}
+        )
+    
     def _apply_rate_limit(self):
-        """应用速率限制"""
-        min_interval = 1.0 / self.config.rate_limit_per_second
-        elapsed = time.time() - self._last_request_time
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self._last_request_time = time.time()
+        """应用速率限制（客户端自身的滑动窗口 + 进程级共享配额）"""
+        with self._rate_lock:
+            now = time.monotonic()
+            if len(self._rate_window) == self._rate_window.maxlen:
+                wait = self._rate_period - (now - self._rate_window[0])
+                if wait > 0:
+                    time.sleep(wait)
+                    now = time.monotonic()
+            self._rate_window.append(now)
+        _GLOBAL_LIMITER.acquire()
     
     def _make_request(
         self,
@@ -80,7 +311,8 @@ class INaturalistClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         data: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        decode: Optional[Callable[[bytes], Any]] = None
     ) -> Dict[str, Any]:
         """
         执行 HTTP 请求
@@ -91,6 +323,7 @@ class INaturalistClient:
             params: URL 查询参数
             data: 请求体数据
             headers: 额外请求头
+            decode: 可选，响应体 (bytes) 的解码函数，默认解析为字典
             
         Returns:
             API 响应的 JSON 数据
@@ -98,75 +331,130 @@ class INaturalistClient:
         Raises:
             INaturalistAPIError: API 调用失败
         """
-        # 确保 base_url 以 / 结尾，endpoint 不以 / 开头
-        base_url = self.config.base_url.rstrip("/") + "/"
-        endpoint = endpoint.lstrip("/")
-        url = base_url + endpoint
-        request_headers = {**(headers or {})}
+        response = self._send(method, endpoint, params, data, headers)
+        if decode is not None:
+            return decode(response.content)
+        return _decode_json(response)
+    
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False
+    ):
+        """
+        发送请求并检查状态码（参数同 _make_request）
+        
+        Args:
+            stream: 为 True 时不预先读取响应体（仅 requests 会话），调用方负责关闭响应
+            
+        Returns:
+            状态码正常的响应对象
+        """
+        url = self._base_url + endpoint.lstrip("/")
+        if isinstance(self.session, requests.Session):
+            retries = 0  # 由挂载的 urllib3 Retry 重试
+        else:
+            retries = self.config.max_retries
+            if params:
+                # requests 会忽略值为 None 的参数，httpx 会编码为空字符串
+                params = {k: v for k, v in params.items() if v is not None}
         
-        last_exception = None
+        extra = {"stream": True} if stream else {}
         
-        for attempt in range(self.config.max_retries):
-            try:
-                self._apply_rate_limit()
-                
+        try:
+            for attempt in range(retries + 1):
                 response = self.session.request(
                     method=method,
                     url=url,
                     params=params,
                     json=data,
-                    headers=request_headers,
-                    timeout=self.config.timeout
+                    headers=headers,
+                    timeout=self.config.timeout,
+                    **extra
                 )
-                
-                # 处理特定状态码
-                if response.status_code == 429:
-                    raise RateLimitError("Rate limit exceeded", status_code=429)
-                elif response.status_code == 401:
-                    raise AuthenticationError("Authentication required", status_code=401)
-                
-                response.raise_for_status()
-                
-                if response.content:
-                    return response.json()
-                return {}
-                
-            except requests.exceptions.RequestException as e:
-                last_exception = e
-                if hasattr(e.response, 'status_code'):
-                    if e.response.status_code == 429:
-                        # 速率限制，等待更长时间
-                        time.sleep(self.config.retry_delay * (attempt + 1))
-                        continue
-                
-                if attempt < self.config.max_retries - 1:
-                    time.sleep(self.config.retry_delay)
-                else:
-                    raise INaturalistAPIError(
-                        f"Request failed after {self.config.max_retries} attempts: {str(e)}",
-                        status_code=getattr(e.response, 'status_code', None)
-                    )
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    break
+                time.sleep(retry_backoff(attempt, self.config.retry_delay, _parse_retry_after(response)))
+            
+            # 处理特定状态码
+            if response.status_code == 429:
+                raise RateLimitError("Rate limit exceeded", status_code=429)
+            elif response.status_code == 401:
+                raise AuthenticationError("Authentication required", status_code=401)
+            
+            response.raise_for_status()
+        except _TRANSPORT_ERRORS as e:
+            error_response = getattr(e, "response", None)
+            raise INaturalistAPIError(
+                f"Request failed after {self.config.max_retries} retries: {str(e)}",
+                status_code=getattr(error_response, 'status_code', None)
+            ) from e
         
-        raise last_exception or INaturalistAPIError("Unknown error occurred")
+        return response
     
-    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """执行 GET 请求"""
-        return self._make_request("GET", endpoint, params=params)
+    def get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        decode: Optional[Callable[[bytes], Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        执行 GET 请求
+        
+        Args:
+            endpoint: API 端点
+            params: 查询参数
+            decode: 可选，响应体的解码函数（如 models.structs.decode_observation_page）
+        """
+        return self._make_request("GET", endpoint, params=params, decode=decode)
     
     def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """执行 POST 请求"""
         return self._make_request("POST", endpoint, data=data)
     
-    def paginate(
+    def get_stream(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        执行 GET 请求，逐条返回响应中 results 数组的元素
+        
+        安装了 ijson 时边下载边解析，不在内存中保留整个响应体；
+        未安装 ijson 或使用 HTTP/2 会话时整体解析后逐条返回
+        
+        Example:
+            >>> for item in client.get_stream("/observations", {"per_page": 200}):
+            ...     print(item["id"])
+        """
+        if ijson is None or not isinstance(self.session, requests.Session):
+            yield from self.get(endpoint, params).get("results", [])
+            return
+        
+        response = self._send("GET", endpoint, params, stream=True)
+        try:
+            reader = _ChunkReader(response.iter_content(STREAM_CHUNK_SIZE))
+            yield from ijson.items(reader, "results.item", use_float=True)
+        finally:
+            response.close()
+    
+    def iter_paginate(
         self,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         per_page: int = 200,
         max_pages: Optional[int] = None,
         max_results: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Dict[str, Any]]:
         """
-        分页获取所有结果
+        分页获取结果，逐条返回
+        
+        每页请求完成后立即返回该页结果，调用方可以边获取边处理，
+        不需要在内存中保留所有页面
         
         Args:
             endpoint: API 端点
@@ -175,44 +463,97 @@ class INaturalistClient:
             max_pages: 最大页数限制
             max_results: 最大结果数量限制
             
-        Returns:
-            所有页面的结果合并列表
+        Yields:
+            单条结果数据
         """
-        params = params or {}
-        params["per_page"] = min(per_page, 200)  # API 限制最大 200
+        params = dict(params or {})
+        per_page = params["per_page"] = min(per_page, 200)  # API 限制最大 200
         params["page"] = 1
         
-        all_results = []
+        count = 0
         total_pages = None
         
         while True:
             response = self.get(endpoint, params)
             
             results = response.get("results", [])
-            all_results.extend(results)
-            
-            # 更新总页数
-            if total_pages is None and "total_results" in response:
-                total_pages = (response["total_results"] + per_page - 1) // per_page
             
             # 检查是否还有更多结果
             if not results:
-                break
+                return
             
             # 检查限制
-            if max_results and len(all_results) >= max_results:
-                all_results = all_results[:max_results]
-                break
+            if max_results and count + len(results) >= max_results:
+                yield from results[:max_results - count]
+                return
+            
+            yield from results
+            count += len(results)
+            
+            # 更新总页数
+            if total_pages is None and "total_results" in response:
+                total_pages = (response["total_results"] + per_page - 1) // per_page
             
             if max_pages and params["page"] >= max_pages:
-                break
+                return
             
             if total_pages and params["page"] >= total_pages:
-                break
+                return
             
             params["page"] += 1
+    
+    def paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = 200,
+        max_pages: Optional[int] = None,
+        max_results: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        分页获取所有结果（参数同 iter_paginate）
+            
+        Returns:
+            所有页面的结果合并列表
+        """
+        return list(self.iter_paginate(endpoint, params, per_page, max_pages, max_results))
+    
+    def get_cached(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        ttl: float = RESPONSE_CACHE_TTL
+    ) -> Dict[str, Any]:
+        """
+        GET 请求，相同查询的响应在进程内缓存 ttl 秒
+        
+        用于总数、统计类等变化缓慢的查询；命中时直接返回之前的字典，不访问网络
+        （也不读取 requests-cache 的磁盘缓存）。调用方不应修改返回的字典。
+        过期后如果上次响应带有 ETag，发送 If-None-Match 条件请求，
+        服务端返回 304 时沿用之前的字典，不传输也不解析响应体
+        
+        Args:
+            endpoint: API 端点
+            params: 查询参数（值为 None 的参数忽略，与 get 一致）
+            ttl: 缓存时间（秒）
+        """
+        key = (endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items() if v is not None)))
         
-        return all_results
+        entry = self._response_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        headers = {"If-None-Match": entry[2]} if entry is not None and entry[2] else None
+        response = self._send("GET", endpoint, params, headers=headers)
+        if response.status_code == 304:
+            data, etag = entry[1], entry[2]
+        else:
+            data, etag = _decode_json(response), response.headers.get("ETag")
+        
+        if entry is None and len(self._response_cache) >= RESPONSE_CACHE_SIZE:
+            self._response_cache.pop(next(iter(self._response_cache)), None)
+        self._response_cache[key] = (time.monotonic() + ttl, data, etag)
+        return data
     
     def get_total_count(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> int:
         """
@@ -224,15 +565,180 @@ class INaturalistClient:
             
         Returns:
             总结果数量
+        
+        相同查询的结果在进程内缓存 RESPONSE_CACHE_TTL 秒
+        """
+        params = dict(params or {})
+        params["per_page"] = 0  # 不返回任何记录，响应只有总数
+        return self.get_cached(endpoint, params).get("total_results", 0)
+
+
+class AsyncINaturalistClient:
+    """
+    iNaturalist API 异步客户端
+    
+    基于 httpx.AsyncClient（安装了 h2 时使用 HTTP/2），get/post 为协程，
+    多个请求可以用 asyncio.gather 并发执行。请求配额与同步客户端共享
+    进程级令牌桶，等待配额时不阻塞事件循环。不使用 requests-cache 磁盘缓存，
+    总数类查询可用 get_cached 在进程内缓存。
+    
+    Example:
+        >>> async with AsyncINaturalistClient() as client:
+        ...     data = await client.get("/taxa/9083")
+    """
+    
+    def __init__(self, config: Optional[APIConfig] = None):
+        if httpx is None:
+            raise ImportError("AsyncINaturalistClient 需要安装 httpx: pip install \"httpx[http2]\"")
+        
+        self.config = config or APIConfig()
+        
+        headers = dict(DEFAULT_HEADERS)
+        if self.config.api_key:
+            headers["Authorization"] = f"Bearer {self.config.api_key}"
+        
+        self.session = httpx.AsyncClient(
+            base_url=self.config.base_url.rstrip("/") + "/",
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=self.config.pool_maxsize,
+                max_keepalive_connections=self.config.pool_connections
+            ),
+            timeout=self.config.timeout,
+            headers=headers
+        )
+        
+        # get_cached 的进程内缓存: 查询键 -> (过期时间, 响应字典)
+        self._response_cache: Dict[tuple, Tuple[float, Dict[str, Any]]] = {}
+    
+    async def __aenter__(self) -> "AsyncINaturalistClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """关闭连接池"""
+        await self.session.aclose()
+    
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        执行 HTTP 请求（错误处理同 INaturalistClient._make_request）
+        
+        连接错误和 RETRY_STATUS_CODES 状态码最多重试 max_retries 次，
+        按 retry_backoff 指数退避并遵循 Retry-After 响应头
+        """
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+        
+        retries = self.config.max_retries
+        for attempt in range(retries + 1):
+            await _GLOBAL_LIMITER.acquire_async()
+            try:
+                response = await self.session.request(
+                    method,
+                    endpoint.lstrip("/"),
+                    params=params,
+                    json=data
+                )
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise INaturalistAPIError(
+                        f"Request failed after {retries} retries: {str(e)}"
+                    ) from e
+                await asyncio.sleep(retry_backoff(attempt, self.config.retry_delay))
+                continue
+            
+            if response.status_code in RETRY_STATUS_CODES and attempt < retries:
+                await asyncio.sleep(
+                    retry_backoff(attempt, self.config.retry_delay, _parse_retry_after(response))
+                )
+                continue
+            break
+        
+        if response.status_code == 429:
+            raise RateLimitError("Rate limit exceeded", status_code=429)
+        elif response.status_code == 401:
+            raise AuthenticationError("Authentication required", status_code=401)
+        
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise INaturalistAPIError(
+                f"Request failed after {retries} retries: {str(e)}",
+                status_code=response.status_code
+            ) from e
+        
+        return _decode_json(response)
+    
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """执行 GET 请求"""
+        return await self._make_request("GET", endpoint, params=params)
+    
+    async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """执行 POST 请求"""
+        return await self._make_request("POST", endpoint, data=data)
+    
+    async def get_cached(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        ttl: float = RESPONSE_CACHE_TTL
+    ) -> Dict[str, Any]:
+        """
+        GET 请求，相同查询的响应在进程内缓存 ttl 秒（同 INaturalistClient.get_cached，不发送条件请求）
+        
+        调用方不应修改返回的字典
         """
-        params = params or {}
-        params["per_page"] = 0
-        response = self.get(endpoint, params)
-        return response.get("total_results", 0)
+        key = (endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items() if v is not None)))
+        
+        entry = self._response_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        data = await self.get(endpoint, params)
+        
+        if entry is None and len(self._response_cache) >= RESPONSE_CACHE_SIZE:
+            self._response_cache.pop(next(iter(self._response_cache)), None)
+        self._response_cache[key] = (time.monotonic() + ttl, data)
+        return data
 
 
 # 便捷函数: 创建默认客户端
-def create_client(api_key: Optional[str] = None) -> INaturalistClient:
+def create_client(
+    api_key: Optional[str] = None,
+    use_cache: bool = True,
+    http2: bool = False
+) -> INaturalistClient:
     """创建默认配置的 iNaturalist 客户端"""
-    config = APIConfig(api_key=api_key)
+    config = APIConfig(api_key=api_key, use_cache=use_cache, http2=http2)
     return INaturalistClient(config)
+
+
+_default_client: Optional[INaturalistClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> INaturalistClient:
+    """
+    获取进程内共享的默认客户端（首次调用时创建）
+
+    便捷函数都使用这个客户端，连续调用复用同一个连接池，不必每次重新建立 TCP/TLS 连接
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = create_client()
+    return _default_client
+
+
+def create_async_client(api_key: Optional[str] = None) -> AsyncINaturalistClient:
+    """创建默认配置的 iNaturalist 异步客户端"""
+    return AsyncINaturalistClient(APIConfig(api_key=api_key))
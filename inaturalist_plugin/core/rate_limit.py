@@ -0,0 +1,69 @@
+"""
+速率限制模块
+
+提供线程安全的令牌桶，用于在多个客户端/线程之间共享请求配额
+"""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    令牌桶限速器
+
+    每秒补充 rate 个令牌，最多积累 capacity 个。令牌不足时 acquire 会
+    预占令牌并休眠到可用为止（从不丢弃请求），多个线程按调用顺序排队。
+
+    Example:
+        >>> bucket = TokenBucket(rate=1.0, capacity=10)
+        >>> bucket.acquire()
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量（允许的突发请求数）
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """预占令牌，返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        获取令牌，必要时阻塞等待
+
+        Args:
+            tokens: 需要的令牌数
+
+        Returns:
+            实际等待的秒数
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """
+        获取令牌（异步版本），等待期间不阻塞事件循环
+
+        与 acquire 共享同一份配额，同步和异步调用方一起排队
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,13 @@
+"""模型共用的字符串工具"""
+
+import sys
+from typing import Any
+
+
+def intern_str(value: Any) -> Any:
+    """
+    驻留取值有限的字符串字段（如 rank、quality_grade）
+
+    JSON 解析时每条记录都会新建字符串，驻留后相同取值共享同一个对象；非字符串原样返回
+    """
+    return sys.intern(value) if type(value) is str else value
@@ -4,41 +4,68 @@
 定义 iNaturalist 观察记录相关的数据结构
 """
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+import inspect
+from dataclasses import InitVar, dataclass, field, fields
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from datetime import datetime, timezone
 from enum import Enum
+from operator import attrgetter
 
+from inaturalist_plugin.models._strings import intern_str
 
-class QualityGrade(Enum):
+
+# 照片尺寸 -> 对应 URL 属性的读取函数
+_SIZE_GETTERS = {size: attrgetter(f"{size}_url") for size in ("square", "thumb", "small", "medium", "large")}
+
+
+class QualityGrade(str, Enum):
     """观察记录质量等级"""
     RESEARCH = "research"  # 研究级
     NEEDS_ID = "needs_id"  # 需要鉴定
     CASUAL = "casual"      # 休闲级
 
 
-class Geoprivacy(Enum):
+class Geoprivacy(str, Enum):
     """地理位置隐私设置"""
     OPEN = "open"           # 公开
     OBSCURED = "obscured"   # 模糊
     PRIVATE = "private"     # 私有
 
 
-@dataclass
-class Geojson:
-    """GeoJSON 坐标"""
+# 热点属性直接与字符串常量比较，避免每次经过 Enum 的 .value 描述符
+_RESEARCH_GRADE = QualityGrade.RESEARCH.value
+
+
+def _parse_ts(value: Optional[str]) -> Optional[float]:
+    """
+    ISO 8601 时间字符串 -> Unix 时间戳（秒），无法解析时返回 None
+    
+    不带时区的时间（如 observed_on 的 "YYYY-MM-DD"）按 UTC 处理
+    """
+    if not value:
+        return None
+    if value.endswith("Z"):  # Python 3.10 的 fromisoformat 不支持 Z 后缀
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class Geojson(NamedTuple):
+    """GeoJSON 坐标（只读容器，使用 NamedTuple 而非 dataclass）"""
     type: str
-    coordinates: List[float]
+    coordinates: Tuple[float, ...]
     
     @classmethod
     def from_api(cls, data: Dict[str, Any]) -> "Geojson":
-        return cls(
-            type=data.get("type", "Point"),
-            coordinates=data.get("coordinates", [])
-        )
+        return cls(data.get("type", "Point"), tuple(data.get("coordinates") or ()))
 
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     """位置信息"""
     latitude: float
@@ -58,7 +85,7 @@ class Location:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ObservationPhoto:
     """观察记录照片"""
     id: int
@@ -97,7 +124,7 @@ class ObservationPhoto:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Identification:
     """鉴定信息"""
     id: int
@@ -123,7 +150,7 @@ class Identification:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """用户信息"""
     id: int
@@ -141,7 +168,52 @@ class User:
         )
 
 
-@dataclass
+# Observation.from_api 直接复制的字段: (API 字段名, 属性名, 默认值)
+_OBSERVATION_SCALAR_FIELDS = (
+    ("id", "id", 0),
+    ("uuid", "uuid", ""),
+    ("quality_grade", "quality_grade", QualityGrade.CASUAL.value),
+    ("species_guess", "species_guess", None),
+    ("description", "description", None),
+    ("iconic_taxon_name", "iconic_taxon_name", None),
+    ("observed_on", "observed_on", None),
+    ("observed_on_string", "observed_on_string", None),
+    ("time_observed_at", "time_observed_at", None),
+    ("created_at", "created_at", None),
+    ("updated_at", "updated_at", None),
+    ("latitude", "latitude", None),
+    ("longitude", "longitude", None),
+    ("positional_accuracy", "positional_accuracy", None),
+    ("place_guess", "place_guess", None),
+    ("geoprivacy", "geoprivacy", None),
+    ("coordinates_obscured", "coordinates_obscured", False),
+    ("location", "location_string", None),
+    ("identifications_count", "identification_count", 0),
+    ("num_identification_agreements", "num_identification_agreements", 0),
+    ("num_identification_disagreements", "num_identification_disagreements", 0),
+    ("comments_count", "comments_count", 0),
+    ("faves_count", "faves_count", 0),
+    ("user_id", "user_id", None),
+    ("user_login", "user_login", None),
+    ("identifications_most_agree", "identifications_most_agree", False),
+    ("identifications_some_agree", "identifications_some_agree", False),
+    ("identifications_most_disagree", "identifications_most_disagree", False),
+    ("license_code", "license_code", None),
+    ("url", "url", None),
+    ("uri", "uri", None),
+)
+
+# 取值有限、需要驻留的字符串字段
+_OBSERVATION_INTERNED_FIELDS = ("quality_grade", "iconic_taxon_name", "geoprivacy", "license_code")
+
+# 字典列表字段（API 字段名与属性名相同），缺失或为空时共享空元组，不再为每条记录分配空列表
+_OBSERVATION_LIST_FIELDS = ("sounds", "project_observations")
+
+# 构建后不再修改的 ID/URL 列表，存为元组（API 字段名与属性名相同）
+_OBSERVATION_TUPLE_FIELDS = ("photo_urls", "project_ids")
+
+
+@dataclass(slots=True)
 class Observation:
     """
     观察记录完整信息
@@ -176,16 +248,16 @@ class Observation:
     place_guess: Optional[str] = None
     geoprivacy: Optional[str] = None
     coordinates_obscured: bool = False
-    geojson: Optional[Geojson] = None
+    geojson: InitVar[Optional[Geojson]] = None
     location_string: Optional[str] = None  # "lat,lng"
     
     # 媒体
-    photos: List[ObservationPhoto] = field(default_factory=list)
-    photo_urls: List[str] = field(default_factory=list)
-    sounds: List[Dict[str, Any]] = field(default_factory=list)
+    photos: InitVar[Optional[Sequence[ObservationPhoto]]] = None
+    photo_urls: Tuple[str, ...] = ()
+    sounds: Sequence[Dict[str, Any]] = ()
     
     # 社区
-    identifications: List[Identification] = field(default_factory=list)
+    identifications: InitVar[Optional[Sequence[Identification]]] = None
     identification_count: int = 0
     num_identification_agreements: int = 0
     num_identification_disagreements: int = 0
@@ -195,11 +267,11 @@ class Observation:
     # 用户
     user_id: Optional[int] = None
     user_login: Optional[str] = None
-    user: Optional[User] = None
+    user: InitVar[Optional[User]] = None
     
     # 项目
-    project_ids: List[int] = field(default_factory=list)
-    project_observations: List[Dict[str, Any]] = field(default_factory=list)
+    project_ids: Tuple[int, ...] = ()
+    project_observations: Sequence[Dict[str, Any]] = ()
     
     # 标识符
     identifications_most_agree: bool = False
@@ -211,100 +283,121 @@ class Observation:
     url: Optional[str] = None
     uri: Optional[str] = None
     
-    # 原始数据
-    raw_data: Dict[str, Any] = field(default_factory=dict, repr=False)
+    # 原始数据（仅在 from_api(keep_raw=True) 时保留）
+    raw_data: Optional[Dict[str, Any]] = field(default=None, repr=False)
     
-    @classmethod
-    def from_api(cls, data: Dict[str, Any]) -> "Observation":
-        """从 API 响应创建 Observation 对象"""
+    # 子对象（geojson/photos/identifications/user）的存储，通过同名属性读写
+    _geojson: Optional[Geojson] = field(default=None, init=False, repr=False)
+    # 没有照片/鉴定时共享空元组
+    _photos: Sequence[ObservationPhoto] = field(default=(), init=False, repr=False)
+    _identifications: Sequence[Identification] = field(default=(), init=False, repr=False)
+    _user: Optional[User] = field(default=None, init=False, repr=False)
+    # 尚未构建的子对象: 属性名 -> (构建函数, 原始数据)，首次读取时构建
+    _pending: Optional[Dict[str, Tuple[Callable[[Any], Any], Any]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # display_name 的缓存（名称字段在创建后视为不变）
+    _display_name: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self, geojson, photos, identifications, user):
+        self._geojson = geojson
+        self._photos = photos if photos is not None else ()
+        self._identifications = identifications if identifications is not None else ()
+        self._user = user
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _OBSERVATION_COMPARED)
+    
+    def defer(self, name: str, build: Callable[[Any], Any], raw: Any):
+        """
+        延迟构建子对象，首次读取 name 属性时才调用 build(raw)
         
-        # 处理照片
-        photos = []
-        if data.get("photos"):
-            photos = [ObservationPhoto.from_api(p) for p in data["photos"]]
-        elif data.get("observation_photos"):
-            photos = [ObservationPhoto.from_api(p) for p in data["observation_photos"]]
+        Args:
+            name: geojson / photos / identifications / user
+            build: 构建函数
+            raw: 原始数据（API 字典或解码后的 Struct）
+        """
+        if self._pending is None:
+            self._pending = {}
+        self._pending[name] = (build, raw)
+    
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], keep_raw: bool = False) -> "Observation":
+        """
+        从 API 响应创建 Observation 对象
         
-        # 处理鉴定
-        identifications = []
-        if data.get("identifications"):
-            identifications = [Identification.from_api(i) for i in data["identifications"]]
+        Args:
+            data: API 返回的单条记录
+            keep_raw: 是否在 raw_data 中保留原始字典（默认不保留，避免整棵 JSON 树常驻内存）
+        """
+        # 按位置传参，不构建关键字参数字典
+        observation = cls(*[
+            data.get(key, default) if convert is None else convert(data.get(key, default))
+            for key, default, convert in _OBSERVATION_INIT_PLAN
+        ])
         
-        # 处理用户
-        user = None
-        if data.get("user"):
-            user = User.from_api(data["user"])
+        # 处理分类群信息
+        taxon_data = data.get("taxon")
+        observation.taxon_id = data.get("taxon_id") or (taxon_data.get("id") if taxon_data else None)
+        if taxon_data:
+            observation.taxon_name = taxon_data.get("name")
+            observation.taxon_rank = intern_str(taxon_data.get("rank"))
+        if keep_raw:
+            observation.raw_data = data
         
-        # 处理 GeoJSON
-        geojson = None
-        if data.get("geojson"):
-            geojson = Geojson.from_api(data["geojson"])
+        # 照片、鉴定、用户和 GeoJSON 在首次访问时才构建，列表接口通常只读取部分字段
+        photos = data.get("photos") or data.get("observation_photos")
+        if photos:
+            observation.defer("photos", _photos_from_api, photos)
+        if identifications := data.get("identifications"):
+            observation.defer("identifications", _identifications_from_api, identifications)
+        if user := data.get("user"):
+            observation.defer("user", User.from_api, user)
+        if geojson := data.get("geojson"):
+            observation.defer("geojson", Geojson.from_api, geojson)
+        return observation
+    
+    @classmethod
+    def from_api_batch(cls, items: List[Dict[str, Any]]) -> List["Observation"]:
+        """
+        批量创建 Observation 对象（如 API 响应的 results），结果顺序与 items 一致
         
-        # 处理分类群信息
-        taxon_data = data.get("taxon", {})
-        taxon_id = data.get("taxon_id") or taxon_data.get("id")
-        taxon_name = taxon_data.get("name") if taxon_data else None
-        taxon_rank = taxon_data.get("rank") if taxon_data else None
+        Example:
+            >>> Observation.from_api_batch(response.get("results", []))
+        """
+        return list(map(cls.from_api, items))
+    
+    @classmethod
+    def from_json_bytes(cls, raw: bytes) -> "Observation":
+        """
+        从单条记录的 JSON bytes 创建 Observation 对象
         
-        return cls(
-            id=data.get("id", 0),
-            uuid=data.get("uuid", ""),
-            quality_grade=data.get("quality_grade", QualityGrade.CASUAL.value),
-            species_guess=data.get("species_guess"),
-            description=data.get("description"),
-            taxon_id=taxon_id,
-            taxon_name=taxon_name,
-            taxon_rank=taxon_rank,
-            iconic_taxon_name=data.get("iconic_taxon_name"),
-            observed_on=data.get("observed_on"),
-            observed_on_string=data.get("observed_on_string"),
-            time_observed_at=data.get("time_observed_at"),
-            created_at=data.get("created_at"),
-            updated_at=data.get("updated_at"),
-            latitude=data.get("latitude"),
-            longitude=data.get("longitude"),
-            positional_accuracy=data.get("positional_accuracy"),
-            place_guess=data.get("place_guess"),
-            geoprivacy=data.get("geoprivacy"),
-            coordinates_obscured=data.get("coordinates_obscured", False),
-            geojson=geojson,
-            location_string=data.get("location"),
-            photos=photos,
-            photo_urls=data.get("photo_urls", []),
-            sounds=data.get("sounds", []),
-            identifications=identifications,
-            identification_count=data.get("identifications_count", 0),
-            num_identification_agreements=data.get("num_identification_agreements", 0),
-            num_identification_disagreements=data.get("num_identification_disagreements", 0),
-            comments_count=data.get("comments_count", 0),
-            faves_count=data.get("faves_count", 0),
-            user_id=data.get("user_id"),
-            user_login=data.get("user_login"),
-            user=user,
-            project_ids=data.get("project_ids", []),
-            project_observations=data.get("project_observations", []),
-            identifications_most_agree=data.get("identifications_most_agree", False),
-            identifications_some_agree=data.get("identifications_some_agree", False),
-            identifications_most_disagree=data.get("identifications_most_disagree", False),
-            license_code=data.get("license_code"),
-            url=data.get("url"),
-            uri=data.get("uri"),
-            raw_data=data
-        )
+        安装 msgspec 时直接解码为 Struct 再转换，不构建中间字典；
+        整页响应使用 models.structs.decode_observation_page
+        """
+        from inaturalist_plugin.models.structs import decode_observation  # structs 依赖本模块，延迟导入
+        return decode_observation(raw)
     
     @property
     def display_name(self) -> str:
-        """获取显示名称"""
-        if self.species_guess:
-            return self.species_guess
-        elif self.taxon_name:
-            return self.taxon_name
-        return f"Observation #{self.id}"
+        """获取显示名称（首次访问时计算并缓存）"""
+        name = self._display_name
+        if name is None:
+            if self.species_guess:
+                name = self.species_guess
+            elif self.taxon_name:
+                name = self.taxon_name
+            else:
+                name = f"Observation #{self.id}"
+            self._display_name = name
+        return name
     
     @property
     def is_research_grade(self) -> bool:
         """检查是否为研究级观察"""
-        return self.quality_grade == QualityGrade.RESEARCH.value
+        return self.quality_grade == _RESEARCH_GRADE
     
     @property
     def has_photos(self) -> bool:
@@ -330,15 +423,35 @@ class Observation:
         Args:
             size: 尺寸 (square, thumb, small, medium, large)
         """
-        urls = []
-        for photo in self.photos:
-            url = getattr(photo, f"{size}_url", None) or photo.url
-            if url:
-                urls.append(url)
-        return urls
+        getter = _SIZE_GETTERS.get(size)
+        if getter is None:  # 未知尺寸使用原始 URL
+            return [photo.url for photo in self.photos if photo.url]
+        return [url for photo in self.photos if (url := getter(photo) or photo.url)]
+    
+    @property
+    def coords(self) -> Optional[Tuple[float, float]]:
+        """坐标 (latitude, longitude)，无坐标时为 None；只需经纬度时使用，不创建 Location 对象"""
+        if self.latitude is not None and self.longitude is not None:
+            return (self.latitude, self.longitude)
+        return None
+    
+    @property
+    def observed_on_ts(self) -> Optional[float]:
+        """
+        观察时间的 Unix 时间戳，优先使用 time_observed_at，其次 observed_on
+        
+        按时间排序/筛选时使用，比较浮点数比比较时间字符串快:
+            >>> observations.sort(key=lambda o: o.observed_on_ts or 0)
+        """
+        return _parse_ts(self.time_observed_at) or _parse_ts(self.observed_on)
+    
+    @property
+    def created_at_ts(self) -> Optional[float]:
+        """创建时间的 Unix 时间戳"""
+        return _parse_ts(self.created_at)
     
     def get_location(self) -> Optional[Location]:
-        """获取位置信息对象"""
+        """获取位置信息对象（包含精度和隐私设置；只需经纬度时使用 coords）"""
         if self.latitude is not None and self.longitude is not None:
             return Location(
                 latitude=self.latitude,
@@ -349,7 +462,83 @@ class Observation:
         return None
 
 
-@dataclass
+def _lazy_property(name: str) -> property:
+    """子对象属性: 读取时构建 Observation.defer 登记的数据，赋值时覆盖"""
+    storage = f"_{name}"
+    
+    def fget(self):
+        pending = self._pending
+        if pending and name in pending:
+            build, raw = pending.pop(name)
+            setattr(self, storage, build(raw))
+        return getattr(self, storage)
+    
+    def fset(self, value):
+        if self._pending:
+            self._pending.pop(name, None)
+        setattr(self, storage, value)
+    
+    return property(fget, fset)
+
+
+for _name in ("geojson", "photos", "identifications", "user"):
+    setattr(Observation, _name, _lazy_property(_name))
+del _name
+
+# 参与相等比较的属性（子对象通过属性读取，未构建的会先构建）
+_OBSERVATION_COMPARED = tuple(
+    f.name.lstrip("_") for f in fields(Observation) if f.compare
+)
+
+
+def _or_empty(value):
+    return value or ()
+
+
+def _tuple_or_empty(value):
+    return tuple(value) if value else ()
+
+
+def _observation_init_plan() -> Tuple[Tuple[Optional[str], Any, Optional[Callable[[Any], Any]]], ...]:
+    """
+    按 Observation.__init__ 的参数顺序生成 (API 字段名, 默认值, 转换函数)，供 from_api 按位置传参
+    
+    不直接来自 API 字段的参数（分类群、子对象、raw_data）传 None，由 from_api 在构建后赋值
+    """
+    plan = {attr: (key, default, None) for key, attr, default in _OBSERVATION_SCALAR_FIELDS}
+    for attr in _OBSERVATION_INTERNED_FIELDS:
+        key, default, _ = plan[attr]
+        plan[attr] = (key, default, intern_str)
+    for key in _OBSERVATION_LIST_FIELDS:
+        plan[key] = (key, (), _or_empty)
+    for key in _OBSERVATION_TUPLE_FIELDS:
+        plan[key] = (key, (), _tuple_or_empty)
+    params = list(inspect.signature(Observation.__init__).parameters)[1:]  # 去掉 self
+    return tuple(plan.get(name, (None, None, None)) for name in params)
+
+
+_OBSERVATION_INIT_PLAN = _observation_init_plan()
+
+
+def _photos_from_api(data: List[Dict[str, Any]]) -> List[ObservationPhoto]:
+    """与逐个调用 ObservationPhoto.from_api 相同，但在一个推导式中完成，每张照片少一次函数调用"""
+    make = ObservationPhoto
+    return [
+        make(
+            p.get("id", 0), photo.get("url", ""), p.get("observation_id", 0), p.get("photo_id", 0),
+            p.get("position"), photo.get("square_url"), photo.get("thumb_url"), photo.get("small_url"),
+            photo.get("medium_url"), photo.get("large_url"), photo.get("license_code"), photo.get("attribution")
+        )
+        for p in data
+        for photo in (p.get("photo", p),)
+    ]
+
+
+def _identifications_from_api(data: List[Dict[str, Any]]) -> List[Identification]:
+    return [Identification.from_api(i) for i in data]
+
+
+@dataclass(slots=True)
 class ObservationStats:
     """观察统计信息"""
     total_observations: int
@@ -0,0 +1,420 @@
+"""
+API 响应解码
+
+使用 msgspec.Struct 描述 /observations 和 /taxa 的响应结构，JSON bytes 直接解码为
+Struct（C 实现，不构建中间字典），再转换为 Observation / Taxon 对象。
+字段默认值与各模型的 from_api 一致。
+
+未安装 msgspec 或响应结构与声明不符时，退回 JSON 解析 + from_api。
+需要安装 msgspec: pip install msgspec
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from inaturalist_plugin.models._strings import intern_str
+from inaturalist_plugin.models.observation import (
+    Geojson, Identification, Observation, ObservationPhoto, QualityGrade, User
+)
+from inaturalist_plugin.models.taxon import (
+    ConservationStatusInfo, EstablishmentMeansInfo, Taxon, TaxonPhoto, _common_names
+)
+
+try:
+    import msgspec
+except ImportError:  # msgspec 为可选依赖，未安装时解析为字典后调用 from_api
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+
+def _loads(content: bytes) -> Dict[str, Any]:
+    if not content:
+        return {}
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+if msgspec is not None:
+
+    # ==================== 观察记录 ====================
+
+    class _PhotoStruct(msgspec.Struct):
+        url: Optional[str] = ""
+        square_url: Optional[str] = None
+        thumb_url: Optional[str] = None
+        small_url: Optional[str] = None
+        medium_url: Optional[str] = None
+        large_url: Optional[str] = None
+        license_code: Optional[str] = None
+        attribution: Optional[str] = None
+
+    class _ObservationPhotoStruct(_PhotoStruct):
+        # observation_photos 的元素把照片放在 photo 字段中，photos 的元素直接是照片
+        id: Optional[int] = 0
+        observation_id: Optional[int] = 0
+        photo_id: Optional[int] = 0
+        position: Optional[int] = None
+        photo: Optional[_PhotoStruct] = None
+
+    class _IdentificationStruct(msgspec.Struct):
+        id: Optional[int] = 0
+        observation_id: Optional[int] = 0
+        taxon_id: Optional[int] = 0
+        user_id: Optional[int] = 0
+        body: Optional[str] = None
+        current: Optional[bool] = True
+        category: Optional[str] = None
+        created_at: Optional[str] = None
+
+    class _UserStruct(msgspec.Struct):
+        id: Optional[int] = 0
+        login: Optional[str] = ""
+        name: Optional[str] = None
+        icon_url: Optional[str] = None
+
+    class _GeojsonStruct(msgspec.Struct):
+        type: Optional[str] = "Point"
+        coordinates: Optional[Tuple[Any, ...]] = ()
+
+    class _ObservationTaxonStruct(msgspec.Struct):
+        id: Optional[int] = None
+        name: Optional[str] = None
+        rank: Optional[str] = None
+
+    class _ObservationStruct(msgspec.Struct):
+        id: Optional[int] = 0
+        uuid: Optional[str] = ""
+        quality_grade: Optional[str] = QualityGrade.CASUAL.value
+        species_guess: Optional[str] = None
+        description: Optional[str] = None
+        taxon_id: Optional[int] = None
+        taxon: Optional[_ObservationTaxonStruct] = None
+        iconic_taxon_name: Optional[str] = None
+        observed_on: Optional[str] = None
+        observed_on_string: Optional[str] = None
+        time_observed_at: Optional[str] = None
+        created_at: Optional[str] = None
+        updated_at: Optional[str] = None
+        # 数值字段可能是整数或小数，保持 JSON 中的原始类型
+        latitude: Any = None
+        longitude: Any = None
+        positional_accuracy: Any = None
+        place_guess: Optional[str] = None
+        geoprivacy: Optional[str] = None
+        coordinates_obscured: Optional[bool] = False
+        geojson: Optional[_GeojsonStruct] = None
+        location: Optional[str] = None
+        photos: Optional[List[_ObservationPhotoStruct]] = None
+        observation_photos: Optional[List[_ObservationPhotoStruct]] = None
+        photo_urls: Optional[Tuple[str, ...]] = ()
+        sounds: Optional[List[Dict[str, Any]]] = None
+        identifications: Optional[List[_IdentificationStruct]] = None
+        identifications_count: Optional[int] = 0
+        num_identification_agreements: Optional[int] = 0
+        num_identification_disagreements: Optional[int] = 0
+        comments_count: Optional[int] = 0
+        faves_count: Optional[int] = 0
+        user_id: Optional[int] = None
+        user_login: Optional[str] = None
+        user: Optional[_UserStruct] = None
+        project_ids: Optional[Tuple[int, ...]] = ()
+        project_observations: Optional[List[Dict[str, Any]]] = None
+        identifications_most_agree: Optional[bool] = False
+        identifications_some_agree: Optional[bool] = False
+        identifications_most_disagree: Optional[bool] = False
+        license_code: Optional[str] = None
+        url: Optional[str] = None
+        uri: Optional[str] = None
+
+    class _ObservationPage(msgspec.Struct):
+        total_results: int = 0
+        page: Optional[int] = None
+        per_page: Optional[int] = None
+        results: List[_ObservationStruct] = []
+
+    # ==================== 分类群 ====================
+
+    class _TaxonPhotoStruct(msgspec.Struct):
+        id: Optional[int] = 0
+        url: Optional[str] = ""
+        attribution: Optional[str] = ""
+        license_code: Optional[str] = None
+        original_dimensions: Optional[Dict[str, Any]] = None
+        square_url: Optional[str] = None
+        thumb_url: Optional[str] = None
+        small_url: Optional[str] = None
+        medium_url: Optional[str] = None
+        large_url: Optional[str] = None
+
+    class _TaxonPhotoWrapperStruct(_TaxonPhotoStruct):
+        # taxon_photos 的元素通常把照片放在 photo 字段中
+        photo: Optional[_TaxonPhotoStruct] = None
+
+    class _TaxonNameStruct(msgspec.Struct):
+        name: Optional[str] = None
+        lexicon: Optional[str] = None
+
+    class _ConservationStatusStruct(msgspec.Struct):
+        status: Optional[str] = ""
+        authority: Optional[str] = None
+        place: Optional[Dict[str, Any]] = None
+        description: Optional[str] = None
+        url: Optional[str] = None
+        geoprivacy: Optional[str] = None
+
+    class _EstablishmentMeansStruct(msgspec.Struct):
+        establishment_means: Optional[str] = ""
+        place: Optional[Dict[str, Any]] = None
+
+    class _TaxonStruct(msgspec.Struct):
+        id: Optional[int] = 0
+        name: Optional[str] = ""
+        rank: Optional[str] = ""
+        rank_level: Any = 0  # 如 33.5 (epifamily)
+        iconic_taxon_id: Optional[int] = None
+        iconic_taxon_name: Optional[str] = None
+        preferred_common_name: Optional[str] = None
+        taxon_names: Optional[List[_TaxonNameStruct]] = None
+        parent_id: Optional[int] = None
+        ancestor_ids: Optional[Tuple[int, ...]] = ()
+        observations_count: Optional[int] = 0
+        default_photo: Optional[_TaxonPhotoStruct] = None
+        taxon_photos: Optional[List[_TaxonPhotoWrapperStruct]] = None
+        conservation_status: Optional[_ConservationStatusStruct] = None
+        conservation_status_name: Optional[str] = None
+        establishment_means: Optional[_EstablishmentMeansStruct] = None
+        wikipedia_summary: Optional[str] = None
+        wikipedia_url: Optional[str] = None
+
+    class _TaxonPage(msgspec.Struct):
+        total_results: int = 0
+        page: Optional[int] = None
+        per_page: Optional[int] = None
+        results: List[_TaxonStruct] = []
+
+    _OBSERVATION_PAGE_DECODER = msgspec.json.Decoder(_ObservationPage)
+    _TAXON_PAGE_DECODER = msgspec.json.Decoder(_TaxonPage)
+    _OBSERVATION_DECODER = msgspec.json.Decoder(_ObservationStruct)
+    _TAXON_DECODER = msgspec.json.Decoder(_TaxonStruct)
+
+
+def _observation_photo(s) -> ObservationPhoto:
+    p = s.photo or s
+    return ObservationPhoto(
+        id=s.id,
+        url=p.url,
+        observation_id=s.observation_id,
+        photo_id=s.photo_id,
+        position=s.position,
+        square_url=p.square_url,
+        thumb_url=p.thumb_url,
+        small_url=p.small_url,
+        medium_url=p.medium_url,
+        large_url=p.large_url,
+        license_code=p.license_code,
+        attribution=p.attribution
+    )
+
+
+def _observation_photos(structs) -> List[ObservationPhoto]:
+    return [_observation_photo(p) for p in structs]
+
+
+def _identifications(structs) -> List[Identification]:
+    return [
+        Identification(i.id, i.observation_id, i.taxon_id, i.user_id,
+                       i.body, i.current, i.category, i.created_at)
+        for i in structs
+    ]
+
+
+def _user(s) -> User:
+    return User(s.id, s.login, s.name, s.icon_url)
+
+
+def _geojson(s) -> Geojson:
+    return Geojson(s.type, s.coordinates or ())
+
+
+def _observation(s) -> Observation:
+    """_ObservationStruct -> Observation（与 Observation.from_api 结果一致）"""
+    taxon = s.taxon
+    observation = Observation(
+        id=s.id,
+        uuid=s.uuid,
+        quality_grade=intern_str(s.quality_grade),
+        species_guess=s.species_guess,
+        description=s.description,
+        taxon_id=s.taxon_id or (taxon.id if taxon else None),
+        taxon_name=taxon.name if taxon else None,
+        taxon_rank=intern_str(taxon.rank) if taxon else None,
+        iconic_taxon_name=intern_str(s.iconic_taxon_name),
+        observed_on=s.observed_on,
+        observed_on_string=s.observed_on_string,
+        time_observed_at=s.time_observed_at,
+        created_at=s.created_at,
+        updated_at=s.updated_at,
+        latitude=s.latitude,
+        longitude=s.longitude,
+        positional_accuracy=s.positional_accuracy,
+        place_guess=s.place_guess,
+        geoprivacy=intern_str(s.geoprivacy),
+        coordinates_obscured=s.coordinates_obscured,
+        location_string=s.location,
+        photo_urls=s.photo_urls or (),
+        sounds=s.sounds or (),
+        identification_count=s.identifications_count,
+        num_identification_agreements=s.num_identification_agreements,
+        num_identification_disagreements=s.num_identification_disagreements,
+        comments_count=s.comments_count,
+        faves_count=s.faves_count,
+        user_id=s.user_id,
+        user_login=s.user_login,
+        project_ids=s.project_ids or (),
+        project_observations=s.project_observations or (),
+        identifications_most_agree=s.identifications_most_agree,
+        identifications_some_agree=s.identifications_some_agree,
+        identifications_most_disagree=s.identifications_most_disagree,
+        license_code=intern_str(s.license_code),
+        url=s.url,
+        uri=s.uri
+    )
+
+    # 子对象同 from_api 一样在首次访问时构建
+    photos = s.photos or s.observation_photos
+    if photos:
+        observation.defer("photos", _observation_photos, photos)
+    if s.identifications:
+        observation.defer("identifications", _identifications, s.identifications)
+    if s.user:
+        observation.defer("user", _user, s.user)
+    if s.geojson:
+        observation.defer("geojson", _geojson, s.geojson)
+    return observation
+
+
+def _taxon_photo(s) -> TaxonPhoto:
+    return TaxonPhoto(
+        id=s.id,
+        url=s.url,
+        attribution=s.attribution,
+        license_code=s.license_code,
+        original_dimensions=s.original_dimensions,
+        square_url=s.square_url,
+        thumb_url=s.thumb_url,
+        small_url=s.small_url,
+        medium_url=s.medium_url,
+        large_url=s.large_url
+    )
+
+
+def _taxon(s) -> Taxon:
+    """_TaxonStruct -> Taxon（与 Taxon.from_api 结果一致）"""
+    chinese_name, english_name = _common_names(s.taxon_names, getattr)
+    status = s.conservation_status
+    means = s.establishment_means
+    return Taxon(
+        id=s.id,
+        name=s.name,
+        rank=intern_str(s.rank),
+        rank_level=s.rank_level,
+        iconic_taxon_id=s.iconic_taxon_id,
+        iconic_taxon_name=intern_str(s.iconic_taxon_name),
+        preferred_common_name=s.preferred_common_name,
+        english_common_name=english_name,
+        chinese_common_name=chinese_name,
+        parent_id=s.parent_id,
+        ancestor_ids=s.ancestor_ids or (),
+        observations_count=s.observations_count,
+        default_photo=_taxon_photo(s.default_photo) if s.default_photo else None,
+        taxon_photos=[_taxon_photo(tp.photo or tp) for tp in s.taxon_photos] if s.taxon_photos else [],
+        conservation_status=ConservationStatusInfo(
+            status.status, status.authority, status.place,
+            status.description, status.url, status.geoprivacy
+        ) if status else None,
+        conservation_status_name=intern_str(s.conservation_status_name),
+        establishment_means=EstablishmentMeansInfo(means.establishment_means, means.place) if means else None,
+        wikipedia_summary=s.wikipedia_summary,
+        wikipedia_url=s.wikipedia_url
+    )
+
+
+def decode_observation_page(content: bytes) -> Dict[str, Any]:
+    """
+    解码 /observations 响应
+
+    Returns:
+        与 API 响应结构相同的字典，但 results 为 Observation 对象列表
+
+    Example:
+        >>> client.get("/observations", params, decode=decode_observation_page)
+    """
+    if msgspec is not None and content:
+        try:
+            page = _OBSERVATION_PAGE_DECODER.decode(content)
+        except msgspec.ValidationError:
+            pass  # 字段类型与声明不符，按字典解析
+        else:
+            return {
+                "total_results": page.total_results,
+                "page": page.page,
+                "per_page": page.per_page,
+                "results": [_observation(s) for s in page.results]
+            }
+
+    data = _loads(content)
+    data["results"] = Observation.from_api_batch(data.get("results", []))
+    return data
+
+
+def decode_taxon_page(content: bytes) -> Dict[str, Any]:
+    """
+    解码 /taxa 响应
+
+    Returns:
+        与 API 响应结构相同的字典，但 results 为 Taxon 对象列表
+    """
+    if msgspec is not None and content:
+        try:
+            page = _TAXON_PAGE_DECODER.decode(content)
+        except msgspec.ValidationError:
+            pass  # 字段类型与声明不符，按字典解析
+        else:
+            return {
+                "total_results": page.total_results,
+                "page": page.page,
+                "per_page": page.per_page,
+                "results": [_taxon(s) for s in page.results]
+            }
+
+    data = _loads(content)
+    data["results"] = Taxon.from_api_batch(data.get("results", []))
+    return data
+
+
+def decode_observation(content: bytes) -> Observation:
+    """
+    解码单条观察记录的 JSON（即 /observations 响应 results 中的一个元素）
+
+    Example:
+        >>> decode_observation(b'{"id": 1, "quality_grade": "research"}')
+    """
+    if msgspec is not None:
+        try:
+            return _observation(_OBSERVATION_DECODER.decode(content))
+        except msgspec.ValidationError:
+            pass  # 字段类型与声明不符，按字典解析
+    return Observation.from_api(_loads(content))
+
+
+def decode_taxon(content: bytes) -> Taxon:
+    """解码单个分类群的 JSON（即 /taxa 响应 results 中的一个元素）"""
+    if msgspec is not None:
+        try:
+            return _taxon(_TAXON_DECODER.decode(content))
+        except msgspec.ValidationError:
+            pass  # 字段类型与声明不符，按字典解析
+    return Taxon.from_api(_loads(content))
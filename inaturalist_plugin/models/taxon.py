@@ -5,12 +5,18 @@
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from enum import Enum
+from typing import List, NamedTuple, Optional, Dict, Any, Tuple
+from enum import Enum, IntEnum
+from operator import attrgetter
 
+from inaturalist_plugin.models._strings import intern_str
 
-class RankLevel(Enum):
+
+# 照片尺寸 -> 对应 URL 属性的读取函数
+_SIZE_GETTERS = {size: attrgetter(f"{size}_url") for size in ("square", "thumb", "small", "medium", "large")}
+
+
+class RankLevel(IntEnum):
     """分类等级"""
     KINGDOM = 70
     PHYLUM = 60
@@ -39,7 +45,11 @@ class RankLevel(Enum):
     HYBRID = 5
 
 
-class ConservationStatus(Enum):
+# 热点属性直接与整数常量比较，避免每次经过 Enum 的 .value 描述符
+_SPECIES_RANK_LEVEL = RankLevel.SPECIES.value
+
+
+class ConservationStatus(str, Enum):
     """保护状态 (IUCN)"""
     EXTINCT = "EX"
     EXTINCT_IN_WILD = "EW"
@@ -53,7 +63,7 @@ class ConservationStatus(Enum):
     NOT_EVALUATED = "NE"
 
 
-class EstablishmentMeans(Enum):
+class EstablishmentMeans(str, Enum):
     """建立方式 (物种在特定区域的分布状态)"""
     NATIVE = "native"
     ENDEMIC = "endemic"
@@ -64,7 +74,7 @@ class EstablishmentMeans(Enum):
     UNCERTAIN = "uncertain"
 
 
-@dataclass
+@dataclass(slots=True)
 class TaxonPhoto:
     """物种照片"""
     id: int
@@ -97,9 +107,8 @@ class TaxonPhoto:
         )
 
 
-@dataclass
-class TaxonName:
-    """物种名称（不同语言）"""
+class TaxonName(NamedTuple):
+    """物种名称（不同语言，只读容器）"""
     name: str
     locale: str
     lexicon: str
@@ -108,14 +117,14 @@ class TaxonName:
     @classmethod
     def from_api(cls, data: Dict[str, Any]) -> "TaxonName":
         return cls(
-            name=data.get("name", ""),
-            locale=data.get("locale", ""),
-            lexicon=data.get("lexicon", ""),
-            is_valid=data.get("is_valid", True)
+            data.get("name", ""),
+            intern_str(data.get("locale", "")),
+            intern_str(data.get("lexicon", "")),
+            data.get("is_valid", True)
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ConservationStatusInfo:
     """保护状态详情"""
     status: str
@@ -137,21 +146,67 @@ class ConservationStatusInfo:
         )
 
 
-@dataclass
-class EstablishmentMeansInfo:
-    """建立方式详情（特定区域的分布状态）"""
+class EstablishmentMeansInfo(NamedTuple):
+    """建立方式详情（特定区域的分布状态，只读容器）"""
     establishment_means: str
     place: Optional[Dict[str, Any]] = None
     
     @classmethod
     def from_api(cls, data: Dict[str, Any]) -> "EstablishmentMeansInfo":
-        return cls(
-            establishment_means=data.get("establishment_means", ""),
-            place=data.get("place")
-        )
+        return cls(data.get("establishment_means", ""), data.get("place"))
+
+
+# Taxon.from_api 直接复制的字段（API 字段名与属性名相同）: (属性名, 默认值)
+_TAXON_SCALAR_FIELDS = (
+    ("id", 0),
+    ("name", ""),
+    ("rank", ""),
+    ("rank_level", 0),
+    ("iconic_taxon_id", None),
+    ("iconic_taxon_name", None),
+    ("preferred_common_name", None),
+    ("parent_id", None),
+    ("observations_count", 0),
+    ("conservation_status_name", None),
+    ("wikipedia_summary", None),
+    ("wikipedia_url", None),
+)
+
+
+def _common_names(taxon_names, get) -> tuple:
+    """
+    从 taxon_names 中取出简体中文和英文俗名，两者都找到后立即结束
+    
+    iNaturalist 按优先顺序返回名称，同一语言有多个名称时取第一个
+    
+    Args:
+        taxon_names: 名称列表（字典或 Struct），可为 None
+        get: 读取字段的函数，如 dict.get 或 getattr
+        
+    Returns:
+        (中文名, 英文名)
+    """
+    chinese_name = english_name = None
+    for tn in taxon_names or ():
+        lexicon = get(tn, "lexicon")
+        if lexicon == "English":
+            if english_name is None:
+                english_name = get(tn, "name")
+                if chinese_name is not None:
+                    break
+        elif lexicon == "Chinese (Simplified)":
+            if chinese_name is None:
+                chinese_name = get(tn, "name")
+                if english_name is not None:
+                    break
+    return chinese_name, english_name
+
+
+# 取值有限、需要驻留的字符串字段
+_TAXON_INTERNED_FIELDS = ("rank", "iconic_taxon_name", "conservation_status_name")
 
 
-@dataclass
+@dataclass(slots=True)
 class Taxon:
     """
     物种/分类群完整信息
@@ -175,7 +230,7 @@ class Taxon:
     
     # 分类学信息
     parent_id: Optional[int] = None
-    ancestor_ids: List[int] = field(default_factory=list)
+    ancestor_ids: Tuple[int, ...] = ()
     
     # 统计数据
     observations_count: int = 0
@@ -195,80 +250,101 @@ class Taxon:
     wikipedia_summary: Optional[str] = None
     wikipedia_url: Optional[str] = None
     
-    # 原始数据
-    raw_data: Dict[str, Any] = field(default_factory=dict, repr=False)
+    # 原始数据（仅在 from_api(keep_raw=True) 时保留）
+    raw_data: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    
+    # display_name 的缓存（名称字段在创建后视为不变）
+    _display_name: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     @classmethod
-    def from_api(cls, data: Dict[str, Any]) -> "Taxon":
-        """从 API 响应创建 Taxon 对象"""
+    def from_api(cls, data: Dict[str, Any], keep_raw: bool = False) -> "Taxon":
+        """
+        从 API 响应创建 Taxon 对象
+        
+        Args:
+            data: API 返回的单条记录
+            keep_raw: 是否在 raw_data 中保留原始字典（默认不保留，避免整棵 JSON 树常驻内存）
+        """
         
         # 处理照片
         default_photo = None
-        if data.get("default_photo"):
-            default_photo = TaxonPhoto.from_api(data["default_photo"])
+        if raw_default_photo := data.get("default_photo"):
+            default_photo = TaxonPhoto.from_api(raw_default_photo)
         
         taxon_photos = []
-        if data.get("taxon_photos"):
-            taxon_photos = [TaxonPhoto.from_api(tp.get("photo", tp)) for tp in data["taxon_photos"]]
+        if raw_taxon_photos := data.get("taxon_photos"):
+            taxon_photos = [TaxonPhoto.from_api(tp.get("photo", tp)) for tp in raw_taxon_photos]
         
         # 处理保护状态
         conservation_status = None
-        if data.get("conservation_status"):
-            conservation_status = ConservationStatusInfo.from_api(data["conservation_status"])
+        if raw_status := data.get("conservation_status"):
+            conservation_status = ConservationStatusInfo.from_api(raw_status)
         
         # 处理建立方式
         establishment_means = None
-        if data.get("establishment_means"):
-            establishment_means = EstablishmentMeansInfo.from_api(data["establishment_means"])
+        if raw_means := data.get("establishment_means"):
+            establishment_means = EstablishmentMeansInfo.from_api(raw_means)
         
         # 提取不同语言的俗名
-        chinese_name = None
-        english_name = None
-        if data.get("taxon_names"):
-            for tn in data["taxon_names"]:
-                if tn.get("lexicon") == "Chinese (Simplified)":
-                    chinese_name = tn.get("name")
-                elif tn.get("lexicon") == "English":
-                    english_name = tn.get("name")
+        chinese_name, english_name = _common_names(data.get("taxon_names"), dict.get)
+        
+        kwargs = {attr: data.get(attr, default) for attr, default in _TAXON_SCALAR_FIELDS}
+        for attr in _TAXON_INTERNED_FIELDS:
+            kwargs[attr] = intern_str(kwargs[attr])
         
         return cls(
-            id=data.get("id", 0),
-            name=data.get("name", ""),
-            rank=data.get("rank", ""),
-            rank_level=data.get("rank_level", 0),
-            iconic_taxon_id=data.get("iconic_taxon_id"),
-            iconic_taxon_name=data.get("iconic_taxon_name"),
-            preferred_common_name=data.get("preferred_common_name"),
+            **kwargs,
             english_common_name=english_name,
             chinese_common_name=chinese_name,
-            parent_id=data.get("parent_id"),
-            ancestor_ids=data.get("ancestor_ids", []),
-            observations_count=data.get("observations_count", 0),
+            ancestor_ids=tuple(data.get("ancestor_ids") or ()),
             default_photo=default_photo,
             taxon_photos=taxon_photos,
             conservation_status=conservation_status,
-            conservation_status_name=data.get("conservation_status_name"),
             establishment_means=establishment_means,
-            wikipedia_summary=data.get("wikipedia_summary"),
-            wikipedia_url=data.get("wikipedia_url"),
-            raw_data=data
+            raw_data=data if keep_raw else None
         )
     
+    @classmethod
+    def from_api_batch(cls, items: List[Dict[str, Any]]) -> List["Taxon"]:
+        """
+        批量创建 Taxon 对象（如 API 响应的 results），结果顺序与 items 一致
+        
+        Example:
+            >>> Taxon.from_api_batch(response.get("results", []))
+        """
+        return list(map(cls.from_api, items))
+    
+    @classmethod
+    def from_json_bytes(cls, raw: bytes) -> "Taxon":
+        """
+        从单条记录的 JSON bytes 创建 Taxon 对象
+        
+        安装 msgspec 时直接解码为 Struct 再转换，不构建中间字典；
+        整页响应使用 models.structs.decode_taxon_page
+        """
+        from inaturalist_plugin.models.structs import decode_taxon  # structs 依赖本模块，延迟导入
+        return decode_taxon(raw)
+    
     @property
     def display_name(self) -> str:
-        """获取显示名称（优先使用中文名，其次是英文名，最后是学名）"""
-        if self.chinese_common_name:
-            return f"{self.chinese_common_name} ({self.name})"
-        elif self.english_common_name:
-            return f"{self.english_common_name} ({self.name})"
-        elif self.preferred_common_name:
-            return f"{self.preferred_common_name} ({self.name})"
-        return self.name
+        """获取显示名称（优先使用中文名，其次是英文名，最后是学名；首次访问时计算并缓存）"""
+        name = self._display_name
+        if name is None:
+            if self.chinese_common_name:
+                name = f"{self.chinese_common_name} ({self.name})"
+            elif self.english_common_name:
+                name = f"{self.english_common_name} ({self.name})"
+            elif self.preferred_common_name:
+                name = f"{self.preferred_common_name} ({self.name})"
+            else:
+                name = self.name
+            self._display_name = name
+        return name
     
     @property
     def is_species_or_lower(self) -> bool:
         """检查是否为物种级别或更低（亚种等）"""
-        return self.rank_level <= RankLevel.SPECIES.value
+        return self.rank_level <= _SPECIES_RANK_LEVEL
     
     @property
     def best_photo_url(self) -> Optional[str]:
@@ -284,15 +360,13 @@ class Taxon:
         Args:
             size: 尺寸 (square, thumb, small, medium, large)
         """
-        urls = []
-        for photo in self.taxon_photos:
-            url = getattr(photo, f"{size}_url", None) or photo.url
-            if url:
-                urls.append(url)
-        return urls
+        getter = _SIZE_GETTERS.get(size)
+        if getter is None:  # 未知尺寸使用原始 URL
+            return [photo.url for photo in self.taxon_photos if photo.url]
+        return [url for photo in self.taxon_photos if (url := getter(photo) or photo.url)]
 
 
-@dataclass
+@dataclass(slots=True)
 class TaxonSummary:
     """物种统计摘要"""
     taxon: Taxon
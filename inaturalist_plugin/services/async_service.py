@@ -0,0 +1,336 @@
+"""
+异步服务模块
+
+基于 AsyncINaturalistClient 的物种和观察记录服务，方法均为协程，
+用于需要同时请求多个端点的场景（如物种详情页）
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from inaturalist_plugin.core.client import AsyncINaturalistClient, INaturalistAPIError
+from inaturalist_plugin.models.taxon import Taxon
+from inaturalist_plugin.models.observation import Observation
+from inaturalist_plugin.services.observation_service import MAX_RESULT_WINDOW, _build_search_params
+from inaturalist_plugin.services.taxon_service import MAX_IDS_PER_REQUEST
+from inaturalist_plugin.utils.geo import bbox_from_radius
+
+
+def _circle_params(lat: Optional[float], lng: Optional[float], radius: Optional[float]) -> Dict[str, Any]:
+    """圆形搜索参数，同时附带外接边界框（跨越 ±180 经线或极点时不附带）"""
+    if lat is None or lng is None:
+        return {}
+    params = {"lat": lat, "lng": lng}
+    if radius:
+        params["radius"] = radius
+        bbox = bbox_from_radius(lat, lng, radius)
+        if bbox:
+            params["nelat"], params["nelng"], params["swlat"], params["swlng"] = bbox
+    return params
+
+
+class AsyncObservationService:
+    """
+    观察记录服务（异步版本）
+
+    Example:
+        >>> async with AsyncINaturalistClient() as client:
+        ...     service = AsyncObservationService(client)
+        ...     observations = await service.search(taxon_id=9083)
+    """
+
+    def __init__(self, client: AsyncINaturalistClient):
+        self.client = client
+
+    async def search(self, taxon_id: Optional[int] = None, **kwargs) -> List[Observation]:
+        """
+        搜索观察记录
+
+        参数同 ObservationService.search，其他参数按 API 参数名直接传入
+        """
+        return (await self.search_page(taxon_id=taxon_id, **kwargs))["results"]
+
+    async def search_page(self, **filters) -> Dict[str, Any]:
+        """
+        获取一页观察记录（参数同 ObservationService.search，参数转换与同步版本共用）
+
+        Returns:
+            {"total_results": 总数, "page": 页码, "per_page": 每页数量, "results": [Observation, ...]}
+        """
+        params = _build_search_params(filters)
+        response = await self.client.get("/observations", params)
+        response["results"] = Observation.from_api_batch(response.get("results", []))
+        return response
+
+    async def search_all(self, max_results: int = 1000, **kwargs) -> List[Observation]:
+        """
+        搜索所有符合条件的观察记录（自动分页）
+
+        先请求第一页得到总数，其余页面用 asyncio.gather 并发请求，结果按页码顺序合并。
+        最多获取 API 允许的前 10000 条；参数同 search
+        """
+        per_page = min(kwargs.pop("per_page", 200), 200)
+        kwargs.pop("page", None)
+
+        first = await self.search_page(page=1, per_page=per_page, **kwargs)
+        observations = first["results"]
+
+        total = min(max_results, first.get("total_results", 0), MAX_RESULT_WINDOW)
+        num_pages = min(-(-total // per_page), MAX_RESULT_WINDOW // per_page)
+        if num_pages > 1 and len(observations) == per_page:
+            pages = await asyncio.gather(*(
+                self.search(page=page, per_page=per_page, **kwargs)
+                for page in range(2, num_pages + 1)
+            ))
+            for page_observations in pages:
+                observations.extend(page_observations)
+
+        return observations[:max_results]
+
+    async def get_by_id(self, observation_id: int) -> Optional[Observation]:
+        """获取单个观察记录，不存在时返回 None；请求失败时抛出 INaturalistAPIError"""
+        try:
+            response = await self.client.get(f"/observations/{observation_id}")
+        except INaturalistAPIError as e:
+            if e.status_code == 404:
+                return None
+            raise
+        results = response.get("results", [])
+        return Observation.from_api(results[0]) if results else None
+
+    async def count(
+        self,
+        taxon_id: Optional[int] = None,
+        place_id: Optional[int] = None,
+        quality_grade: Optional[str] = None,
+        **kwargs
+    ) -> int:
+        """获取符合条件的观察记录数量（相同查询的结果在进程内缓存 RESPONSE_CACHE_TTL 秒）"""
+        params = {
+            "per_page": 0,
+            "taxon_id": taxon_id,
+            "place_id": place_id,
+            "quality_grade": quality_grade
+        }
+        params.update(kwargs)
+
+        response = await self.client.get_cached("/observations", params)
+        return response.get("total_results", 0)
+
+    async def get_species_counts(
+        self,
+        place_id: Optional[int] = None,
+        taxon_id: Optional[int] = None,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius: Optional[float] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        获取物种统计
+
+        返回格式同 ObservationService.get_species_counts:
+        [{"count": 10, "taxon": {...}}, ...]
+        """
+        params = {"place_id": place_id, "taxon_id": taxon_id}
+        params.update(_circle_params(lat, lng, radius))
+        params.update(kwargs)
+
+        response = await self.client.get("/observations/species_counts", params)
+        return response.get("results", [])
+
+    async def get_identifiers(
+        self,
+        place_id: Optional[int] = None,
+        taxon_id: Optional[int] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """获取鉴定者统计（返回格式同 ObservationService.get_identifiers）"""
+        params = {"place_id": place_id, "taxon_id": taxon_id}
+        params.update(kwargs)
+        response = await self.client.get("/observations/identifiers", params)
+        return response.get("results", [])
+
+    async def get_observers(
+        self,
+        place_id: Optional[int] = None,
+        taxon_id: Optional[int] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """获取观察者统计（返回格式同 ObservationService.get_observers）"""
+        params = {"place_id": place_id, "taxon_id": taxon_id}
+        params.update(kwargs)
+        response = await self.client.get("/observations/observers", params)
+        return response.get("results", [])
+
+    async def get_histogram(
+        self,
+        interval: str = "month",
+        taxon_id: Optional[int] = None,
+        place_id: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """获取观察记录的时间分布直方图（返回格式同 ObservationService.get_histogram）"""
+        params = {"interval": interval, "taxon_id": taxon_id, "place_id": place_id}
+        params.update(kwargs)
+        return await self.client.get("/observations/histogram", params)
+
+
+class TaxonLoader:
+    """
+    合并并发的物种查询请求 (DataLoader)
+
+    同一事件循环迭代中（max_delay 秒内）发起的 load 调用会被合并为一次
+    /taxa/{id1,id2,...} 请求，每批最多 max_batch_size 个 ID；
+    同一个 ID 的并发查询共享一次请求。只合并进行中的请求，不缓存结果
+
+    Example:
+        >>> loader = TaxonLoader(client)
+        >>> a, b = await asyncio.gather(loader.load(3), loader.load(7251))  # 一次请求
+    """
+
+    def __init__(
+        self,
+        client: AsyncINaturalistClient,
+        max_batch_size: int = MAX_IDS_PER_REQUEST,
+        max_delay: float = 0.005
+    ):
+        """
+        Args:
+            client: 异步 API 客户端
+            max_batch_size: 每次请求的最大 ID 数
+            max_delay: 等待更多请求合并的最长时间（秒）
+        """
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    async def load(self, taxon_id: int) -> Optional[Taxon]:
+        """获取物种，不存在时返回 None；请求失败时抛出 INaturalistAPIError"""
+        future = self._pending.get(taxon_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[taxon_id] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.max_delay, self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        """发出当前批次的请求"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._fetch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch: Dict[int, asyncio.Future]):
+        """请求一个批次并把结果分发给各个等待者"""
+        try:
+            response = await self.client.get(
+                "/taxa/" + ",".join(str(i) for i in batch),
+                {"per_page": len(batch)}
+            )
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        found = {data["id"]: data for data in response.get("results", [])}
+        for taxon_id, future in batch.items():
+            if not future.done():
+                data = found.get(taxon_id)
+                future.set_result(Taxon.from_api(data) if data else None)
+
+
+class AsyncTaxonService:
+    """
+    物种/分类群服务（异步版本）
+
+    Example:
+        >>> async with AsyncINaturalistClient() as client:
+        ...     service = AsyncTaxonService(client)
+        ...     taxon = await service.get_by_id(9083)
+    """
+
+    def __init__(self, client: AsyncINaturalistClient):
+        self.client = client
+        self.loader = TaxonLoader(client)
+
+    async def search(
+        self,
+        q: Optional[str] = None,
+        rank: Optional[str] = None,
+        iconic_taxa: Optional[List[str]] = None,
+        per_page: int = 30,
+        page: int = 1,
+        **kwargs
+    ) -> List[Taxon]:
+        """
+        搜索物种/分类群
+
+        常用参数同 TaxonService.search，其他参数按 API 参数名直接传入
+        """
+        params = {
+            "per_page": min(per_page, 200),
+            "page": page,
+            "q": q or None,
+            "rank": rank,
+            "iconic_taxa": ",".join(iconic_taxa) if iconic_taxa else None
+        }
+        params.update(kwargs)
+
+        response = await self.client.get("/taxa", params)
+        return Taxon.from_api_batch(response.get("results", []))
+
+    async def autocomplete(self, q: str, per_page: int = 10, rank: Optional[str] = None) -> List[Taxon]:
+        """自动补全搜索"""
+        params = {"q": q, "per_page": min(per_page, 200), "rank": rank}
+        response = await self.client.get("/taxa/autocomplete", params)
+        return Taxon.from_api_batch(response.get("results", []))
+
+    async def get_by_id(self, taxon_id: int) -> Optional[Taxon]:
+        """
+        获取特定物种的详细信息，不存在时返回 None；请求失败时抛出 INaturalistAPIError
+
+        并发调用会通过 TaxonLoader 合并为批量请求
+        """
+        return await self.loader.load(taxon_id)
+
+    async def get_bulk(self, taxon_ids: List[int]) -> List[Taxon]:
+        """
+        批量获取物种详细信息
+
+        由 TaxonLoader 按每批最多 30 个 ID 合并请求；
+        结果顺序与 taxon_ids 一致（不存在的 ID 会被跳过）
+        """
+        taxa = await asyncio.gather(*(self.loader.load(i) for i in dict.fromkeys(taxon_ids)))
+        found = {taxon.id: taxon for taxon in taxa if taxon}
+        return [found[i] for i in taxon_ids if i in found]
+
+    async def get_children(self, parent_id: int, rank: Optional[str] = None) -> List[Taxon]:
+        """获取子分类群"""
+        response = await self.client.get("/taxa", {"parent_id": parent_id, "rank": rank, "per_page": 200})
+        return Taxon.from_api_batch(response.get("results", []))
+
+    async def get_ancestors(self, taxon_id: int, taxon: Optional[Taxon] = None) -> List[Taxon]:
+        """
+        获取物种的祖先分类群
+
+        Args:
+            taxon_id: 物种 ID
+            taxon: 可选，已获取的 Taxon 对象，传入时不再重复请求
+        """
+        taxon = taxon or await self.get_by_id(taxon_id)
+        if not taxon or not taxon.ancestor_ids:
+            return []
+        return await self.get_bulk(taxon.ancestor_ids)
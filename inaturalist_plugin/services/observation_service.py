@@ -4,10 +4,192 @@
 提供观察记录搜索、详情获取等功能的封装
 """
 
-from typing import List, Optional, Dict, Any
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from datetime import datetime
-from inaturalist_plugin.core.client import INaturalistClient
+from inaturalist_plugin.core.client import INaturalistAPIError, INaturalistClient, PaginationLimitError
 from inaturalist_plugin.models.observation import Observation, ObservationStats
+from inaturalist_plugin.models.structs import decode_observation_page
+from inaturalist_plugin.utils.geo import bbox_from_radius
+
+
+# API 只允许访问前 10000 条结果（page * per_page <= 10000）
+MAX_RESULT_WINDOW = 10000
+
+# 每个服务实例缓存的观察记录数量上限和缓存时间（秒）；观察记录会被鉴定更新，不长期缓存
+OBSERVATION_CACHE_SIZE = 1024
+OBSERVATION_CACHE_TTL = 300
+
+
+def _true(_value) -> str:
+    return "true"
+
+
+# search 的简单筛选参数: (参数名, API 参数名, 转换函数)，值为假时不发送
+_SEARCH_PARAM_MAP = (
+    ("taxon_id", "taxon_id", None),
+    ("taxon_name", "taxon_name", None),
+    ("iconic_taxa", "iconic_taxa", ",".join),
+    ("place_id", "place_id", None),
+    ("observed_on", "observed_on", None),
+    ("observed_d1", "d1", None),
+    ("observed_d2", "d2", None),
+    ("year", "year", None),
+    ("month", "month", None),
+    ("day", "day", None),
+    ("quality_grade", "quality_grade", None),
+    ("geoprivacy", "geoprivacy", None),
+    ("has_photos", "photos", _true),
+    ("has_sounds", "sounds", _true),
+    ("has_geo", "geo", _true),
+    ("user_id", "user_id", None),
+    ("user_login", "user_login", None),
+    ("project_id", "project_id", None),
+    ("include_new_projects", "include_new_projects", _true),
+    ("order_by", "order_by", None),
+)
+
+
+def _check_page_window(params: Dict[str, Any]):
+    """
+    把 per_page 限制为 200，并检查页码是否在 API 允许访问的前 10000 条结果内
+    
+    Raises:
+        PaginationLimitError: page * per_page 超过 10000
+    """
+    params["per_page"] = min(params["per_page"], 200)
+    if params["page"] * params["per_page"] > MAX_RESULT_WINDOW:
+        raise PaginationLimitError(
+            f"page * per_page 超过 {MAX_RESULT_WINDOW}，API 不返回这部分结果；"
+            "请缩小筛选范围，或使用 id_above 按 ID 翻页"
+        )
+
+
+def _build_search_params(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    把 search 的参数转换为 /observations 的查询参数
+    
+    Args:
+        filters: search 的参数（不含 raw）；不认识的参数按 API 参数名直接传入
+    
+    Raises:
+        PaginationLimitError: 页码超出 API 允许访问的前 10000 条结果，请求注定失败
+    """
+    filters = dict(filters)
+    params = {
+        "per_page": filters.pop("per_page", 30),
+        "page": filters.pop("page", 1),
+        "order": filters.pop("order", "desc")
+    }
+    _check_page_window(params)
+    
+    for name, api_name, convert in _SEARCH_PARAM_MAP:
+        value = filters.pop(name, None)
+        if value:
+            params[api_name] = convert(value) if convert else value
+    
+    # 地点：边界框与圆形搜索
+    swlat, swlng, nelat, nelng = (filters.pop(k, None) for k in ("swlat", "swlng", "nelat", "nelng"))
+    lat, lng, radius = (filters.pop(k, None) for k in ("lat", "lng", "radius"))
+    if swlat is not None:
+        params.update(swlat=swlat, swlng=swlng, nelat=nelat, nelng=nelng)
+    if lat is not None and lng is not None:
+        params["lat"] = lat
+        params["lng"] = lng
+    if radius:
+        params["radius"] = radius
+    if lat is not None and lng is not None and radius and swlat is None:
+        # 同时提供外接边界框，服务端可先按边界框裁剪再做圆形筛选（跨越 ±180 经线或极点时不提供）
+        bbox = bbox_from_radius(lat, lng, radius)
+        if bbox:
+            params["nelat"], params["nelng"], params["swlat"], params["swlng"] = bbox
+    
+    # 标识状态
+    identified = filters.pop("identified", None)
+    if identified is not None:
+        params["identified"] = "true" if identified else "false"
+    
+    # 额外参数
+    params.update(filters)
+    return params
+
+
+@dataclass(frozen=True, slots=True)
+class SearchFilters:
+    """
+    观察记录搜索条件（字段同 ObservationService.search 的参数）
+    
+    不可变、可哈希：同一组条件的 API 参数只构建一次，跨页、跨调用复用，
+    也可以作为缓存键。iconic_taxa 列表会转换为元组
+    
+    Example:
+        >>> filters = SearchFilters(taxon_id=9083, quality_grade="research")
+        >>> service.search(filters=filters)
+        >>> service.search_all(filters=filters, max_results=2000)
+    """
+    taxon_id: Optional[int] = None
+    taxon_name: Optional[str] = None
+    iconic_taxa: Optional[Tuple[str, ...]] = None
+    place_id: Optional[int] = None
+    swlat: Optional[float] = None
+    swlng: Optional[float] = None
+    nelat: Optional[float] = None
+    nelng: Optional[float] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    radius: Optional[float] = None
+    observed_on: Optional[str] = None
+    observed_d1: Optional[str] = None
+    observed_d2: Optional[str] = None
+    year: Optional[int] = None
+    month: Optional[int] = None
+    day: Optional[int] = None
+    quality_grade: Optional[str] = None
+    geoprivacy: Optional[str] = None
+    has_photos: bool = False
+    has_sounds: bool = False
+    has_geo: bool = False
+    user_id: Optional[int] = None
+    user_login: Optional[str] = None
+    project_id: Optional[int] = None
+    identified: Optional[bool] = None
+    order_by: Optional[str] = None
+    order: str = "desc"
+    per_page: int = 30
+    page: int = 1
+    include_new_projects: bool = False
+    extra: Tuple[Tuple[str, Any], ...] = ()  # 其他 API 参数 ((参数名, 值), ...)
+    
+    def __post_init__(self):
+        if isinstance(self.iconic_taxa, list):
+            object.__setattr__(self, "iconic_taxa", tuple(self.iconic_taxa))
+        if isinstance(self.extra, dict):
+            object.__setattr__(self, "extra", tuple(self.extra.items()))
+    
+    @classmethod
+    def from_kwargs(cls, **kwargs) -> "SearchFilters":
+        """从 search 风格的关键字参数创建，不认识的参数放入 extra"""
+        extra = {k: kwargs.pop(k) for k in list(kwargs) if k not in _SEARCH_FILTER_FIELDS}
+        return cls(**kwargs, extra=tuple(extra.items()))
+    
+    def api_params(self) -> Dict[str, Any]:
+        """/observations 的查询参数（返回副本，可以修改）"""
+        return dict(_filters_api_params(self))
+
+
+_SEARCH_FILTER_FIELDS = frozenset(f.name for f in fields(SearchFilters)) - {"extra"}
+
+
+@lru_cache(maxsize=256)
+def _filters_api_params(filters: SearchFilters) -> Dict[str, Any]:
+    """构建并缓存 SearchFilters 对应的查询参数"""
+    values = {name: getattr(filters, name) for name in _SEARCH_FILTER_FIELDS}
+    values.update(filters.extra)
+    return _build_search_params(values)
 
 
 class ObservationService:
@@ -19,6 +201,11 @@ class ObservationService:
     
     def __init__(self, client: INaturalistClient):
         self.client = client
+        self._observation_cache: Dict[tuple, Tuple[float, Observation]] = {}
+    
+    def clear_cache(self):
+        """清空观察记录缓存"""
+        self._observation_cache.clear()
     
     def search(
         self,
@@ -73,6 +260,12 @@ class ObservationService:
         # 额外数据
         include_new_projects: bool = False,
         
+        # 返回原始字典，不构建 Observation 对象
+        raw: bool = False,
+        
+        # 预先构建的搜索条件，传入时忽略上面的筛选和分页参数
+        filters: Optional[SearchFilters] = None,
+        
         # 其他
         **kwargs
     ) -> List[Observation]:
@@ -103,96 +296,102 @@ class ObservationService:
             order: 排序方向 (asc/desc)
             per_page: 每页数量 (1-200)
             page: 页码
+            raw: 为 True 时返回 API 的原始字典列表，跳过模型构建（只需要转发或取个别字段时使用）
+            filters: 可选，SearchFilters 搜索条件；**kwargs 仍按 API 参数名附加
             
         Returns:
-            Observation 对象列表
+            Observation 对象列表（raw=True 时为字典列表）
             
         Example:
             >>> service.search(taxon_id=9083, quality_grade="research")
             >>> service.search(lat=39.9, lng=116.4, radius=10, has_photos=True)
             >>> service.search(iconic_taxa=["Aves"], quality_grade="research")
         """
-        params = {
-            "per_page": min(per_page, 200),
-            "page": page,
-            "order": order
-        }
-        
-        # 分类群
-        if taxon_id:
-            params["taxon_id"] = taxon_id
-        if taxon_name:
-            params["taxon_name"] = taxon_name
-        if iconic_taxa:
-            params["iconic_taxa"] = ",".join(iconic_taxa)
-        
-        # 地点
-        if place_id:
-            params["place_id"] = place_id
-        if swlat is not None:
-            params["swlat"] = swlat
-            params["swlng"] = swlng
-            params["nelat"] = nelat
-            params["nelng"] = nelng
-        if lat is not None and lng is not None:
-            params["lat"] = lat
-            params["lng"] = lng
-        if radius:
-            params["radius"] = radius
-        
-        # 时间
-        if observed_on:
-            params["observed_on"] = observed_on
-        if observed_d1:
-            params["d1"] = observed_d1
-        if observed_d2:
-            params["d2"] = observed_d2
-        if year:
-            params["year"] = year
-        if month:
-            params["month"] = month
-        if day:
-            params["day"] = day
-        
-        # 质量与状态
-        if quality_grade:
-            params["quality_grade"] = quality_grade
-        if geoprivacy:
-            params["geoprivacy"] = geoprivacy
-        
-        # 特征
-        if has_photos:
-            params["photos"] = "true"
-        if has_sounds:
-            params["sounds"] = "true"
-        if has_geo:
-            params["geo"] = "true"
-        
-        # 用户
-        if user_id:
-            params["user_id"] = user_id
-        if user_login:
-            params["user_login"] = user_login
+        if filters is not None:
+            return list(self.search_iter(filters=filters, raw=raw, **kwargs))
+        return list(self.search_iter(
+            taxon_id=taxon_id,
+            taxon_name=taxon_name,
+            iconic_taxa=iconic_taxa,
+            place_id=place_id,
+            swlat=swlat,
+            swlng=swlng,
+            nelat=nelat,
+            nelng=nelng,
+            lat=lat,
+            lng=lng,
+            radius=radius,
+            observed_on=observed_on,
+            observed_d1=observed_d1,
+            observed_d2=observed_d2,
+            year=year,
+            month=month,
+            day=day,
+            quality_grade=quality_grade,
+            geoprivacy=geoprivacy,
+            has_photos=has_photos,
+            has_sounds=has_sounds,
+            has_geo=has_geo,
+            user_id=user_id,
+            user_login=user_login,
+            project_id=project_id,
+            identified=identified,
+            order_by=order_by,
+            order=order,
+            per_page=per_page,
+            page=page,
+            include_new_projects=include_new_projects,
+            raw=raw,
+            **kwargs
+        ))
+    
+    def search_iter(self, **kwargs) -> Iterator[Observation]:
+        """
+        逐条返回观察记录（参数同 search）
         
-        # 项目
-        if project_id:
-            params["project_id"] = project_id
+        每页响应直接解码为 Observation 对象后逐条返回，适合流式输出大页结果
         
-        # 标识状态
-        if identified is not None:
-            params["identified"] = "true" if identified else "false"
+        Example:
+            >>> for obs in service.search_iter(taxon_id=9083, per_page=200):
+            ...     print(obs.id)
+        """
+        results = self.search_page(**kwargs)["results"]
+        # 只请求一页；逐条弹出，调用方处理完的记录（及其照片、鉴定）立即释放，
+        # 不必等整页遍历结束，峰值内存随遍历进度下降
+        results.reverse()
+        while results:
+            yield results.pop()
+    
+    def search_page(
+        self,
+        filters: Optional[SearchFilters] = None,
+        raw: bool = False,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        获取一页观察记录（参数同 search）
         
-        # 排序
-        if order_by:
-            params["order_by"] = order_by
+        传入 filters 时使用其缓存的查询参数，kwargs 按 API 参数名覆盖（如 page=2）
         
-        # 额外参数
-        params.update(kwargs)
+        Returns:
+            {"total_results": 总数, "page": 页码, "per_page": 每页数量, "results": [Observation, ...]}，
+            raw=True 时 results 为 API 原始字典
         
-        response = self.client.get("/observations", params)
-        results = response.get("results", [])
+        Raises:
+            PaginationLimitError: page * per_page 超过 10000（包括 kwargs 覆盖的页码）
         
-        return [Observation.from_api(data) for data in results]
+        Example:
+            >>> service.search_page(taxon_id=9083)["total_results"]
+        """
+        if filters is not None:
+            params = filters.api_params()
+            params.update(kwargs)
+            _check_page_window(params)
+        else:
+            params = _build_search_params(kwargs)
+        if raw:
+            return self.client.get("/observations", params)
+        return self.client.get("/observations", params, decode=decode_observation_page)
     
     def get_by_id(
         self,
@@ -207,58 +406,134 @@ class ObservationService:
             include_new_projects: 是否包含新项目信息
             
         Returns:
-            Observation 对象
+            Observation 对象，不存在时返回 None
+            
+        Raises:
+            INaturalistAPIError: 请求失败（限速、服务端错误、网络错误等，已按重试策略重试）
         """
+        # 最近使用的记录缓存 OBSERVATION_CACHE_TTL 秒，命中时移到末尾
+        key = (observation_id, include_new_projects)
+        entry = self._observation_cache.pop(key, None)
+        if entry is not None and entry[0] > time.monotonic():
+            self._observation_cache[key] = entry
+            return entry[1]
+        
         params = {}
         if include_new_projects:
             params["include_new_projects"] = "true"
         
         try:
-            response = self.client.get(f"/observations/{observation_id}", params)
-            results = response.get("results", [])
-            if results:
-                return Observation.from_api(results[0])
-            return None
-        except Exception:
+            response = self.client.get(f"/observations/{observation_id}", params, decode=decode_observation_page)
+        except INaturalistAPIError as e:
+            if e.status_code == 404:
+                return None
+            raise
+        results = response["results"]
+        if not results:
             return None
+        
+        if len(self._observation_cache) >= OBSERVATION_CACHE_SIZE:
+            self._observation_cache.pop(next(iter(self._observation_cache)), None)
+        self._observation_cache[key] = (time.monotonic() + OBSERVATION_CACHE_TTL, results[0])
+        return results[0]
     
     def search_all(
         self,
         max_results: int = 1000,
+        max_workers: int = 4,
+        filters: Optional[SearchFilters] = None,
         **kwargs
     ) -> List[Observation]:
         """
         搜索所有符合条件的观察记录（自动分页）
         
+        先请求第一页得到总数，其余页面由线程池并发请求（共享客户端的连接池和限速），
+        结果按页码顺序合并。查询参数只构建一次，各页只替换页码。
+        最多获取 API 允许的前 10000 条
+        
         Args:
             max_results: 最大结果数
-            **kwargs: 其他搜索参数（同 search 方法）
+            max_workers: 并发请求的线程数
+            filters: 可选，SearchFilters 搜索条件（其 page/per_page 被忽略）
+            **kwargs: 其他搜索参数（同 search 方法）；per_page 默认 200
             
         Returns:
             Observation 对象列表
         """
-        all_observations = []
-        page = 1
-        per_page = min(kwargs.get("per_page", 200), 200)
-        
-        while len(all_observations) < max_results:
-            kwargs["page"] = page
-            kwargs["per_page"] = per_page
-            
-            observations = self.search(**kwargs)
+        per_page = min(kwargs.pop("per_page", 200), 200)
+        kwargs.pop("page", None)
+        if filters is None:
+            filters = SearchFilters.from_kwargs(**kwargs)
+        params = filters.api_params()
+        params["per_page"] = per_page
+        
+        first = self.search_page(filters, page=1, per_page=per_page)
+        all_observations = first["results"]
+        
+        total = min(max_results, first["total_results"])
+        if total > MAX_RESULT_WINDOW:
+            warnings.warn(
+                f"符合条件的观察记录超过 {MAX_RESULT_WINDOW} 条，只返回前 {MAX_RESULT_WINDOW} 条；"
+                "请缩小筛选范围，或使用 id_above 按 ID 翻页",
+                stacklevel=2
+            )
+        # 最后一页也必须满足 page * per_page <= 10000，超出的页面不请求
+        num_pages = min(-(-total // per_page), MAX_RESULT_WINDOW // per_page)
+        if num_pages > 1 and len(all_observations) == per_page:
+            def fetch(page: int) -> List[Observation]:
+                return self.client.get(
+                    "/observations", dict(params, page=page), decode=decode_observation_page
+                )["results"]
             
-            if not observations:
-                break
-            
-            all_observations.extend(observations)
-            
-            if len(observations) < per_page:
-                break
-            
-            page += 1
+            with ThreadPoolExecutor(max_workers=min(max_workers, num_pages - 1)) as executor:
+                for observations in executor.map(fetch, range(2, num_pages + 1)):
+                    all_observations.extend(observations)
         
         return all_observations[:max_results]
     
+    def iter_all(self, max_results: Optional[int] = None, **kwargs) -> Iterator[Observation]:
+        """
+        逐条返回所有符合条件的观察记录（按 ID 游标分页，参数同 search）
+        
+        按 ID 升序请求，下一页用 id_above=<上一页最后的 ID> 代替页码：
+        服务端不需要跳过前面的记录，翻页深度不影响速度，也不受前 10000 条的限制。
+        每页响应流式解析（需要 ijson），逐条构建 Observation，内存占用与结果总数无关，
+        适合大批量导出。order_by、order 和 page 参数会被忽略
+        
+        Args:
+            max_results: 最大结果数，默认不限制
+            
+        Example:
+            >>> for obs in service.iter_all(taxon_id=9083, quality_grade="research"):
+            ...     writer.writerow([obs.id, obs.observed_on])
+        """
+        kwargs.setdefault("per_page", 200)
+        kwargs.update(order_by="id", order="asc", page=1)
+        params = _build_search_params(kwargs)
+        del params["page"]
+        per_page = params["per_page"]
+        
+        count = 0
+        while True:
+            page_count = 0
+            for data in self.client.get_stream("/observations", params):
+                yield Observation.from_api(data)
+                page_count += 1
+                count += 1
+                if max_results and count >= max_results:
+                    return
+            if page_count < per_page:
+                return
+            params["id_above"] = data["id"]
+    
+    def search_all_cursor(self, max_results: Optional[int] = None, **kwargs) -> List[Observation]:
+        """
+        获取所有符合条件的观察记录（按 ID 游标分页，不受前 10000 条的限制）
+        
+        结果按 ID 升序；参数同 iter_all
+        """
+        return list(self.iter_all(max_results, **kwargs))
+    
     def count(
         self,
         taxon_id: Optional[int] = None,
@@ -293,8 +568,7 @@ class ObservationService:
         
         params.update(kwargs)
         
-        response = self.client.get("/observations", params)
-        return response.get("total_results", 0)
+        return self.client.get_total_count("/observations", params)
     
     def get_species_counts(
         self,
@@ -306,6 +580,9 @@ class ObservationService:
         observed_d2: Optional[str] = None,
         hrank: Optional[str] = None,  # 最高等级
         lrank: Optional[str] = None,  # 最低等级
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius: Optional[float] = None,  # 公里
     ) -> List[Dict[str, Any]]:
         """
         获取物种统计
@@ -320,6 +597,7 @@ class ObservationService:
             observed_d1, observed_d2: 日期范围
             hrank: 最高分类等级
             lrank: 最低分类等级
+            lat, lng, radius: 圆形搜索
             
         Returns:
             包含物种和计数的字典列表
@@ -343,8 +621,16 @@ class ObservationService:
             params["hrank"] = hrank
         if lrank:
             params["lrank"] = lrank
+        if lat is not None and lng is not None:
+            params["lat"] = lat
+            params["lng"] = lng
+            if radius:
+                params["radius"] = radius
+                bbox = bbox_from_radius(lat, lng, radius)
+                if bbox:
+                    params["nelat"], params["nelng"], params["swlat"], params["swlng"] = bbox
         
-        response = self.client.get("/observations/species_counts", params)
+        response = self.client.get_cached("/observations/species_counts", params)
         return response.get("results", [])
     
     def get_identifiers(
@@ -374,7 +660,7 @@ class ObservationService:
         
         params.update(kwargs)
         
-        response = self.client.get("/observations/identifiers", params)
+        response = self.client.get_cached("/observations/identifiers", params)
         return response.get("results", [])
     
     def get_observers(
@@ -404,7 +690,7 @@ class ObservationService:
         
         params.update(kwargs)
         
-        response = self.client.get("/observations/observers", params)
+        response = self.client.get_cached("/observations/observers", params)
         return response.get("results", [])
     
     def get_histogram(
@@ -434,7 +720,7 @@ class ObservationService:
         
         params.update(kwargs)
         
-        return self.client.get("/observations/histogram", params)
+        return self.client.get_cached("/observations/histogram", params)
     
     def get_popular(
         self,
@@ -455,14 +741,14 @@ class ObservationService:
         Returns:
             Observation 对象列表
         """
-        return self.search(
-            place_id=place_id,
-            taxon_id=taxon_id,
-            has_photos=True,
-            order_by="votes",
-            order="desc",
-            per_page=per_page
-        )
+        params = _build_search_params({
+            "place_id": place_id,
+            "taxon_id": taxon_id,
+            "has_photos": True,
+            "order_by": "votes",
+            "per_page": per_page
+        })
+        return self.client.get("/observations", params, decode=decode_observation_page)["results"]
     
     def get_latest(
         self,
@@ -483,15 +769,15 @@ class ObservationService:
         Returns:
             Observation 对象列表
         """
-        return self.search(
-            taxon_id=taxon_id,
-            place_id=place_id,
-            quality_grade=quality_grade,
-            has_photos=True,
-            order_by="observed_on",
-            order="desc",
-            per_page=per_page
-        )
+        params = _build_search_params({
+            "taxon_id": taxon_id,
+            "place_id": place_id,
+            "quality_grade": quality_grade,
+            "has_photos": True,
+            "order_by": "observed_on",
+            "per_page": per_page
+        })
+        return self.client.get("/observations", params, decode=decode_observation_page)["results"]
 
 
 # 便捷函数
@@ -502,8 +788,8 @@ def search_observations(**kwargs) -> List[Observation]:
     Example:
         >>> search_observations(taxon_id=9083, quality_grade="research")
     """
-    from inaturalist_plugin.core.client import create_client
-    client = create_client()
+    from inaturalist_plugin.core.client import get_default_client
+    client = get_default_client()
     service = ObservationService(client)
     return service.search(**kwargs)
 
@@ -515,7 +801,7 @@ def get_observation(observation_id: int) -> Optional[Observation]:
     Example:
         >>> get_observation(12345)
     """
-    from inaturalist_plugin.core.client import create_client
-    client = create_client()
+    from inaturalist_plugin.core.client import get_default_client
+    client = get_default_client()
     service = ObservationService(client)
     return service.get_by_id(observation_id)
@@ -4,9 +4,31 @@
 提供物种搜索、详情获取等功能的封装
 """
 
+import sqlite3
+from contextlib import closing
+from pathlib import Path
 from typing import List, Optional, Dict, Any, Union
-from inaturalist_plugin.core.client import INaturalistClient
-from inaturalist_plugin.models.taxon import Taxon, TaxonSummary
+from inaturalist_plugin.core.client import INaturalistAPIError, INaturalistClient
+from inaturalist_plugin.models.taxon import Taxon, TaxonSummary, RankLevel
+from inaturalist_plugin.models.structs import decode_taxon_page
+
+
+# /taxa/{ids} 单次请求最多支持的 ID 数量
+MAX_IDS_PER_REQUEST = 30
+
+# 每个服务实例缓存的物种数量上限
+TAXON_CACHE_SIZE = 1024
+
+# 从本地镜像递归查询祖先链（从该物种向上直到根节点）
+_ANCESTORS_SQL = """
+WITH RECURSIVE anc(id, parent_id, rank, name, display_name, depth) AS (
+    SELECT id, parent_id, rank, name, display_name, 0 FROM taxa WHERE id = ?
+    UNION ALL
+    SELECT t.id, t.parent_id, t.rank, t.name, t.display_name, anc.depth + 1
+    FROM taxa t JOIN anc ON t.id = anc.parent_id
+)
+SELECT id, parent_id, rank, name, display_name FROM anc ORDER BY depth DESC
+"""
 
 
 class TaxonService:
@@ -16,8 +38,33 @@ class TaxonService:
     封装了与物种相关的所有 API 调用
     """
     
-    def __init__(self, client: INaturalistClient):
+    def __init__(self, client: INaturalistClient, taxonomy_db: Optional[str] = None):
+        """
+        Args:
+            client: API 客户端
+            taxonomy_db: 可选，本地分类树镜像 (SQLite) 路径，
+                由 scripts/bootstrap_taxonomy.py 生成
+        """
         self.client = client
+        self.taxonomy_db = taxonomy_db
+        self._taxon_cache: Dict[int, Taxon] = {}
+    
+    def _cache_taxon(self, taxon: Taxon):
+        """缓存物种详情，超出上限时淘汰最久未使用的条目"""
+        if len(self._taxon_cache) >= TAXON_CACHE_SIZE:
+            self._taxon_cache.pop(next(iter(self._taxon_cache)), None)
+        self._taxon_cache[taxon.id] = taxon
+    
+    def _cached_taxon(self, taxon_id: int) -> Optional[Taxon]:
+        """读取缓存的物种，命中时移到末尾（最近使用），界/门/纲等常用祖先不会被淘汰"""
+        taxon = self._taxon_cache.pop(taxon_id, None)
+        if taxon is not None:
+            self._taxon_cache[taxon_id] = taxon
+        return taxon
+    
+    def clear_cache(self):
+        """清空物种缓存"""
+        self._taxon_cache.clear()
     
     def search(
         self,
@@ -77,10 +124,8 @@ class TaxonService:
         if is_active is not None:
             params["is_active"] = "true" if is_active else "false"
         
-        response = self.client.get("/taxa", params)
-        results = response.get("results", [])
-        
-        return [Taxon.from_api(data) for data in results]
+        response = self.client.get("/taxa", params, decode=decode_taxon_page)
+        return response["results"]
     
     def autocomplete(
         self,
@@ -117,10 +162,8 @@ class TaxonService:
         if rank:
             params["rank"] = rank
         
-        response = self.client.get("/taxa/autocomplete", params)
-        results = response.get("results", [])
-        
-        return [Taxon.from_api(data) for data in results]
+        response = self.client.get("/taxa/autocomplete", params, decode=decode_taxon_page)
+        return response["results"]
     
     def get_by_id(self, taxon_id: int) -> Optional[Taxon]:
         """
@@ -132,17 +175,58 @@ class TaxonService:
         Returns:
             Taxon 对象，如果不存在则返回 None
             
+        Raises:
+            INaturalistAPIError: 请求失败（限速、服务端错误、网络错误等，已按重试策略重试）
+            
         Example:
             >>> service.get_by_id(9083)  # 获取喜鹊的详细信息
         """
+        taxon = self._cached_taxon(taxon_id)
+        if taxon is not None:
+            return taxon
+        
         try:
-            response = self.client.get(f"/taxa/{taxon_id}")
-            results = response.get("results", [])
-            if results:
-                return Taxon.from_api(results[0])
-            return None
-        except Exception:
+            response = self.client.get(f"/taxa/{taxon_id}", decode=decode_taxon_page)
+        except INaturalistAPIError as e:
+            if e.status_code == 404:
+                return None
+            raise
+        results = response["results"]
+        if not results:
             return None
+        taxon = results[0]
+        self._cache_taxon(taxon)
+        return taxon
+    
+    def get_bulk(self, taxon_ids: List[int]) -> List[Taxon]:
+        """
+        批量获取物种详细信息
+        
+        使用 /taxa/{id1,id2,...} 一次请求多个物种（每次最多 30 个），
+        并将结果写入缓存，之后的 get_by_id 调用直接命中缓存
+        
+        Args:
+            taxon_ids: 物种 ID 列表
+            
+        Returns:
+            Taxon 对象列表，顺序与 taxon_ids 一致（不存在的 ID 会被跳过）
+            
+        Example:
+            >>> service.get_bulk([3, 7251, 8318])
+        """
+        missing = [i for i in dict.fromkeys(taxon_ids) if i not in self._taxon_cache]
+        
+        for start in range(0, len(missing), MAX_IDS_PER_REQUEST):
+            chunk = missing[start:start + MAX_IDS_PER_REQUEST]
+            response = self.client.get(
+                "/taxa/" + ",".join(str(i) for i in chunk),
+                params={"per_page": len(chunk)},
+                decode=decode_taxon_page
+            )
+            for taxon in response["results"]:
+                self._cache_taxon(taxon)
+        
+        return [self._taxon_cache[i] for i in taxon_ids if i in self._taxon_cache]
     
     def get_by_name(self, scientific_name: str) -> Optional[Taxon]:
         """
@@ -154,11 +238,15 @@ class TaxonService:
         Returns:
             Taxon 对象，如果不存在则返回 None
         """
+        target = scientific_name.lower()
+        
+        # 搜索结果按相关度排序，精确匹配通常就是第一条，先只请求 1 条
+        results = self.search(q=scientific_name, per_page=1)
+        if not results or results[0].name.lower() == target:
+            return results[0] if results else None
+        
         results = self.search(q=scientific_name, per_page=5)
-        for taxon in results:
-            if taxon.name.lower() == scientific_name.lower():
-                return taxon
-        return results[0] if results else None
+        return next((t for t in results if t.name.lower() == target), results[0] if results else None)
     
     def get_children(self, parent_id: int, rank: Optional[str] = None) -> List[Taxon]:
         """
@@ -182,18 +270,50 @@ class TaxonService:
             
         Returns:
             从界到该物种的所有祖先分类群列表
+            
+        Raises:
+            INaturalistAPIError: 请求失败
         """
         taxon = self.get_by_id(taxon_id)
         if not taxon or not taxon.ancestor_ids:
             return []
         
-        ancestors = []
-        for ancestor_id in taxon.ancestor_ids:
-            ancestor = self.get_by_id(ancestor_id)
-            if ancestor:
-                ancestors.append(ancestor)
+        # 整条祖先链通过 get_bulk 合并请求（每 30 个 ID 一次），而不是逐个 get_by_id；
+        # 请求失败时抛出 INaturalistAPIError，不返回空列表，避免被当作成功结果缓存
+        return self.get_bulk(taxon.ancestor_ids)
+    
+    def get_ancestors_local(self, taxon_id: int) -> Optional[List[Taxon]]:
+        """
+        从本地分类树镜像获取祖先分类群（不访问网络）
+        
+        Args:
+            taxon_id: 物种 ID
+            
+        Returns:
+            从界到该物种的分类群列表（与 get_ancestors 一致）；
+            未配置镜像或镜像中没有该物种时返回 None，调用方可回退到 get_ancestors
+        """
+        if not self.taxonomy_db or not Path(self.taxonomy_db).exists():
+            return None
+        
+        uri = Path(self.taxonomy_db).resolve().as_uri() + "?mode=ro"
+        with closing(sqlite3.connect(uri, uri=True)) as conn:
+            rows = conn.execute(_ANCESTORS_SQL, (taxon_id,)).fetchall()
+        
+        if not rows:
+            return None
         
-        return ancestors
+        return [
+            Taxon(
+                id=row_id,
+                name=name,
+                rank=rank or "",
+                rank_level=RankLevel[rank.upper()].value if rank and rank.upper() in RankLevel.__members__ else 0,
+                parent_id=parent_id,
+                preferred_common_name=display_name
+            )
+            for row_id, parent_id, rank, name, display_name in rows
+        ]
     
     def get_observation_count(
         self,
@@ -257,9 +377,8 @@ class TaxonService:
         Returns:
             Taxon 对象列表
         """
-        response = self.client.get("/taxa", params={"rank": "kingdom", "per_page": 50})
-        results = response.get("results", [])
-        return [Taxon.from_api(data) for data in results]
+        response = self.client.get("/taxa", params={"rank": "kingdom", "per_page": 50}, decode=decode_taxon_page)
+        return response["results"]
 
 
 # 便捷函数
@@ -274,8 +393,8 @@ def search_species(query: str, per_page: int = 30) -> List[Taxon]:
     Returns:
         Taxon 对象列表
     """
-    from inaturalist_plugin.core.client import create_client
-    client = create_client()
+    from inaturalist_plugin.core.client import get_default_client
+    client = get_default_client()
     service = TaxonService(client)
     return service.search(q=query, per_page=per_page)
 
@@ -290,7 +409,7 @@ def get_species(taxon_id: int) -> Optional[Taxon]:
     Returns:
         Taxon 对象
     """
-    from inaturalist_plugin.core.client import create_client
-    client = create_client()
+    from inaturalist_plugin.core.client import get_default_client
+    client = get_default_client()
     service = TaxonService(client)
     return service.get_by_id(taxon_id)
@@ -0,0 +1,62 @@
+"""
+地理计算工具模块
+
+提供坐标范围计算等地理相关的辅助函数（纯 Python，只依赖 math）。
+批量按距离过滤坐标的 numpy / numba 实现在 geo_filter 模块，需要时再导入
+"""
+
+import math
+from typing import Optional, Tuple
+
+
+# 地球平均半径（公里），与 haversine_km 使用同一个值
+EARTH_RADIUS_KM = 6371.0088
+
+# 边界框的放大比例：保证边界框完全包含圆形区域，不因舍入漏掉边缘的观察记录
+BBOX_PADDING = 1.01
+
+
+def bbox_from_radius(lat: float, lng: float, radius_km: float) -> Optional[Tuple[float, float, float, float]]:
+    """
+    计算圆形区域的外接边界框
+
+    按球面计算圆在纬度和经度方向的最大跨度（经度跨度为 asin(sin(r/R) / cos(lat))），
+    再放大 BBOX_PADDING 倍，边界框总是包含整个圆。
+    边界框会跨越 ±180 经线或到达极点时返回 None：API 的边界框不能跨越经线，
+    裁剪后会漏掉对侧的观察记录，极点附近的经度跨度也失去意义，此时只按圆形搜索
+
+    Args:
+        lat: 中心纬度
+        lng: 中心经度
+        radius_km: 半径（公里）
+
+    Returns:
+        (nelat, nelng, swlat, swlng) 边界框坐标，无法用边界框表示时返回 None
+
+    Example:
+        >>> bbox_from_radius(39.9, 116.4, 10)
+    """
+    angle = radius_km / EARTH_RADIUS_KM  # 半径对应的圆心角（弧度）
+    dlat = math.degrees(angle) * BBOX_PADDING
+    nelat = lat + dlat
+    swlat = lat - dlat
+    if nelat >= 90.0 or swlat <= -90.0:
+        return None
+
+    # 圆不含极点时 sin(angle) < cos(lat)，asin 的参数总在定义域内
+    dlng = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(lat)))) * BBOX_PADDING
+    nelng = lng + dlng
+    swlng = lng - dlng
+    if nelng > 180.0 or swlng < -180.0:
+        return None
+    return nelat, nelng, swlat, swlng
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """两点间的大圆距离（公里）"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,49 @@
+"""
+批量距离过滤模块
+
+按大圆距离筛选半径内的坐标。安装了 numba 时编译为本地代码，
+否则使用 numpy 或纯 Python 实现。numpy / numba 导入较慢（合计约 200ms），
+因此与 geo 模块分开，只在需要过滤时导入
+"""
+
+from typing import Sequence
+
+from inaturalist_plugin.utils.geo import _haversine_km
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba 为可选依赖，未安装时使用纯 Python 实现
+    njit = None
+    prange = range
+
+
+def _filter_within(lats, lons, clat: float, clon: float, radius_km: float):
+    """返回布尔掩码，标记哪些点在圆形区域内"""
+    n = len(lats)
+    mask = np.empty(n, dtype=np.bool_)
+    for i in prange(n):
+        mask[i] = haversine_km(lats[i], lons[i], clat, clon) <= radius_km
+    return mask
+
+
+def _filter_within_py(lats: Sequence[float], lons: Sequence[float], clat: float, clon: float,
+                      radius_km: float):
+    """_filter_within 的纯 Python 版本（未安装 numpy 时使用）"""
+    return [haversine_km(lat, lon, clat, clon) <= radius_km for lat, lon in zip(lats, lons)]
+
+
+if njit is not None and np is not None:
+    # 安装了 numba 时编译为本地代码，大量坐标时比纯 Python 快一到两个数量级
+    haversine_km = njit(cache=True, fastmath=True)(_haversine_km)
+    filter_within = njit(cache=True, parallel=True)(_filter_within)
+elif np is not None:
+    haversine_km = _haversine_km
+    filter_within = _filter_within
+else:
+    haversine_km = _haversine_km
+    filter_within = _filter_within_py
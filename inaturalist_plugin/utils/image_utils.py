@@ -4,17 +4,130 @@
 提供图片下载、处理和缓存功能
 """
 
+import asyncio
+import bisect
+import itertools
+import json
+import mmap
 import os
 import hashlib
+import shutil
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 from urllib.parse import urlparse
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 import time
 
+from inaturalist_plugin.core.client import HTTP2_AVAILABLE
+from inaturalist_plugin.core.rate_limit import TokenBucket
 
-@dataclass
+try:
+    import httpx
+except ImportError:  # httpx 为可选依赖，未安装时不提供异步批量下载
+    httpx = None
+
+
+# 下载图片时每次读写的字节数
+DOWNLOAD_BUFFER_SIZE = 256 * 1024
+
+# 图片元数据（大小、格式、ETag）的记录文件，位于缓存目录下，每行一条 JSON
+META_FILENAME = "meta.jsonl"
+
+# 临时文件序号，同一进程内的并发写入（线程或协程）使用不同的临时文件
+_tmp_counter = itertools.count()
+
+
+# 常见图片格式的文件头（WEBP 为 RIFF....WEBP，单独判断）
+_IMAGE_MAGIC = (b"\xff\xd8\xff", b"\x89PNG", b"GIF8")
+
+
+def _check_image_response(content_type: str, head: bytes):
+    """
+    检查响应是否为图片，避免把空响应或 HTML 错误页写入缓存
+    
+    Args:
+        content_type: 响应的 Content-Type
+        head: 响应体的前 16 个字节
+        
+    Raises:
+        ValueError: 响应体为空，或 Content-Type 和文件头都不是图片
+    """
+    if not head:
+        raise ValueError("Empty response body")
+    if content_type.startswith("image/") or head.startswith(_IMAGE_MAGIC) or (
+        head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+    ):
+        return
+    raise ValueError(f"Response is not an image (Content-Type: {content_type or 'unknown'})")
+
+
+def _host_bucket(delay: float, burst: int) -> TokenBucket:
+    """批量下载时单个主机的令牌桶：平均每 delay 秒一个请求，最多 burst 个突发"""
+    return TokenBucket(rate=1 / delay, capacity=burst)
+
+
+def _unlink_missing_ok(path: str):
+    """删除文件，文件已不存在时忽略"""
+    with suppress(FileNotFoundError):
+        os.unlink(path)
+
+
+@contextmanager
+def _atomic_write(path: Path):
+    """
+    写入同目录下的临时文件，完成后用 os.replace 原子替换为 path
+    
+    下载中断（异常或进程被终止）不会留下被当作缓存命中的不完整文件；
+    失败时删除临时文件
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{next(_tmp_counter)}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+
+
+@lru_cache(maxsize=4096)
+def _parse_url(url: str) -> Tuple[str, str]:
+    """解析 URL 的主机名和文件扩展名（没有扩展名时为 .jpg），结果缓存"""
+    parsed = urlparse(url)
+    ext = os.path.splitext(parsed.path)[1]
+    if not ext:
+        ext = ".jpg"  # 默认扩展名
+    return parsed.netloc, ext
+
+
+@lru_cache(maxsize=4096)
+def _url_to_cache_name(url: str) -> str:
+    """
+    根据 URL 生成缓存文件名: <URL 哈希><扩展名>
+    
+    哈希只用作缓存键，不需要抗碰撞攻击，使用比 MD5 更快的 BLAKE2b (128 位)；
+    批量下载时同一 URL 会在检查缓存和保存时各计算一次，结果缓存
+    """
+    url_hash = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    return f"{url_hash}{_parse_url(url)[1]}"
+
+
+@lru_cache(maxsize=2048)
+def _resolve_save_path(cache_dir: str, url: str, filename: Optional[str] = None) -> Path:
+    """图片的保存路径：指定了 filename 时为缓存目录下的该文件，否则按 URL 哈希命名（结果缓存）"""
+    return Path(cache_dir, filename or _url_to_cache_name(url))
+
+
+@dataclass(slots=True)
 class ImageInfo:
     """图片信息"""
     url: str
@@ -60,10 +173,39 @@ class ImageDownloader:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.timeout = timeout
+        self._meta_path = self.cache_dir / META_FILENAME
+        self._meta: Optional[Dict[str, Dict[str, Any]]] = None  # URL -> 元数据，首次使用时读取
+        self._meta_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "iNaturalistPlugin/1.0 (Scientific Research)"
         })
+        
+        # 只在这里挂载一次适配器：连接池足够大，download_multiple 的各线程共享 keep-alive 连接；
+        # 限速和服务端临时错误按指数退避重试
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def __enter__(self) -> "ImageDownloader":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
     
     def _get_cache_path(self, url: str) -> Path:
         """
@@ -76,17 +218,69 @@ class ImageDownloader:
             缓存文件路径
         """
         # 使用 URL 的哈希作为文件名
-        url_hash = hashlib.md5(url.encode()).hexdigest()
+        return _resolve_save_path(str(self.cache_dir), url)
+    
+    def _is_cached(self, path: Path) -> bool:
+        """
+        检查文件是否已缓存
         
-        # 从 URL 中提取扩展名
-        parsed = urlparse(url)
-        path = parsed.path
-        ext = os.path.splitext(path)[1]
-        if not ext:
-            ext = ".jpg"  # 默认扩展名
+        每次都检查文件系统：同一目录可能由多个下载器实例或其他进程共用，
+        文件随时可能被写入或被 clear_cache 删除，不能依赖内存中的记录
+        """
+        return path.is_file()
+    
+    def _load_meta(self) -> Dict[str, Dict[str, Any]]:
+        """
+        读取元数据记录文件（同一 URL 以最后一行为准）
         
-        filename = f"{url_hash}{ext}"
-        return self.cache_dir / filename
+        过期的重复行超过有效记录数时，把文件压缩为每个 URL 一行
+        """
+        # 在锁内检查并读取，避免多个线程同时读取或压缩文件
+        with self._meta_lock:
+            if self._meta is None:
+                meta = {}
+                lines = 0
+                with suppress(FileNotFoundError), open(self._meta_path, encoding="utf-8") as f:
+                    for line in f:
+                        lines += 1
+                        with suppress(ValueError):
+                            record = json.loads(line)
+                            meta[record["url"]] = record
+                if lines > 2 * len(meta):
+                    with _atomic_write(self._meta_path) as f:
+                        f.writelines(json.dumps(record).encode("utf-8") + b"\n" for record in meta.values())
+                self._meta = meta
+            return self._meta
+    
+    def _conditional_headers(self, url: str) -> Optional[Dict[str, str]]:
+        """根据记录的 ETag/Last-Modified 生成条件请求头，没有记录时返回 None"""
+        record = self._load_meta().get(url)
+        if record is None:
+            return None
+        headers = {}
+        if record.get("etag"):
+            headers["If-None-Match"] = record["etag"]
+        if record.get("last_modified"):
+            headers["If-Modified-Since"] = record["last_modified"]
+        return headers or None
+    
+    def _record_meta(self, url: str, headers) -> Dict[str, Any]:
+        """根据响应头记录图片元数据，与已有记录不同时追加到记录文件"""
+        record = {
+            "url": url,
+            "size": int(headers.get("Content-Length") or 0),
+            "format": headers.get("Content-Type", "").split("/")[-1],
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified")
+        }
+        meta = self._load_meta()
+        with self._meta_lock:
+            if meta.get(url) == record:
+                return record
+            meta[url] = record
+            with open(self._meta_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        return record
     
     def download(
         self,
@@ -104,6 +298,9 @@ class ImageDownloader:
             use_cache: 是否使用缓存
             force_download: 是否强制重新下载（忽略缓存）
             
+        不使用缓存或强制重新下载时，如果已有缓存文件且记录了 ETag/Last-Modified，
+        发送条件请求，服务端返回 304（内容未变）时沿用缓存文件，不传输响应体
+            
         Returns:
             下载后的本地文件路径，失败返回 None
         """
@@ -111,101 +308,308 @@ class ImageDownloader:
             return None
         
         # 确定保存路径
-        if filename:
-            save_path = self.cache_dir / filename
-        else:
-            save_path = self._get_cache_path(url)
+        save_path = _resolve_save_path(str(self.cache_dir), url, filename)
         
         # 检查缓存
-        if use_cache and not force_download and save_path.exists():
+        if use_cache and not force_download and self._is_cached(save_path):
             return str(save_path)
         
+        headers = None
+        if self._is_cached(save_path):
+            headers = self._conditional_headers(url)
+        
         try:
             # 下载图片
-            response = self.session.get(url, timeout=self.timeout, stream=True)
+            response = self.session.get(url, timeout=self.timeout, stream=True, headers=headers)
             response.raise_for_status()
+            if response.status_code == 304:
+                response.close()
+                return str(save_path)
             
-            # 保存到文件
-            with open(save_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # 保存到文件：由 shutil.copyfileobj 以 256 KiB 为单位复制，
+            # 不经过 Python 层的分块迭代；decode_content 保证按 Content-Encoding 解压
+            response.raw.decode_content = True
+            head = response.raw.read(16)
+            _check_image_response(response.headers.get("Content-Type", ""), head)
+            with _atomic_write(save_path) as f:
+                f.write(head)
+                shutil.copyfileobj(response.raw, f, DOWNLOAD_BUFFER_SIZE)
             
+            self._record_meta(url, response.headers)
             return str(save_path)
             
         except Exception as e:
             print(f"Error downloading image {url}: {e}")
             return None
     
+    def open_mmap(self, url: str) -> Optional[mmap.mmap]:
+        """
+        以只读内存映射打开缓存的图片（未缓存时先下载）
+        
+        交给 PIL 等库解码时不需要先把整个文件读入 bytes，少一份图片大小的拷贝；
+        调用方用完后应 close()
+        
+        Returns:
+            mmap 对象，下载失败或文件为空时返回 None
+            
+        Example:
+            >>> with downloader.open_mmap(url) as data:
+            ...     image = Image.open(data)  # mmap 支持 read/seek/tell，可以直接作为文件对象
+        """
+        path = self.download(url)
+        if path is None:
+            return None
+        
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            if os.fstat(fd).st_size == 0:
+                return None
+            mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)  # mmap 持有自己的文件描述符
+        
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)  # 顺序读取，让内核预读
+        return mapped
+    
     def download_multiple(
         self,
         urls: List[str],
         use_cache: bool = True,
-        delay: float = 0.5
+        delay: float = 0.5,
+        max_workers: int = 16,
+        per_host: int = 4
     ) -> Dict[str, Optional[str]]:
         """
         批量下载图片
         
+        由线程池并发下载（共享会话的连接池）；同一主机最多 per_host 个并发请求，
+        每个主机一个令牌桶，平均每 delay 秒一个请求（允许 per_host 个突发），
+        不同主机之间互不等待。已缓存的图片不发请求，也不消耗配额
+        
         Args:
             urls: 图片 URL 列表
             use_cache: 是否使用缓存
-            delay: 下载间隔（秒），避免请求过快
+            delay: 同一主机的平均请求间隔（秒），避免请求过快；0 表示不限速
+            max_workers: 下载线程数
+            per_host: 同一主机的最大并发请求数
             
         Returns:
             URL 到本地路径的映射字典
         """
-        results = {}
+        # 去重后一次性解析缓存路径，已缓存的直接返回，只有缺失的 URL 进入线程池
+        results: Dict[str, Optional[str]] = {}
+        missing = []
+        for url in dict.fromkeys(urls):
+            if not url:
+                results[url] = None
+                continue
+            save_path = self._get_cache_path(url)
+            if use_cache and self._is_cached(save_path):
+                results[url] = str(save_path)
+            else:
+                results[url] = None
+                missing.append(url)
+        
+        if not missing:
+            return results
+        
+        hosts = {url: _parse_url(url)[0] for url in missing}
+        host_limits = {host: threading.Semaphore(per_host) for host in set(hosts.values())}
+        buckets = {host: _host_bucket(delay, per_host) for host in host_limits} if delay > 0 else {}
+        
+        def fetch(url: str) -> Optional[str]:
+            host = hosts[url]
+            if buckets:
+                buckets[host].acquire()
+            with host_limits[host]:
+                return self.download(url, use_cache=use_cache)
         
-        for url in urls:
-            local_path = self.download(url, use_cache=use_cache)
-            results[url] = local_path
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+            results.update(zip(missing, executor.map(fetch, missing)))
+        return results
+    
+    async def download_multiple_async(
+        self,
+        urls: List[str],
+        use_cache: bool = True,
+        concurrency: int = 8,
+        per_host: int = 4,
+        delay: float = 0.5
+    ) -> Dict[str, Optional[str]]:
+        """
+        批量下载图片（异步并发版本，需要安装 httpx）
+        
+        concurrency 个协程从队列中取 URL 下载，各请求的握手和传输相互重叠；
+        安装了 h2 时使用 HTTP/2，同一主机的并发请求复用一个连接；
+        同一主机最多 per_host 个并发请求，每个主机一个令牌桶，
+        平均每 delay 秒一个请求（允许 per_host 个突发），不同主机之间互不等待
+        
+        Args:
+            urls: 图片 URL 列表
+            use_cache: 是否使用缓存
+            concurrency: 并发下载的协程数
+            per_host: 同一主机的最大并发请求数
+            delay: 同一主机的平均请求间隔（秒）；0 表示不限速
+            
+        Returns:
+            URL 到本地路径的映射字典
             
-            if delay > 0:
-                time.sleep(delay)
+        Example:
+            >>> paths = await downloader.download_multiple_async(urls, concurrency=16)
+        """
+        if httpx is None:
+            raise ImportError("download_multiple_async 需要安装 httpx: pip install httpx")
+        
+        results: Dict[str, Optional[str]] = dict.fromkeys(urls)
+        queue: asyncio.Queue = asyncio.Queue()
+        for url in results:
+            queue.put_nowait(url)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        buckets: Dict[str, TokenBucket] = {}
+        
+        async def worker(client: "httpx.AsyncClient"):
+            while True:
+                url = await queue.get()
+                try:
+                    host = _parse_url(url)[0]
+                    if host not in host_limits:
+                        host_limits[host] = asyncio.Semaphore(per_host)
+                        if delay > 0:
+                            buckets[host] = _host_bucket(delay, per_host)
+                    results[url] = await self._download_one(
+                        client, url, use_cache, host_limits[host], buckets.get(host)
+                    )
+                finally:
+                    queue.task_done()
+        
+        async with httpx.AsyncClient(
+            headers={"User-Agent": self.session.headers["User-Agent"]},
+            timeout=self.timeout,
+            follow_redirects=True,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=concurrency)
+        ) as client:
+            workers = [asyncio.create_task(worker(client)) for _ in range(min(concurrency, len(results)))]
+            await queue.join()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
         
         return results
     
+    async def _download_one(
+        self,
+        client: "httpx.AsyncClient",
+        url: str,
+        use_cache: bool,
+        host_limit: asyncio.Semaphore,
+        bucket: Optional[TokenBucket]
+    ) -> Optional[str]:
+        """异步下载单张图片到缓存路径，失败返回 None"""
+        if not url:
+            return None
+        
+        save_path = self._get_cache_path(url)
+        if use_cache and self._is_cached(save_path):
+            return str(save_path)
+        
+        if bucket is not None:
+            await bucket.acquire_async()
+        async with host_limit:
+            try:
+                async with client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    chunks = response.aiter_bytes(65536)
+                    first = await anext(chunks, b"")
+                    _check_image_response(response.headers.get("Content-Type", ""), first[:16])
+                    with _atomic_write(save_path) as f:
+                        f.write(first)
+                        async for chunk in chunks:
+                            f.write(chunk)
+                    self._record_meta(url, response.headers)
+                return str(save_path)
+            except Exception as e:
+                print(f"Error downloading image {url}: {e}")
+                return None
+    
     def get_image_info(self, url: str) -> Optional[ImageInfo]:
         """
         获取图片信息（不下载）
         
+        HEAD 请求或下载得到的大小和格式记录在缓存目录的 meta.jsonl 中，
+        同一 URL 之后直接读取记录，不再请求
+        
         Args:
             url: 图片 URL
             
         Returns:
             ImageInfo 对象
         """
-        try:
-            response = self.session.head(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            return ImageInfo(
-                url=url,
-                size=int(response.headers.get("Content-Length", 0)),
-                format=response.headers.get("Content-Type", "").split("/")[-1]
-            )
-        except Exception:
-            return None
+        record = self._load_meta().get(url)
+        if record is None:
+            try:
+                response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+                response.raise_for_status()
+            except Exception:
+                return None
+            record = self._record_meta(url, response.headers)
+        
+        return ImageInfo(url=url, size=record["size"], format=record["format"])
     
     def clear_cache(self, max_age_days: Optional[int] = None):
         """
         清理缓存
         
         Args:
-            max_age_days: 可选，只删除超过指定天数的缓存文件
+            max_age_days: 可选，只删除超过指定天数的缓存文件（保留图片元数据记录）
         """
         if not self.cache_dir.exists():
             return
         
-        for file_path in self.cache_dir.iterdir():
-            if not file_path.is_file():
-                continue
-            
-            if max_age_days is not None:
-                file_age = time.time() - file_path.stat().st_mtime
-                if file_age < max_age_days * 86400:
-                    continue
-            
-            file_path.unlink()
+        if max_age_days is None:
+            with self._meta_lock:
+                self._meta = None
+            cutoff = None
+        else:
+            cutoff = time.time() - max_age_days * 86400
+        
+        # os.scandir 的目录项自带文件类型，不限制时间时不需要 stat
+        with os.scandir(self.cache_dir) as entries:
+            paths = [
+                entry.path for entry in entries
+                if entry.is_file(follow_symlinks=False) and (
+                    cutoff is None or (
+                        entry.name != META_FILENAME
+                        and entry.stat(follow_symlinks=False).st_mtime < cutoff
+                    )
+                )
+            ]
+        
+        # unlink 会释放 GIL，文件较多时并发删除
+        if len(paths) > 64:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(_unlink_missing_ok, paths))
+        else:
+            for path in paths:
+                _unlink_missing_ok(path)
+
+
+# get_all_urls 返回的尺寸名，以及一次取出对应属性的 attrgetter（C 实现）
+_SIZE_KEYS = ("square", "thumb", "small", "medium", "large", "original")
+_SIZE_ATTRS = attrgetter(*[f"{key}_url" for key in _SIZE_KEYS[:-1]], "url")
+
+# get_best_url 的尺寸检查顺序（按质量从高到低），首选尺寸排在最前；预先生成属性名
+_BEST_URL_ORDER = ("large", "medium", "small", "thumb", "square")
+_BEST_URL_ATTRS = {
+    preferred: tuple(f"{size}_url" for size in (preferred, *(s for s in _BEST_URL_ORDER if s != preferred)))
+    for preferred in _BEST_URL_ORDER
+}
+_DEFAULT_BEST_URL_ATTRS = tuple(f"{size}_url" for size in _BEST_URL_ORDER)
+
+# select_size_by_width：各尺寸的最大宽度（升序）及对应尺寸名，超过最后一档为 large
+_WIDTH_THRESHOLDS = (75, 100, 240, 500)
+_WIDTH_NAMES = ("square", "thumb", "small", "medium", "large")
 
 
 class ImageSizeHelper:
@@ -250,16 +654,9 @@ class ImageSizeHelper:
         if not photo_obj:
             return None
         
-        # 按质量从高到低检查
-        size_order = ["large", "medium", "small", "thumb", "square", "url"]
-        
-        if preferred_size in size_order:
-            # 将首选尺寸移到最前面
-            size_order.remove(preferred_size)
-            size_order.insert(0, preferred_size)
-        
-        for size in size_order:
-            url = getattr(photo_obj, f"{size}_url", None)
+        # 按质量从高到低检查，首选尺寸在最前面
+        for attr in _BEST_URL_ATTRS.get(preferred_size, _DEFAULT_BEST_URL_ATTRS):
+            url = getattr(photo_obj, attr, None)
             if url:
                 return url
         
@@ -276,14 +673,14 @@ class ImageSizeHelper:
         Returns:
             尺寸到 URL 的映射
         """
-        return {
-            "square": getattr(photo_obj, "square_url", None),
-            "thumb": getattr(photo_obj, "thumb_url", None),
-            "small": getattr(photo_obj, "small_url", None),
-            "medium": getattr(photo_obj, "medium_url", None),
-            "large": getattr(photo_obj, "large_url", None),
-            "original": getattr(photo_obj, "url", None)
-        }
+        try:
+            return dict(zip(_SIZE_KEYS, _SIZE_ATTRS(photo_obj)))
+        except AttributeError:
+            # 缺少部分尺寸属性的对象，缺少的尺寸为 None
+            return {
+                key: getattr(photo_obj, f"{key}_url" if key != "original" else "url", None)
+                for key in _SIZE_KEYS
+            }
     
     @classmethod
     def select_size_by_width(cls, width: int) -> str:
@@ -296,16 +693,13 @@ class ImageSizeHelper:
         Returns:
             尺寸名称
         """
-        if width <= 75:
-            return "square"
-        elif width <= 100:
-            return "thumb"
-        elif width <= 240:
-            return "small"
-        elif width <= 500:
-            return "medium"
-        else:
-            return "large"
+        return _WIDTH_NAMES[bisect.bisect_left(_WIDTH_THRESHOLDS, width)]
+
+
+@lru_cache(maxsize=8)
+def _get_downloader(cache_dir: Optional[str]) -> ImageDownloader:
+    """便捷函数共用的下载器（每个缓存目录一个），复用会话的连接池和缓存索引"""
+    return ImageDownloader(cache_dir=cache_dir)
 
 
 def download_species_photos(
@@ -326,8 +720,8 @@ def download_species_photos(
     Returns:
         下载成功的本地文件路径列表
     """
-    downloader = ImageDownloader(cache_dir=cache_dir)
     urls = taxon.get_photos_by_size(size)[:max_photos]
+    downloader = _get_downloader(cache_dir)
     
     results = []
     for url in urls:
@@ -354,8 +748,8 @@ def download_observation_photos(
     Returns:
         下载成功的本地文件路径列表
     """
-    downloader = ImageDownloader(cache_dir=cache_dir)
     urls = observation.get_photo_urls(size)
+    downloader = _get_downloader(cache_dir)
     
     results = []
     for url in urls:
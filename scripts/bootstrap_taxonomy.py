@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+构建本地分类树镜像
+
+下载 iNaturalist 分类学数据导出 (Darwin Core Archive)，导入 SQLite 数据库，
+供 TaxonService.get_ancestors_local 离线查询祖先分类群。
+
+用法:
+    python scripts/bootstrap_taxonomy.py --db taxa.db
+    python scripts/bootstrap_taxonomy.py --db taxa.db --archive inaturalist-taxonomy.dwca.zip
+
+之后设置环境变量 INAT_TAXONOMY_DB=taxa.db 启动前端即可使用本地镜像。
+"""
+
+import argparse
+import csv
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import zipfile
+
+import requests
+
+
+TAXONOMY_EXPORT_URL = "https://www.inaturalist.org/taxa/inaturalist-taxonomy.dwca.zip"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS taxa (
+    id INTEGER PRIMARY KEY,
+    parent_id INTEGER,
+    rank TEXT,
+    name TEXT NOT NULL,
+    display_name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_parent ON taxa(parent_id);
+"""
+
+BATCH_SIZE = 10000
+
+
+def download_archive(url: str, dest: str):
+    """流式下载分类学数据导出文件"""
+    print(f"下载 {url} ...")
+    with requests.get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        with open(dest, "wb") as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+
+
+def _parse_id(value: str):
+    """解析 ID，兼容 https://www.inaturalist.org/taxa/123 形式"""
+    if not value:
+        return None
+    tail = value.rstrip("/").rsplit("/", 1)[-1]
+    return int(tail) if tail.isdigit() else None
+
+
+def _read_csv(archive: zipfile.ZipFile, name: str):
+    with archive.open(name) as raw:
+        yield from csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8"))
+
+
+def load_english_names(archive: zipfile.ZipFile) -> dict:
+    """读取英文俗名（如果导出中包含）"""
+    names = {}
+    if "VernacularNames-english.csv" not in archive.namelist():
+        return names
+    for row in _read_csv(archive, "VernacularNames-english.csv"):
+        taxon_id = _parse_id(row.get("id", ""))
+        if taxon_id is not None and taxon_id not in names:
+            names[taxon_id] = row.get("vernacularName")
+    return names
+
+
+def build_database(archive_path: str, db_path: str) -> int:
+    """
+    将导出文件导入 SQLite
+
+    Returns:
+        导入的分类群数量
+    """
+    count = 0
+    with zipfile.ZipFile(archive_path) as archive:
+        english_names = load_english_names(archive)
+
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.executescript(SCHEMA)
+            conn.execute("DELETE FROM taxa")
+
+            batch = []
+            for row in _read_csv(archive, "taxa.csv"):
+                taxon_id = _parse_id(row.get("id", ""))
+                if taxon_id is None:
+                    continue
+                batch.append((
+                    taxon_id,
+                    _parse_id(row.get("parentNameUsageID", "")),
+                    row.get("taxonRank"),
+                    row.get("scientificName", ""),
+                    english_names.get(taxon_id),
+                ))
+                if len(batch) >= BATCH_SIZE:
+                    conn.executemany("INSERT OR REPLACE INTO taxa VALUES (?, ?, ?, ?, ?)", batch)
+                    count += len(batch)
+                    batch.clear()
+
+            if batch:
+                conn.executemany("INSERT OR REPLACE INTO taxa VALUES (?, ?, ?, ?, ?)", batch)
+                count += len(batch)
+            conn.commit()
+        finally:
+            conn.close()
+
+    return count
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="构建 iNaturalist 本地分类树镜像")
+    parser.add_argument("--db", default="taxa.db", help="SQLite 数据库路径 (默认: taxa.db)")
+    parser.add_argument("--archive", help="已下载的 DwC-A 导出文件，省略时自动下载")
+    parser.add_argument("--url", default=TAXONOMY_EXPORT_URL, help="导出文件下载地址")
+    args = parser.parse_args(argv)
+
+    if args.archive:
+        count = build_database(args.archive, args.db)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive_path = os.path.join(tmp, "taxonomy.dwca.zip")
+            download_archive(args.url, archive_path)
+            count = build_database(archive_path, args.db)
+
+    print(f"已导入 {count} 个分类群到 {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
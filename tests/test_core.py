@@ -9,6 +9,8 @@ import json
 import time
 from datetime import datetime
 
+import requests
+
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -17,6 +19,9 @@ from inaturalist_plugin.services.taxon_service import TaxonService
 from inaturalist_plugin.services.observation_service import ObservationService
 from inaturalist_plugin import INaturalistPlugin
 
+# 所有测试共用一个客户端，复用连接池（请求频率由客户端自身的限流控制）
+CLIENT = create_client()
+
 
 class TestRunner:
     """测试运行器"""
@@ -84,7 +89,7 @@ def test_client_creation():
 
 def test_api_connection():
     """测试 API 连接"""
-    client = create_client()
+    client = CLIENT
     
     # 简单的 API 调用测试
     response = client.get("/taxa", params={"q": "Pica pica", "per_page": 1})
@@ -96,7 +101,7 @@ def test_api_connection():
 
 def test_taxon_search():
     """测试物种搜索"""
-    client = create_client()
+    client = CLIENT
     service = TaxonService(client)
     
     # 搜索喜鹊属 (Pica)
@@ -120,7 +125,7 @@ def test_taxon_search():
 
 def test_taxon_detail():
     """测试物种详情获取"""
-    client = create_client()
+    client = CLIENT
     service = TaxonService(client)
     
     # 使用喜鹊属的 ID (8318)
@@ -141,7 +146,7 @@ def test_taxon_detail():
 
 def test_taxon_autocomplete():
     """测试自动补全"""
-    client = create_client()
+    client = CLIENT
     service = TaxonService(client)
     
     suggestions = service.autocomplete(q="ma", per_page=10)
@@ -155,7 +160,7 @@ def test_taxon_autocomplete():
 
 def test_observation_search():
     """测试观察记录搜索"""
-    client = create_client()
+    client = CLIENT
     service = ObservationService(client)
     
     observations = service.search(
@@ -176,7 +181,7 @@ def test_observation_search():
 
 def test_location_search():
     """测试位置搜索"""
-    client = create_client()
+    client = CLIENT
     service = ObservationService(client)
     
     # 搜索天安门周围
@@ -240,7 +245,7 @@ def test_image_urls():
 
 def test_species_counts():
     """测试物种统计"""
-    client = create_client()
+    client = CLIENT
     service = ObservationService(client)
     
     # 获取物种统计
@@ -258,7 +263,7 @@ def test_species_counts():
 
 def test_pagination():
     """测试分页功能"""
-    client = create_client()
+    client = CLIENT
     
     # 测试分页获取
     results = client.paginate(
@@ -275,6 +280,237 @@ def test_pagination():
     print(f"  ✓ 分页获取到 {len(results)} 条结果")
 
 
+def test_observation_from_api():
+    """测试 Observation.from_api 字段映射（from_api 按参数位置构建，字段顺序变化时会失败）"""
+    from inaturalist_plugin.models.observation import Observation
+    
+    data = {
+        "id": 1, "uuid": "abc", "quality_grade": "research", "species_guess": "喜鹊",
+        "taxon": {"id": 8318, "name": "Pica serica", "rank": "species"},
+        "observed_on": "2024-05-01", "created_at": "2024-05-02T08:00:00+08:00",
+        "latitude": 39.9, "longitude": 116.4, "location": "39.9,116.4", "place_guess": "北京",
+        "identifications_count": 3, "faves_count": 2, "user_id": 7, "user_login": "bob",
+        "photo_urls": ["https://example.com/1.jpg"], "project_ids": [5],
+        "license_code": "cc-by", "uri": "https://www.inaturalist.org/observations/1"
+    }
+    obs = Observation.from_api(data)
+    
+    assert (obs.id, obs.uuid, obs.quality_grade, obs.species_guess) == (1, "abc", "research", "喜鹊")
+    assert (obs.taxon_id, obs.taxon_name, obs.taxon_rank) == (8318, "Pica serica", "species")
+    assert (obs.observed_on, obs.created_at) == ("2024-05-01", "2024-05-02T08:00:00+08:00")
+    assert obs.coords == (39.9, 116.4)
+    assert (obs.location_string, obs.place_guess) == ("39.9,116.4", "北京")
+    assert (obs.identification_count, obs.faves_count, obs.comments_count) == (3, 2, 0)
+    assert (obs.user_id, obs.user_login) == (7, "bob")
+    assert obs.photo_urls == ("https://example.com/1.jpg",) and obs.project_ids == (5,)
+    assert (obs.license_code, obs.uri, obs.url) == ("cc-by", "https://www.inaturalist.org/observations/1", None)
+    assert obs.photos == () and obs.user is None and obs.raw_data is None
+    print("  ✓ 字段映射正确")
+
+
+# ============= 离线测试（使用桩适配器，不访问网络）=============
+
+class StubAdapter(requests.adapters.BaseAdapter):
+    """按 handler(request) 返回的 (状态码, 响应头, 响应体) 构造响应，并记录收到的请求"""
+    
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.requests = []
+    
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        status, headers, body = self.handler(request)
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        return response
+    
+    def close(self):
+        pass
+
+
+def stub_client(handler):
+    """创建挂载 StubAdapter 的客户端（不使用磁盘缓存），返回 (client, adapter)"""
+    client = create_client(use_cache=False)
+    adapter = StubAdapter(handler)
+    client.session.mount("https://", adapter)
+    return client, adapter
+
+
+def json_page(results):
+    """handler 辅助函数：返回包含 results 的 200 JSON 响应"""
+    body = json.dumps({"total_results": len(results), "page": 1, "per_page": 30, "results": results})
+    return lambda request: (200, {"Content-Type": "application/json"}, body.encode("utf-8"))
+
+
+SAMPLE_TAXON = {
+    "id": 8318, "name": "Pica", "rank": "genus", "rank_level": 20, "parent_id": 7823,
+    "ancestor_ids": [48460, 1, 2, 355675, 3, 7251, 71349, 8318],
+    "preferred_common_name": "Magpies", "observations_count": 12345,
+    "default_photo": {"id": 1, "url": "https://example.com/photos/1/square.jpg",
+                      "medium_url": "https://example.com/photos/1/medium.jpg", "attribution": "a"},
+    "taxon_names": [{"lexicon": "English", "name": "Magpies"},
+                    {"lexicon": "Chinese (Simplified)", "name": "鹊属"}]
+}
+
+SAMPLE_OBSERVATION = {
+    "id": 1, "uuid": "abc", "quality_grade": "research", "species_guess": "喜鹊",
+    "taxon": {"id": 8318, "name": "Pica", "rank": "genus"},
+    "observed_on": "2024-05-01", "latitude": 39.9, "longitude": 116.4, "place_guess": "北京",
+    "user": {"id": 7, "login": "bob"},
+    "photos": [{"id": 10, "url": "https://example.com/photos/10/square.jpg",
+                "medium_url": "https://example.com/photos/10/medium.jpg",
+                "attribution": "(c) bob", "license_code": "cc-by"}],
+    "identifications": [{"id": 100, "taxon": {"id": 8318, "name": "Pica"}, "current": True}]
+}
+
+
+def test_search_filters_params():
+    """测试 SearchFilters 的参数转换与缓存"""
+    from inaturalist_plugin.services.observation_service import SearchFilters, _build_search_params
+    
+    kwargs = dict(taxon_id=9083, iconic_taxa=["Aves", "Mammalia"], has_photos=True,
+                  observed_d1="2024-01-01", identified=False, per_page=50)
+    filters = SearchFilters.from_kwargs(hrank="species", **kwargs)
+    params = filters.api_params()
+    
+    assert params == _build_search_params(dict(kwargs, hrank="species"))
+    assert params["iconic_taxa"] == "Aves,Mammalia" and params["photos"] == "true"
+    assert params["d1"] == "2024-01-01" and params["identified"] == "false"
+    assert params["hrank"] == "species" and params["per_page"] == 50
+    print("  ✓ 参数转换与 _build_search_params 一致")
+    
+    # 相同条件的过滤器相等、可哈希，返回的参数是副本
+    same = SearchFilters.from_kwargs(hrank="species", **kwargs)
+    assert same == filters and hash(same) == hash(filters)
+    params["taxon_id"] = 1
+    assert filters.api_params()["taxon_id"] == 9083
+    print("  ✓ 相同条件复用缓存，修改返回值不影响缓存")
+
+
+def test_pagination_limits():
+    """测试分页上限（per_page 最大 200，page * per_page 不超过 10000）"""
+    from inaturalist_plugin.core.client import PaginationLimitError
+    from inaturalist_plugin.services.observation_service import SearchFilters, _build_search_params
+    
+    assert _build_search_params({"per_page": 500})["per_page"] == 200
+    for bad in ({"page": 51, "per_page": 200}, {"page": 101, "per_page": 100}):
+        try:
+            _build_search_params(bad)
+        except PaginationLimitError:
+            pass
+        else:
+            raise AssertionError(f"未拒绝超出范围的分页: {bad}")
+    print("  ✓ _build_search_params 限制 per_page 并拒绝超出范围的页码")
+    
+    client, adapter = stub_client(json_page([SAMPLE_OBSERVATION]))
+    service = ObservationService(client)
+    filters = SearchFilters(taxon_id=9083)
+    
+    service.search_page(filters=filters, per_page=500)
+    assert "per_page=200" in adapter.requests[-1].url
+    try:
+        service.search_page(filters=filters, page=60, per_page=200)
+    except PaginationLimitError:
+        pass
+    else:
+        raise AssertionError("filters 加 kwargs 覆盖的页码未被检查")
+    assert len(adapter.requests) == 1
+    print("  ✓ filters 与 kwargs 合并后的参数同样受上限约束，超出时不发请求")
+
+
+def test_get_cached_etag():
+    """测试 get_cached 过期后用 If-None-Match 重新验证，304 时复用之前的结果"""
+    body = json.dumps({"total_results": 42, "results": []}).encode("utf-8")
+    
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, b""
+        return 200, {"Content-Type": "application/json", "ETag": '"v1"'}, body
+    
+    client, adapter = stub_client(handler)
+    first = client.get_cached("/observations", {"taxon_id": 1, "per_page": 0}, ttl=0)
+    second = client.get_cached("/observations", {"taxon_id": 1, "per_page": 0}, ttl=0)
+    
+    assert first["total_results"] == 42
+    assert second is first
+    assert "If-None-Match" not in adapter.requests[0].headers
+    assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+    print("  ✓ 第二次请求为条件请求，304 时返回缓存的结果")
+    
+    client.get_cached("/observations", {"taxon_id": 1, "per_page": 0})
+    client.get_cached("/observations", {"taxon_id": 1, "per_page": 0})
+    assert len(adapter.requests) == 3
+    print("  ✓ 未过期时不发请求")
+
+
+def test_decoder_matches_from_api():
+    """测试 msgspec 页面解码与 from_api 得到相同的对象"""
+    from inaturalist_plugin.models.observation import Observation
+    from inaturalist_plugin.models.taxon import Taxon
+    from inaturalist_plugin.models.structs import decode_observation_page, decode_taxon_page
+    
+    page = decode_observation_page(json.dumps({"total_results": 1, "results": [SAMPLE_OBSERVATION]}).encode("utf-8"))
+    assert page["total_results"] == 1
+    assert page["results"] == [Observation.from_api(SAMPLE_OBSERVATION)]
+    print("  ✓ 观察记录解码结果一致")
+    
+    page = decode_taxon_page(json.dumps({"total_results": 1, "results": [SAMPLE_TAXON]}).encode("utf-8"))
+    assert page["results"] == [Taxon.from_api(SAMPLE_TAXON)]
+    print("  ✓ 分类群解码结果一致")
+
+
+def test_token_bucket():
+    """测试令牌桶限速与进程级共享配额"""
+    from inaturalist_plugin.core import client as client_module
+    from inaturalist_plugin.core.rate_limit import TokenBucket
+    
+    bucket = TokenBucket(rate=50.0, capacity=2)
+    assert bucket.acquire() == 0 and bucket.acquire() == 0
+    start = time.monotonic()
+    wait = bucket.acquire()
+    assert 0 < wait <= 0.02 + 1e-6 and time.monotonic() - start >= wait * 0.9
+    print(f"  ✓ 突发 2 个后开始等待 ({wait * 1000:.1f}ms)")
+    
+    # 所有客户端共享同一个进程级令牌桶
+    limiter = client_module._GLOBAL_LIMITER
+    limiter._reserve(0)  # 按当前时间补充令牌
+    before, start = limiter._tokens, time.monotonic()
+    for _ in range(2):
+        create_client(use_cache=False)._apply_rate_limit()
+    limiter._reserve(0)
+    refilled = (time.monotonic() - start) * limiter.rate
+    assert before - limiter._tokens >= 2 - refilled - 1e-9
+    print("  ✓ 两个客户端的请求从同一个全局令牌桶扣除")
+
+
+def test_atomic_write():
+    """测试图片缓存的原子写入：失败时不留下不完整文件或临时文件"""
+    import tempfile
+    from pathlib import Path
+    from inaturalist_plugin.utils.image_utils import _atomic_write
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "a.jpg"
+        with _atomic_write(path) as f:
+            f.write(b"data")
+        assert path.read_bytes() == b"data"
+        
+        try:
+            with _atomic_write(path) as f:
+                f.write(b"partial")
+                raise IOError("中断")
+        except IOError:
+            pass
+        assert path.read_bytes() == b"data"
+        assert os.listdir(tmp) == ["a.jpg"]
+    print("  ✓ 写入中断时保留原文件并删除临时文件")
+
+
 def save_test_results(results, output_dir="outputs"):
     """保存测试结果到文件"""
     os.makedirs(output_dir, exist_ok=True)
@@ -318,11 +554,17 @@ if __name__ == "__main__":
         ("物种统计", test_species_counts),
         ("分页功能", test_pagination),
         ("插件集成测试", test_plugin_integration),
+        ("观察记录字段映射", test_observation_from_api),
+        ("搜索条件参数转换", test_search_filters_params),
+        ("分页上限", test_pagination_limits),
+        ("ETag 条件请求", test_get_cached_etag),
+        ("页面解码一致性", test_decoder_matches_from_api),
+        ("令牌桶限速", test_token_bucket),
+        ("原子写入", test_atomic_write),
     ]
     
     for test_name, test_func in tests:
         runner.run_test(test_name, test_func)
-        time.sleep(0.5)  # 避免请求过快
     
     # 打印摘要
     results = runner.print_summary()